@@ -0,0 +1,280 @@
+"""
+Carga de modelos 3D compartida por main.py y main2.py.
+
+Todas las estructuras (vértices, caras, aristas y colores) se construyen como
+arrays de NumPy, sin bucles de Python por arista, y cada etapa de la carga se
+cronometra para poder ver dónde se va el tiempo.
+
+La primera carga de un modelo guarda esos arrays como archivos .npy en una
+carpeta .cache_mallas junto al modelo; las siguientes los abren con memory-map
+y evitan por completo el parseo del GLB y la unión de la escena. La caché se
+invalida sola si cambia el contenido del archivo original.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import open3d as o3d
+import trimesh
+
+
+class MallaCargada:
+    """Arrays de una malla lista para visualizar y el tiempo de cada etapa de carga"""
+
+    def __init__(self, vertices, faces, edges, edges_unique, vertex_colors):
+        self.vertices = vertices            # (N, 3) float64
+        self.faces = faces                  # (M, 3) int64
+        self.edges = edges                  # (3M, 2) una arista por lado de cada cara
+        self.edges_unique = edges_unique    # (E, 2) aristas sin repetir
+        self.vertex_colors = vertex_colors  # (N, 3) en [0, 1] o None
+        self.tiempos = {}
+
+    @contextmanager
+    def cronometrar(self, etapa):
+        inicio = time.perf_counter()
+        yield
+        self.tiempos[etapa] = self.tiempos.get(etapa, 0.0) + time.perf_counter() - inicio
+
+
+ARRAYS_MALLA = ("vertices", "faces", "edges", "edges_unique", "vertex_colors")
+VERSION_CACHE = 1
+
+
+def _hash_archivo(ruta, bloque=1 << 20):
+    sha = hashlib.sha1()
+    with open(ruta, "rb") as f:
+        for parte in iter(lambda: f.read(bloque), b""):
+            sha.update(parte)
+    return sha.hexdigest()
+
+
+def ruta_cache(ruta):
+    """Carpeta de caché de un modelo: <carpeta del modelo>/.cache_mallas/<nombre>/"""
+    carpeta, nombre = os.path.split(os.path.abspath(ruta))
+    return os.path.join(carpeta, ".cache_mallas", nombre)
+
+
+def _leer_meta(carpeta_cache):
+    try:
+        with open(os.path.join(carpeta_cache, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def hash_modelo(ruta):
+    """
+    SHA-1 del archivo del modelo. Si meta.json de la caché coincide en tamaño y
+    fecha de modificación se reutiliza el hash guardado en lugar de releer el archivo.
+    """
+    meta = _leer_meta(ruta_cache(ruta))
+    if meta is not None and meta.get("version") == VERSION_CACHE:
+        info = os.stat(ruta)
+        if meta.get("tamano") == info.st_size and meta.get("mtime") == info.st_mtime_ns and "sha1" in meta:
+            return meta["sha1"]
+    return _hash_archivo(ruta)
+
+
+def _cache_vigente(ruta, carpeta_cache):
+    """
+    Verifica si la caché corresponde al archivo actual.
+
+    Si el tamaño y la fecha de modificación coinciden no se recalcula el hash;
+    si solo cambió la fecha se compara el hash y, si el contenido es el mismo,
+    se actualiza la fecha guardada (si la carpeta no admite escritura, la caché
+    sigue siendo válida y solo se omite la actualización).
+    """
+    meta = _leer_meta(carpeta_cache)
+    if meta is None or meta.get("version") != VERSION_CACHE:
+        return False
+
+    info = os.stat(ruta)
+    if meta["tamano"] != info.st_size:
+        return False
+    if meta["mtime"] == info.st_mtime_ns:
+        return True
+
+    if meta["sha1"] != _hash_archivo(ruta):
+        return False
+    meta["mtime"] = info.st_mtime_ns
+    try:
+        with open(os.path.join(carpeta_cache, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except OSError:
+        pass
+    return True
+
+
+def _leer_cache(carpeta_cache):
+    meta = _leer_meta(carpeta_cache)
+    arrays = {}
+    for nombre in ARRAYS_MALLA:
+        if nombre in meta["arrays"]:
+            arrays[nombre] = np.load(os.path.join(carpeta_cache, nombre + ".npy"), mmap_mode="r")
+        else:
+            arrays[nombre] = None
+    return MallaCargada(**arrays)
+
+
+def guardar_cache(ruta, malla):
+    """Guarda los arrays de la malla en la carpeta de caché del modelo"""
+    carpeta_cache = ruta_cache(ruta)
+    temporal = carpeta_cache + ".tmp"
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+
+    guardados = []
+    for nombre in ARRAYS_MALLA:
+        array = getattr(malla, nombre)
+        if array is not None:
+            np.save(os.path.join(temporal, nombre + ".npy"), np.ascontiguousarray(array))
+            guardados.append(nombre)
+
+    info = os.stat(ruta)
+    meta = {
+        "version": VERSION_CACHE,
+        "sha1": _hash_archivo(ruta),
+        "mtime": info.st_mtime_ns,
+        "tamano": info.st_size,
+        "arrays": guardados,
+    }
+    # meta.json se escribe al final: una caché sin él se considera incompleta
+    with open(os.path.join(temporal, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    shutil.rmtree(carpeta_cache, ignore_errors=True)
+    os.replace(temporal, carpeta_cache)
+
+
+def cargar_malla(ruta, usar_cache=True):
+    """
+    Carga un modelo (.glb, .obj, ...) y une todas sus geometrías en una sola malla.
+
+    Args:
+        ruta: Ruta al archivo del modelo
+        usar_cache: Si es True lee la caché binaria cuando está vigente y la
+                    crea o reemplaza cuando no lo está
+
+    Returns:
+        MallaCargada con los arrays de la malla y los tiempos de carga
+    """
+    if usar_cache:
+        inicio = time.perf_counter()
+        carpeta_cache = ruta_cache(ruta)
+        try:
+            malla = _leer_cache(carpeta_cache) if _cache_vigente(ruta, carpeta_cache) else None
+        except (OSError, ValueError, KeyError) as e:
+            # Caché ilegible o incompleta: se hace la carga completa y se reemplaza
+            print(f"No se pudo leer la caché de la malla: {e}")
+            malla = None
+        if malla is not None:
+            malla.tiempos["lectura de caché"] = time.perf_counter() - inicio
+            return malla
+
+    malla = _cargar_malla_original(ruta)
+
+    if usar_cache:
+        try:
+            with malla.cronometrar("escritura de caché"):
+                guardar_cache(ruta, malla)
+        except OSError as e:
+            print(f"No se pudo guardar la caché de la malla: {e}")
+    return malla
+
+
+def _cargar_malla_original(ruta):
+    """Carga completa: parseo del archivo y unión de la escena"""
+    tiempos = {}
+
+    inicio = time.perf_counter()
+    tmesh = trimesh.load(ruta)
+    tiempos["lectura del archivo"] = time.perf_counter() - inicio
+
+    # Si es una escena con múltiples geometrías, unirlas
+    inicio = time.perf_counter()
+    if isinstance(tmesh, trimesh.Scene):
+        tmesh = trimesh.util.concatenate(tuple(tmesh.geometry.values()))
+    tiempos["unir escena"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    vertices = np.asarray(tmesh.vertices)
+    faces = np.asarray(tmesh.faces)
+    edges = np.asarray(tmesh.edges)
+    edges_unique = np.asarray(tmesh.edges_unique)
+    tiempos["aristas"] = time.perf_counter() - inicio
+
+    # Colores de vértices normalizados a [0, 1], si el modelo los tiene
+    inicio = time.perf_counter()
+    vertex_colors = None
+    if hasattr(tmesh.visual, 'vertex_colors') and tmesh.visual.vertex_colors is not None:
+        vertex_colors = np.asarray(tmesh.visual.vertex_colors)[:, :3] / 255.0
+    tiempos["colores"] = time.perf_counter() - inicio
+
+    malla = MallaCargada(vertices, faces, edges, edges_unique, vertex_colors)
+    malla.tiempos.update(tiempos)
+    return malla
+
+
+def crear_malla_o3d(malla, usar_colores=False, color_por_defecto=None):
+    """
+    Construye la TriangleMesh de Open3D con normales y, opcionalmente, colores.
+
+    Args:
+        malla: MallaCargada
+        usar_colores: Si es True asigna los colores de vértices del modelo
+        color_por_defecto: Color RGB en [0, 1] si el modelo no trae colores;
+                           None deja la malla sin colores
+    """
+    with malla.cronometrar("malla open3d"):
+        # Open3D convierte sin copias intermedias cuando los índices son int32
+        mesh_o3d = o3d.geometry.TriangleMesh(
+            o3d.utility.Vector3dVector(malla.vertices),
+            o3d.utility.Vector3iVector(malla.faces.astype(np.int32))
+        )
+
+        # Calcular normales para mejor visualización
+        mesh_o3d.compute_vertex_normals()
+
+        if usar_colores and malla.vertex_colors is not None:
+            mesh_o3d.vertex_colors = o3d.utility.Vector3dVector(malla.vertex_colors)
+        elif usar_colores and color_por_defecto is not None:
+            mesh_o3d.paint_uniform_color(color_por_defecto)
+    return mesh_o3d
+
+
+def crear_lineset_aristas(malla, color=(0.0, 0.0, 1.0)):
+    """
+    Construye el LineSet de aristas reutilizando los vértices de la malla como
+    puntos y las aristas únicas como índices, sin duplicar puntos ni recorrer
+    las aristas en Python.
+
+    Args:
+        malla: MallaCargada
+        color: Color RGB en [0, 1] de todas las aristas
+    """
+    with malla.cronometrar("aristas open3d"):
+        colores = np.broadcast_to(np.asarray(color, dtype=np.float64), (len(malla.edges_unique), 3))
+        line_set = o3d.geometry.LineSet(
+            points=o3d.utility.Vector3dVector(malla.vertices),
+            lines=o3d.utility.Vector2iVector(malla.edges_unique.astype(np.int32)),
+        )
+        line_set.colors = o3d.utility.Vector3dVector(np.ascontiguousarray(colores))
+    return line_set
+
+
+def imprimir_resumen(malla):
+    """Muestra la información estructural y el tiempo de cada etapa de carga"""
+    print(f"Modelo cargado:")
+    print(f"Número de vértices: {len(malla.vertices)}")
+    print(f"Número de caras: {len(malla.faces)}")
+    print(f"Número de aristas: {len(malla.edges)} ({len(malla.edges_unique)} únicas)")
+
+    print("Tiempos de carga:")
+    for etapa, segundos in malla.tiempos.items():
+        print(f"  {etapa:<20} {1000 * segundos:8.1f} ms")
+    print(f"  {'total':<20} {1000 * sum(malla.tiempos.values()):8.1f} ms")
@@ -1,41 +1,29 @@
-import trimesh
-import open3d as o3d
-import numpy as np
 import os
 
+from carga_malla import cargar_malla, imprimir_resumen
+from niveles_detalle import construir_piramide, elegir_nivel, crear_malla_nivel, imprimir_niveles
+import open3d as o3d
+
 base_dir = os.path.dirname(os.path.abspath(__file__))
 ruta = os.path.join(base_dir, "models", "burger.glb")
 
-# Cargar .glb con trimesh
-tmesh = trimesh.load(ruta)
-
-# Si es una escena con múltiples geometrías, unirlas
-if isinstance(tmesh, trimesh.Scene):
-    tmesh = trimesh.util.concatenate(tuple(tmesh.geometry.values()))
-
-# Convertir a open3d
-vertices = np.asarray(tmesh.vertices)
-faces = np.asarray(tmesh.faces)
+# Máximo de triángulos que se envían al visor; los modelos más densos se
+# muestran con un nivel de detalle simplificado
+PRESUPUESTO_TRIANGULOS = 200_000
 
-# Información estructural
-num_vertices = len(vertices)
-num_faces = len(faces)
-num_edges = len(tmesh.edges)
+# Cargar .glb y unir sus geometrías en una sola malla
+malla = cargar_malla(ruta)
 
-# Mostrar la información en la terminal
-print(f"Modelo cargado:")
-print(f"Número de vértices: {num_vertices}")
-print(f"Número de caras: {num_faces}")
-print(f"Número de aristas: {num_edges}")
+# Mostrar la información estructural y los tiempos en la terminal
+imprimir_resumen(malla)
 
-# Crear malla Open3D
-mesh_o3d = o3d.geometry.TriangleMesh(
-    o3d.utility.Vector3dVector(vertices),
-    o3d.utility.Vector3iVector(faces)
-)
+# Pirámide de niveles de detalle (100 %, 25 %, 5 %), guardada en caché junto al modelo
+niveles = construir_piramide(ruta, malla)
+nivel = elegir_nivel(niveles, PRESUPUESTO_TRIANGULOS)
+imprimir_niveles(niveles, elegido=nivel)
 
-# Calcular normales para mejor visualización
-mesh_o3d.compute_vertex_normals()
+# Crear malla Open3D del nivel elegido (con normales para mejor visualización)
+mesh_o3d = crear_malla_nivel(nivel)
 
 # Visualizar
 o3d.visualization.draw_geometries([mesh_o3d])
@@ -0,0 +1,173 @@
+"""
+Niveles de detalle (LOD) para modelos densos.
+
+Genera una pirámide de mallas simplificadas con decimación por cuádricas
+(por ejemplo 100 %, 25 % y 5 % de los triángulos), la guarda en la carpeta de
+caché del modelo y permite elegir el nivel según un presupuesto de triángulos.
+Cada nivel guarda junto a sus arrays el SHA-1 del modelo del que salió y solo
+se reutiliza si coincide con el del modelo actual, así un modelo editado nunca
+se muestra con los niveles del anterior.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+import open3d as o3d
+
+from carga_malla import hash_modelo, ruta_cache
+
+FRACCIONES_POR_DEFECTO = (1.0, 0.25, 0.05)
+
+
+class NivelDetalle:
+    """Una malla de la pirámide y cuánto costó obtenerla"""
+
+    def __init__(self, fraccion, vertices, faces, vertex_colors=None, tiempo=0.0, desde_cache=False):
+        self.fraccion = fraccion
+        self.vertices = vertices
+        self.faces = faces
+        self.vertex_colors = vertex_colors
+        self.tiempo = tiempo
+        self.desde_cache = desde_cache
+
+    @property
+    def num_triangulos(self):
+        return len(self.faces)
+
+
+def _prefijo_nivel(ruta, fraccion):
+    return os.path.join(ruta_cache(ruta), f"lod_{int(round(fraccion * 1000)):04d}")
+
+
+def _leer_nivel(ruta, fraccion, sha1):
+    """Lee un nivel de la caché; None si falta, está incompleto o salió de otro modelo"""
+    prefijo = _prefijo_nivel(ruta, fraccion)
+    inicio = time.perf_counter()
+    try:
+        with open(prefijo + "_meta.json", encoding="utf-8") as f:
+            if json.load(f).get("sha1") != sha1:
+                return None
+        vertices = np.load(prefijo + "_vertices.npy", mmap_mode="r")
+        faces = np.load(prefijo + "_faces.npy", mmap_mode="r")
+        colores = None
+        if os.path.exists(prefijo + "_colors.npy"):
+            colores = np.load(prefijo + "_colors.npy", mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    return NivelDetalle(fraccion, vertices, faces, colores, time.perf_counter() - inicio, desde_cache=True)
+
+
+def _guardar_nivel(ruta, nivel, sha1):
+    prefijo = _prefijo_nivel(ruta, nivel.fraccion)
+    os.makedirs(os.path.dirname(prefijo), exist_ok=True)
+    # Se borra primero el meta.json viejo: sin él el nivel se considera incompleto
+    if os.path.exists(prefijo + "_meta.json"):
+        os.remove(prefijo + "_meta.json")
+    if nivel.vertex_colors is not None:
+        np.save(prefijo + "_colors.npy", nivel.vertex_colors)
+    elif os.path.exists(prefijo + "_colors.npy"):
+        os.remove(prefijo + "_colors.npy")
+    np.save(prefijo + "_vertices.npy", nivel.vertices)
+    np.save(prefijo + "_faces.npy", nivel.faces)
+    # El hash del modelo de origen se escribe al final
+    with open(prefijo + "_meta.json", "w", encoding="utf-8") as f:
+        json.dump({"sha1": sha1}, f)
+
+
+def _simplificar(nivel_base, fraccion, num_triangulos_original):
+    """Decima una malla por cuádricas hasta la fracción pedida del original"""
+    mesh = o3d.geometry.TriangleMesh(
+        o3d.utility.Vector3dVector(np.asarray(nivel_base.vertices, dtype=np.float64)),
+        o3d.utility.Vector3iVector(np.asarray(nivel_base.faces, dtype=np.int32))
+    )
+    if nivel_base.vertex_colors is not None:
+        mesh.vertex_colors = o3d.utility.Vector3dVector(np.asarray(nivel_base.vertex_colors, dtype=np.float64))
+
+    objetivo = max(4, int(num_triangulos_original * fraccion))
+    simplificada = mesh.simplify_quadric_decimation(target_number_of_triangles=objetivo)
+
+    colores = None
+    if simplificada.has_vertex_colors():
+        colores = np.asarray(simplificada.vertex_colors)
+    return np.asarray(simplificada.vertices), np.asarray(simplificada.triangles, dtype=np.int32), colores
+
+
+def construir_piramide(ruta, malla, fracciones=FRACCIONES_POR_DEFECTO, usar_cache=True):
+    """
+    Construye (o lee de la caché) los niveles de detalle de una malla.
+
+    Cada nivel se decima a partir del nivel anterior, que ya es más pequeño que
+    el original, así los niveles más bajos se construyen rápido.
+
+    Args:
+        ruta: Ruta al archivo del modelo (ubica la caché)
+        malla: MallaCargada del modelo completo
+        fracciones: Fracción de triángulos de cada nivel, de mayor a menor
+        usar_cache: Si es True lee y guarda los niveles en disco
+
+    Returns:
+        Lista de NivelDetalle ordenada de mayor a menor detalle
+    """
+    num_original = len(malla.faces)
+    sha1 = hash_modelo(ruta) if usar_cache else None
+    niveles = []
+    anterior = NivelDetalle(1.0, malla.vertices, malla.faces, malla.vertex_colors)
+
+    for fraccion in sorted(fracciones, reverse=True):
+        if fraccion >= 1.0:
+            nivel = anterior
+        else:
+            nivel = _leer_nivel(ruta, fraccion, sha1) if usar_cache else None
+            if nivel is None:
+                inicio = time.perf_counter()
+                vertices, faces, colores = _simplificar(anterior, fraccion, num_original)
+                nivel = NivelDetalle(fraccion, vertices, faces, colores, time.perf_counter() - inicio)
+                if usar_cache:
+                    try:
+                        _guardar_nivel(ruta, nivel, sha1)
+                    except OSError as e:
+                        print(f"No se pudo guardar el nivel {fraccion:.0%} en caché: {e}")
+        niveles.append(nivel)
+        anterior = nivel
+
+    return niveles
+
+
+def elegir_nivel(niveles, presupuesto_triangulos):
+    """
+    Elige el nivel con más detalle que cabe en el presupuesto de triángulos.
+    Si ninguno cabe, devuelve el de menor detalle.
+    """
+    for nivel in niveles:
+        if nivel.num_triangulos <= presupuesto_triangulos:
+            return nivel
+    return niveles[-1]
+
+
+def crear_malla_nivel(nivel, color_por_defecto=None):
+    """Construye la TriangleMesh de Open3D de un nivel"""
+    mesh_o3d = o3d.geometry.TriangleMesh(
+        o3d.utility.Vector3dVector(np.asarray(nivel.vertices, dtype=np.float64)),
+        o3d.utility.Vector3iVector(np.asarray(nivel.faces, dtype=np.int32))
+    )
+    mesh_o3d.compute_vertex_normals()
+    if nivel.vertex_colors is not None:
+        mesh_o3d.vertex_colors = o3d.utility.Vector3dVector(np.asarray(nivel.vertex_colors, dtype=np.float64))
+    elif color_por_defecto is not None:
+        mesh_o3d.paint_uniform_color(color_por_defecto)
+    return mesh_o3d
+
+
+def imprimir_niveles(niveles, elegido=None):
+    """Muestra vértices, caras y tiempo de construcción de cada nivel"""
+    print("Niveles de detalle:")
+    print(f"  {'nivel':>6} {'vértices':>10} {'caras':>10} {'tiempo':>12}")
+    for nivel in niveles:
+        origen = "caché" if nivel.desde_cache else "construido"
+        if nivel.fraccion >= 1.0:
+            origen = "original"
+        marca = "  <- en uso" if nivel is elegido else ""
+        print(f"  {nivel.fraccion:>6.0%} {len(nivel.vertices):>10} {len(nivel.faces):>10} "
+              f"{1000 * nivel.tiempo:>9.1f} ms ({origen}){marca}")
@@ -0,0 +1,120 @@
+"""
+Comparación de rendimiento: filtro escalar en un ciclo de Python vs KalmanLote.
+
+Para 1, 100 y 10 000 objetivos se filtran las mismas mediciones con
+- el ciclo escalar de main.py, repetido objetivo por objetivo, vs KalmanLote
+  con el mismo modelo 1D (una llamada de NumPy por paso)
+- un ciclo por objetivo con matrices pequeñas de NumPy vs KalmanLote, con el
+  modelo de velocidad constante en 2D y 3D
+
+y se reporta el tiempo total, las actualizaciones por segundo y la aceleración
+del lote respecto a su ciclo por objetivo. Los ciclos por objetivo con matrices
+se miden sobre a lo sumo --max-ciclo objetivos y se extrapolan (marcados con *).
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from kalman_lote import KalmanLote, modelo_caminata_aleatoria, modelo_velocidad_constante
+
+Q = 0.001
+R = 4
+
+
+def filtrar_escalar(observed):
+    """Ciclo de main.py aplicado a cada objetivo. observed: (pasos, N)"""
+    estimate = np.empty_like(observed)
+    for j in range(observed.shape[1]):
+        P = 1
+        x_hat = 0
+        for i, z in enumerate(observed[:, j].tolist()):
+            P_prior = P + Q
+            K = P_prior / (P_prior + R)
+            x_hat = x_hat + K * (z - x_hat)
+            P = (1 - K) * P_prior
+            estimate[i, j] = x_hat
+    return estimate
+
+
+def filtrar_ciclo_matricial(observed, modelo):
+    """Mismo filtro que KalmanLote, pero un objetivo a la vez. observed: (pasos, N, m)"""
+    F, H, Qm, Rm = modelo
+    estimate = np.empty_like(observed)
+    for j in range(observed.shape[1]):
+        x = np.zeros(F.shape[0])
+        P = np.eye(F.shape[0])
+        for i in range(observed.shape[0]):
+            x = F @ x
+            P = F @ P @ F.T + Qm
+            S = H @ P @ H.T + Rm
+            K = P @ H.T @ np.linalg.inv(S)
+            x = x + K @ (observed[i, j] - H @ x)
+            P = P - K @ H @ P
+            estimate[i, j] = H @ x
+    return estimate
+
+
+def filtrar_lote(observed, modelo):
+    """observed: (pasos, N, m)"""
+    pasos, num, _ = observed.shape
+    filtro = KalmanLote(num, *modelo)
+    estimate = np.empty_like(observed)
+    for i in range(pasos):
+        estimate[i] = filtro.paso(observed[i])
+    return estimate
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def generar(pasos, num, dim, rng):
+    real = np.cumsum(rng.standard_normal((pasos, num, dim)), axis=0)
+    return real + rng.normal(0, 2, size=real.shape)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del filtro de Kalman escalar vs vectorizado")
+    parser.add_argument("--pasos", type=int, default=50, help="Muestras por objetivo")
+    parser.add_argument("--objetivos", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--max-ciclo", type=int, default=200,
+                        help="Máximo de objetivos medidos en los ciclos con matrices")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semilla)
+    print(f"{'objetivos':>10} {'modelo':<22} {'tiempo':>11} {'act/s':>14} {'aceleración':>12}")
+
+    for num in args.objetivos:
+        actualizaciones = args.pasos * num
+
+        observed = generar(args.pasos, num, 1, rng)
+        escalar, t_escalar = medir(filtrar_escalar, observed[:, :, 0])
+        lote, t_lote = medir(filtrar_lote, observed, modelo_caminata_aleatoria(Q, R))
+        # Ambos caminos deben dar el mismo resultado
+        assert np.allclose(escalar, lote[:, :, 0])
+        filas = [("escalar 1D", t_escalar, ""), ("lote 1D", t_lote, f"{t_escalar / t_lote:.1f}x")]
+
+        for dim in (2, 3):
+            modelo = modelo_velocidad_constante(dim, q=Q, r=R)
+            observed = generar(args.pasos, num, dim, rng)
+            medidos = min(num, args.max_ciclo)
+            ciclo, t_ciclo = medir(filtrar_ciclo_matricial, observed[:, :medidos], modelo)
+            t_ciclo *= num / medidos
+            lote, t_lote = medir(filtrar_lote, observed, modelo)
+            assert np.allclose(ciclo, lote[:, :medidos])
+
+            marca = "*" if medidos < num else " "
+            filas.append((f"ciclo vel. cte {dim}D", t_ciclo, marca))
+            filas.append((f"lote vel. cte {dim}D", t_lote, f"{t_ciclo / t_lote:.1f}x"))
+
+        for nombre, t, nota in filas:
+            print(f"{num:>10} {nombre:<22} {1000 * t:>8.1f} ms {actualizaciones / t:>14,.0f} {nota:>12}")
+
+
+if __name__ == "__main__":
+    main()
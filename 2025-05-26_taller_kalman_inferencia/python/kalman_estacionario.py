@@ -0,0 +1,189 @@
+"""
+Filtro de Kalman en flujo con ganancia estacionaria.
+
+Con F, H, Q y R constantes la covarianza y la ganancia convergen a valores fijos
+que solo dependen del modelo. Esos valores se obtienen por adelantado resolviendo
+la ecuación discreta algebraica de Riccati (DARE). El filtro ejecuta el ciclo
+completo solo mientras la ganancia sigue cambiando; cuando converge, pasa a la
+recurrencia fija
+
+    x_t = A x_{t-1} + K z_t,    con A = (I - K H) F
+
+que no necesita actualizar P ni invertir S. Los bloques largos de mediciones se
+procesan con una multiplicación de matrices por bloque en lugar de una iteración
+de Python por muestra.
+"""
+
+import numpy as np
+
+
+def resolver_riccati(F, H, Q, R, tol=1e-12, max_iter=100):
+    """
+    Covarianza a priori estacionaria P y ganancia K del filtro de Kalman.
+
+    Usa el algoritmo de duplicación estructurada (SDA): cada iteración equivale
+    a duplicar el número de pasos del filtro, así converge en unas pocas decenas
+    de iteraciones aunque el filtro tarde miles de muestras en estabilizarse.
+
+    Returns:
+        P: Covarianza a priori estacionaria (n, n)
+        K: Ganancia estacionaria (n, m)
+    """
+    F, H, Q, R = (np.atleast_2d(np.asarray(M, dtype=np.float64)) for M in (F, H, Q, R))
+    identidad = np.eye(F.shape[0])
+
+    # DARE del filtro: P = F P (I + H^T R^-1 H P)^-1 F^T + Q
+    A = F.T
+    G = H.T @ np.linalg.solve(R, H)
+    P = Q.copy()
+    for _ in range(max_iter):
+        W_inv = np.linalg.inv(identidad + G @ P)
+        A_W = A @ W_inv
+        P_nueva = P + A.T @ P @ W_inv @ A
+        G = G + A_W @ G @ A.T
+        A = A_W @ A
+        if np.max(np.abs(P_nueva - P)) <= tol * max(1.0, np.max(np.abs(P_nueva))):
+            P = P_nueva
+            break
+        P = P_nueva
+    else:
+        raise RuntimeError("La ecuación de Riccati no convergió; revise que el modelo sea observable")
+
+    P = (P + P.T) / 2
+    S = H @ P @ H.T + R
+    K = np.linalg.solve(S, H @ P).T
+    return P, K
+
+
+class KalmanEstacionario:
+    """
+    Filtro de Kalman para flujos largos de mediciones de un solo objetivo.
+
+    Args:
+        F, H, Q, R: Modelo del filtro (ver kalman_lote)
+        x0: Estado inicial, por defecto ceros
+        P0: Covarianza inicial (escalar o (n, n))
+        tol: Diferencia máxima relativa entre la ganancia actual y la
+             estacionaria para considerar que el filtro convergió
+        bloque: Muestras por bloque en update_many una vez convergido
+    """
+
+    def __init__(self, F, H, Q, R, x0=None, P0=1.0, tol=1e-6, bloque=64):
+        self.F, self.H, self.Q, self.R = (np.atleast_2d(np.asarray(M, dtype=np.float64))
+                                          for M in (F, H, Q, R))
+        self.n = self.F.shape[0]
+        self.m = self.H.shape[0]
+        self.tol = tol
+
+        self.P_estacionaria, self.K_estacionaria = resolver_riccati(self.F, self.H, self.Q, self.R)
+        self.A = (np.eye(self.n) - self.K_estacionaria @ self.H) @ self.F
+
+        self.x = np.zeros(self.n) if x0 is None else np.asarray(x0, dtype=np.float64).reshape(self.n)
+        P0 = np.asarray(P0, dtype=np.float64)
+        self.P = P0 * np.eye(self.n) if P0.ndim == 0 else P0.copy()
+
+        self.muestras = 0
+        self.convergido = False
+        self.muestra_convergencia = None
+
+        self._preparar_bloque(bloque)
+
+    def _preparar_bloque(self, bloque):
+        """
+        Operadores de un bloque de L muestras en régimen estacionario.
+
+        Para x_{-1} el estado antes del bloque:
+            x_i = A^{i+1} x_{-1} + sum_{j<=i} A^{i-j} K z_j
+        Se guarda la parte forzada como una matriz (L*m, L*n) y la parte libre
+        como (n, L*n), de modo que un bloque cuesta dos productos de matrices.
+        """
+        self.bloque = bloque
+        potencias = [np.eye(self.n)]
+        for _ in range(bloque):
+            potencias.append(self.A @ potencias[-1])
+
+        forzada = np.zeros((bloque, self.m, bloque, self.n))
+        for i in range(bloque):
+            for j in range(i + 1):
+                forzada[j, :, i, :] = (potencias[i - j] @ self.K_estacionaria).T
+        self._forzada = forzada.reshape(bloque * self.m, bloque * self.n)
+        self._libre = np.concatenate([p.T for p in potencias[1:]], axis=1)
+
+    def _paso_completo(self, z):
+        """Predicción y corrección con la ganancia del paso actual"""
+        x_prior = self.F @ self.x
+        P_prior = self.F @ self.P @ self.F.T + self.Q
+
+        S = self.H @ P_prior @ self.H.T + self.R
+        K = np.linalg.solve(S, self.H @ P_prior).T
+
+        self.x = x_prior + K @ (z - self.H @ x_prior)
+        self.P = P_prior - K @ self.H @ P_prior
+
+        escala = max(1.0, np.max(np.abs(self.K_estacionaria)))
+        if np.max(np.abs(K - self.K_estacionaria)) <= self.tol * escala:
+            self.convergido = True
+            self.muestra_convergencia = self.muestras
+            self.P = self.P_estacionaria - self.K_estacionaria @ self.H @ self.P_estacionaria
+
+    def update(self, z):
+        """
+        Incorpora una medición y devuelve la posición estimada H x.
+
+        Args:
+            z: Medición (m,) o escalar si m == 1
+        """
+        z = np.asarray(z, dtype=np.float64).reshape(self.m)
+        if self.convergido:
+            self.x = self.A @ self.x + self.K_estacionaria @ z
+        else:
+            self._paso_completo(z)
+        self.muestras += 1
+        return self.H @ self.x
+
+    def update_many(self, zs, out=None):
+        """
+        Incorpora un bloque de mediciones y devuelve todas las estimaciones.
+
+        Args:
+            zs: Mediciones (T, m), o (T,) si m == 1
+            out: Array opcional donde escribir las estimaciones, misma forma que zs
+
+        Returns:
+            Estimaciones H x de cada muestra, con la forma de zs
+        """
+        zs = np.asarray(zs, dtype=np.float64)
+        forma = zs.shape
+        zs = zs.reshape(-1, self.m)
+        total = len(zs)
+        estimaciones = np.empty((total, self.m)) if out is None else out.reshape(total, self.m)
+
+        # Régimen transitorio: ciclo completo hasta que la ganancia converge
+        t = 0
+        while t < total and not self.convergido:
+            self._paso_completo(zs[t])
+            estimaciones[t] = self.H @ self.x
+            self.muestras += 1
+            t += 1
+
+        # Régimen estacionario: bloques completos con dos productos de matrices
+        L = self.bloque
+        num_bloques = (total - t) // L
+        if num_bloques:
+            z_bloques = zs[t:t + num_bloques * L].reshape(num_bloques, L * self.m)
+            estados = (z_bloques @ self._forzada).reshape(num_bloques, L, self.n)
+            # La parte libre depende del último estado del bloque anterior
+            for b in range(num_bloques):
+                estados[b] += (self.x @ self._libre).reshape(L, self.n)
+                self.x = estados[b, -1].copy()
+            estimaciones[t:t + num_bloques * L] = estados.reshape(-1, self.n) @ self.H.T
+            self.muestras += num_bloques * L
+            t += num_bloques * L
+
+        # Resto que no completa un bloque
+        for t in range(t, total):
+            estimaciones[t] = self.update(zs[t])
+
+        if out is not None:
+            return out
+        return estimaciones.reshape(forma)
@@ -2,28 +2,24 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from kalman_estacionario import KalmanEstacionario
+from kalman_lote import modelo_caminata_aleatoria
+
 # Generar datos simulados
 real = np.cumsum(np.random.randn(50))           # Posición real
 noise = np.random.normal(0, 2, size=50)
 observed = real + noise                         # Medición ruidosa
 
-# Inicialización del filtro
-estimate = []
-P = 1
-x_hat = 0
+# Filtro con ganancia estacionaria precalculada: ejecuta el ciclo completo
+# (P_prior, K, P) solo hasta que la ganancia converge
 Q = 0.001   # Ruido del proceso
 R = 4       # Ruido de medición
+filtro = KalmanEstacionario(*modelo_caminata_aleatoria(Q, R))
+estimate = filtro.update_many(observed)
 
-for z in observed:
-    # Predicción
-    x_hat_prior = x_hat
-    P_prior = P + Q
-
-    # Corrección
-    K = P_prior / (P_prior + R)
-    x_hat = x_hat_prior + K * (z - x_hat_prior)
-    P = (1 - K) * P_prior
-    estimate.append(x_hat)
+if filtro.convergido:
+    print(f"Ganancia estacionaria K = {filtro.K_estacionaria[0, 0]:.4f}, "
+          f"alcanzada en la muestra {filtro.muestra_convergencia}")
 
 # Visualización
 plt.plot(real, label='Real')
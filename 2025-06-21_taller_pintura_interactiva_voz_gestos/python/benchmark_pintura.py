@@ -0,0 +1,78 @@
+"""
+Benchmark del dibujo con la mano sobre una grabación, sin cámara ni MediaPipe.
+
+Reproduce una grabación hecha con `python pintura_interactiva.py --grabar
+sesion.lmk` y en cada cuadro ejecuta la misma lógica que el bucle en vivo:
+lectura del gesto, trazo sobre el lienzo y combinación del lienzo con la
+imagen. Si la grabación incluye cuadros reducidos se escalan al tamaño original
+antes de medir; si no, se usa un cuadro negro.
+"""
+
+import argparse
+import os
+import sys
+
+import cv2
+import numpy as np
+
+from gestos_dibujo import blend_canvas, read_hand_gesture, update_stroke
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from comun.grabacion_landmarks import como_mediapipe, leer_grabacion, reproducir
+
+COLOR = (255, 255, 255)
+BRUSH_SIZE = 15
+
+
+def preparar_cuadros(grabacion, w, h):
+    """Cuadros de fondo del tamaño original, decodificados antes de medir"""
+    negro = np.zeros((h, w, 3), dtype=np.uint8)
+    cuadros = []
+    for imagen in grabacion.decodificar_imagenes():
+        cuadros.append(negro if imagen is None else cv2.resize(imagen, (w, h), interpolation=cv2.INTER_LINEAR))
+    return cuadros
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del dibujo con la mano con una grabación")
+    parser.add_argument("grabacion", help="Archivo .lmk grabado con pintura_interactiva.py --grabar")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Pasadas sobre la grabación")
+    parser.add_argument("--tiempo-real", action="store_true", help="Respetar los tiempos originales")
+    args = parser.parse_args()
+
+    try:
+        grabacion = leer_grabacion(args.grabacion)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    w = grabacion.metadatos.get("ancho", 1280)
+    h = grabacion.metadatos.get("alto", 720)
+    cuadros = preparar_cuadros(grabacion, w, h)
+    manos_por_cuadro = [como_mediapipe(grabacion.landmarks(i, "manos")) for i in range(len(grabacion))]
+
+    canvas = np.zeros((h, w, 3), dtype=np.uint8)
+    estado = {"prev_pos": None, "trazos": 0}
+
+    def procesar(indice, t):
+        manos = manos_por_cuadro[indice]
+        if manos:
+            position, is_active = read_hand_gesture(manos[0], w, h)
+            estado["prev_pos"] = update_stroke(canvas, estado["prev_pos"], position, is_active, COLOR, BRUSH_SIZE)
+            estado["trazos"] += is_active
+        else:
+            estado["prev_pos"] = None
+        blend_canvas(cuadros[indice], canvas)
+
+    estadisticas = reproducir(grabacion, procesar, tiempo_real=args.tiempo_real,
+                              repeticiones=args.repeticiones)
+
+    print(f"Grabación: {len(grabacion)} cuadros de {w}x{h}, "
+          f"{int((grabacion.conteos['manos'] > 0).sum())} con mano")
+    print(f"Dibujo + combinación: {estadisticas.resumen()}")
+    print(f"Cuadros con trazo (todas las pasadas): {estado['trazos']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
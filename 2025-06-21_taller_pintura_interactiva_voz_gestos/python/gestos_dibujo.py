@@ -0,0 +1,52 @@
+"""
+Lógica de dibujo con la mano, separada de la cámara y de MediaPipe.
+
+Solo lee los landmarks de la mano (atributos .landmark[i].x/.y), así que la
+usan tanto pintura_interactiva.py en vivo como benchmark_pintura.py al
+reproducir una grabación.
+"""
+
+import cv2
+
+# Índices de MediaPipe Hands (mp_hands.HandLandmark)
+INDEX_FINGER_TIP = 8
+MIDDLE_FINGER_TIP = 12
+
+# Distancia máxima (normalizada) entre índice y corazón para considerar los dedos juntos
+ACTIVE_DISTANCE = 0.05
+
+
+def read_hand_gesture(hand_landmarks, w, h):
+    """
+    Posición del dedo índice en píxeles y si el trazo está activo.
+
+    Usa el gesto de "dedos juntos" (índice y corazón) para activar/desactivar.
+    """
+    index_finger_tip = hand_landmarks.landmark[INDEX_FINGER_TIP]
+    middle_finger_tip = hand_landmarks.landmark[MIDDLE_FINGER_TIP]
+
+    position = (int(index_finger_tip.x * w), int(index_finger_tip.y * h))
+    dist_x = abs(index_finger_tip.x - middle_finger_tip.x)
+    dist_y = abs(index_finger_tip.y - middle_finger_tip.y)
+    return position, (dist_x < ACTIVE_DISTANCE and dist_y < ACTIVE_DISTANCE)
+
+
+def update_stroke(canvas, prev_pos, position, is_active, color, brush_size):
+    """Dibuja el tramo desde la posición anterior y devuelve la nueva posición previa"""
+    if not is_active:
+        return None
+    if prev_pos is None:
+        prev_pos = position
+    cv2.line(canvas, prev_pos, position, color, brush_size)
+    return position
+
+
+def blend_canvas(frame, canvas):
+    """
+    Combina el lienzo con la imagen de la cámara.
+    Se usa una máscara para que el negro del lienzo sea transparente.
+    """
+    gray_canvas = cv2.cvtColor(canvas, cv2.COLOR_BGR2GRAY)
+    _, inv_mask = cv2.threshold(gray_canvas, 1, 255, cv2.THRESH_BINARY_INV)
+    frame_bg = cv2.bitwise_and(frame, frame, mask=inv_mask)
+    return cv2.add(frame_bg, canvas)
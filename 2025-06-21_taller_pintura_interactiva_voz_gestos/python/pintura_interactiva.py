@@ -1,11 +1,18 @@
+import argparse
 import cv2
 import numpy as np
 import mediapipe as mp
 import speech_recognition as sr
+import sys
 import threading
 import time
 import os
 
+from gestos_dibujo import blend_canvas, read_hand_gesture, update_stroke
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from comun.grabacion_landmarks import GrabadorLandmarks, landmarks_a_array
+
 # --- Configuración Inicial ---
 
 # Colores (BGR)
@@ -80,7 +87,16 @@ def voice_recognizer():
 
 
 # --- Detección de Manos y Dibujo ---
-def hand_drawing():
+def hand_drawing(record_path=None, record_frame_scale=None):
+    """
+    Bucle principal de dibujo con la mano.
+
+    Args:
+        record_path: Si se indica, graba los landmarks de la mano en este
+                     archivo .lmk para reproducirlos con benchmark_pintura.py
+        record_frame_scale: Escala de los cuadros que se guardan en la grabación
+                            (None = solo landmarks)
+    """
     global canvas
 
     # Inicializar MediaPipe Hands
@@ -101,6 +117,12 @@ def hand_drawing():
     cap.set(3, 1280)
     cap.set(4, 720)
 
+    recorder = None
+    if record_path:
+        recorder = GrabadorLandmarks(record_path, {"manos": (1, 21, 3)},
+                                     escala_imagen=record_frame_scale,
+                                     metadatos={"ancho": int(cap.get(3)), "alto": int(cap.get(4))})
+
     prev_pos = None
 
     print("✍️  Mueve tu dedo índice para dibujar. Cierra el puño para pausar.")
@@ -118,43 +140,25 @@ def hand_drawing():
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = hands.process(rgb_frame)
 
+        if recorder is not None:
+            recorder.agregar({"manos": landmarks_a_array(results.multi_hand_landmarks)}, frame)
+
         if results.multi_hand_landmarks:
             hand_landmarks = results.multi_hand_landmarks[0]
 
             # Dibujar esqueleto de la mano
             mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
-            # Obtener coordenadas del dedo índice (landmark 8)
-            index_finger_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
+            # Posición del dedo índice y gesto de "dedos juntos"
             h, w, _ = frame.shape
-            cx, cy = int(index_finger_tip.x * w), int(index_finger_tip.y * h)
-
-            # Usar el gesto de "dedos juntos" (índice y corazón) para activar/desactivar
-            middle_finger_tip = hand_landmarks.landmark[mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-            dist_x = abs(index_finger_tip.x - middle_finger_tip.x)
-            dist_y = abs(index_finger_tip.y - middle_finger_tip.y)
-            is_active = (dist_x < 0.05 and dist_y < 0.05)
-
-            if is_active:
-                draw_color = current_color if is_drawing_mode else (0, 0, 0)
-                
-                if prev_pos is None:
-                    prev_pos = (cx, cy)
-
-                cv2.line(canvas, prev_pos, (cx, cy), draw_color, brush_size)
-                prev_pos = (cx, cy)
-            else:
-                prev_pos = None
+            position, is_active = read_hand_gesture(hand_landmarks, w, h)
+            draw_color = current_color if is_drawing_mode else (0, 0, 0)
+            prev_pos = update_stroke(canvas, prev_pos, position, is_active, draw_color, brush_size)
         else:
             prev_pos = None
 
         # Combinar el lienzo con la imagen de la cámara
-        # Se usa una máscara para que el negro del lienzo sea transparente
-        gray_canvas = cv2.cvtColor(canvas, cv2.COLOR_BGR2GRAY)
-        _, inv_mask = cv2.threshold(gray_canvas, 1, 255, cv2.THRESH_BINARY_INV)
-        frame_bg = cv2.bitwise_and(frame, frame, mask=inv_mask)
-        canvas_fg = cv2.bitwise_and(canvas, canvas, mask=~inv_mask)
-        combined_view = cv2.add(frame_bg, canvas)
+        combined_view = blend_canvas(frame, canvas)
 
         cv2.imshow("Pintura Interactiva con Voz y Gestos", combined_view)
 
@@ -163,12 +167,22 @@ def hand_drawing():
 
     cap.release()
     cv2.destroyAllWindows()
+    if recorder is not None:
+        recorder.cerrar()
+        print(f"Grabación guardada en {record_path} ({recorder.cuadros} cuadros)")
     os._exit(0) # Forzar la salida para detener el hilo de voz
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pintura interactiva con voz y gestos")
+    parser.add_argument("--grabar", metavar="RUTA",
+                        help="Graba los landmarks de la mano (.lmk) para reproducirlos con benchmark_pintura.py")
+    parser.add_argument("--escala-cuadros", type=float, default=None,
+                        help="Guarda también cada cuadro reducido a esta escala en la grabación")
+    args = parser.parse_args()
+
     # Iniciar el hilo de reconocimiento de voz
     voice_thread = threading.Thread(target=voice_recognizer, daemon=True)
     voice_thread.start()
 
     # Iniciar la detección de manos y el bucle principal de dibujo
-    hand_drawing() 
\ No newline at end of file
+    hand_drawing(args.grabar, args.escala_cuadros)
\ No newline at end of file
@@ -1,11 +1,16 @@
 import cv2
 import numpy as np
 import os
+import sys
 import csv
+import argparse
 from datetime import datetime
 import time
 from ultralytics import YOLO, settings
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from comun.fuentes_video import agregar_argumentos, abrir_desde_argumentos
+
 # --- Directorios de trabajo ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 LOGS_DIR = os.path.join(BASE_DIR, 'logs')
@@ -40,6 +45,12 @@ def main():
     """
     Función principal que ejecuta el sistema de monitoreo.
     """
+    parser = argparse.ArgumentParser(description="Sistema de monitoreo inteligente con YOLOv8")
+    agregar_argumentos(parser)
+    parser.add_argument("--sin-ventana", action="store_true",
+                        help="No muestra la ventana (para medir con video grabado en un servidor)")
+    args = parser.parse_args()
+
     # Actualizar la configuración de ultralytics para usar el directorio local de modelos
     # Esto asegura que el modelo se descargue en la carpeta correcta
     settings.update({'weights_dir': MODEL_DIR})
@@ -48,24 +59,30 @@ def main():
     model = YOLO('yolov8n.pt') 
     print("Modelo cargado.")
 
-    cap = cv2.VideoCapture(0)
+    cap = abrir_desde_argumentos(args)
     if not cap.isOpened():
-        print("Error: No se pudo abrir la cámara web.")
+        print(f"Error: No se pudo abrir la fuente de video '{args.fuente}'.")
         return
 
     last_detection_time = 0
     system_status = "Iniciando..."
     
+    tiempo_deteccion = 0.0
+    cuadros = 0
+    
     print("Sistema de monitoreo iniciado. Presione 'q' para salir.")
 
     while True:
         ret, frame = cap.read()
         if not ret:
-            print("Error: No se pudo capturar el frame de la cámara.")
+            print("Fin de la fuente de video.")
             break
 
         # Detección de objetos con YOLOv8
+        inicio_deteccion = time.perf_counter()
         results = model(frame, verbose=False)
+        tiempo_deteccion += time.perf_counter() - inicio_deteccion
+        cuadros += 1
         
         bboxes = []
         labels = []
@@ -117,6 +134,9 @@ def main():
         else:
             system_status = "Monitoreando..."
 
+        if args.sin_ventana:
+            continue
+
         # Dibujar cajas delimitadoras sobre la imagen
         output_frame = draw_bounding_boxes(frame.copy(), bboxes, labels, confs)
 
@@ -156,7 +176,11 @@ def main():
             break
             
     cap.release()
-    cv2.destroyAllWindows()
+    if not args.sin_ventana:
+        cv2.destroyAllWindows()
+    print(f"Fuente: {cap.resumen()}")
+    if cuadros:
+        print(f"Detección YOLO: {1000 * tiempo_deteccion / cuadros:.1f} ms por cuadro")
     print("Sistema detenido.")
 
 if __name__ == '__main__':
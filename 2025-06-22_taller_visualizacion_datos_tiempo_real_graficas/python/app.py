@@ -20,7 +20,8 @@ def main():
         "images_dir": "imgs",
         "max_images": 15,
         "interval_seconds": 1.0,
-        "confidence_threshold": 0.3
+        "confidence_threshold": 0.3,
+        "batch_size": 8
     }
     
     print("Configuración:")
@@ -29,6 +30,13 @@ def main():
     print(f"- Número de imágenes: {config['max_images']}")
     print(f"- Intervalo: {config['interval_seconds']} segundos")
     print(f"- Umbral de confianza: {config['confidence_threshold']}")
+    print(f"- Tamaño de lote (modo por lotes): {config['batch_size']}")
+    print()
+    
+    print("Modos disponibles:")
+    print("1. Tiempo real (visualización con intervalo entre imágenes)")
+    print("2. Por lotes (sin ventana, reporta imágenes/segundo)")
+    mode = "batch" if input("Modo [1]: ").strip() == "2" else "realtime"
     print()
     
     try:
@@ -37,16 +45,19 @@ def main():
         analyzer = YoloAnalyzer(**config)
         
         print("¡Sistema listo!")
-        print("- Se abrirá una ventana con la visualización")
-        print("- Presiona 'q' para salir en cualquier momento")
-        print("- Las detecciones se mostrarán con bounding boxes")
-        print("- Verde = detección correcta, Rojo = detección incorrecta")
-        print()
-        
-        input("Presiona Enter para comenzar...")
-        
-        # Iniciar el análisis
-        analyzer.start_analysis()
+        if mode == "batch":
+            analyzer.start_batch_analysis()
+        else:
+            print("- Se abrirá una ventana con la visualización")
+            print("- Presiona 'q' para salir en cualquier momento")
+            print("- Las detecciones se mostrarán con bounding boxes")
+            print("- Verde = detección correcta, Rojo = detección incorrecta")
+            print()
+            
+            input("Presiona Enter para comenzar...")
+            
+            # Iniciar el análisis
+            analyzer.start_analysis()
         
         # Mostrar estadísticas finales
         stats = analyzer.get_statistics()
@@ -59,6 +70,9 @@ def main():
             print(f"Precisión: {stats['accuracy']:.1f}%")
             print(f"Total detecciones: {stats['total_detections']}")
             print(f"Promedio detecciones/imagen: {stats['average_detections_per_image']:.1f}")
+            if 'images_per_second' in stats:
+                print(f"Rendimiento: {stats['images_per_second']:.1f} imágenes/s "
+                      f"(lotes de {stats['batch_size']})")
             print("="*50)
         
         print("¡Análisis completado exitosamente!")
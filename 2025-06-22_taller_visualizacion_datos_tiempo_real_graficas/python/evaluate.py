@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Evaluación offline, sin ventana, de un modelo YOLO sobre un directorio de imágenes.
+
+Recorre cada imagen del directorio exactamente una vez y en orden determinista,
+decodifica en un pool de hilos mientras el modelo procesa lotes, y escribe:
+- per_image.csv: predicción, confianza y latencia de cada imagen
+- per_class.csv: precisión y recall por clase
+- confusion_matrix.csv: matriz de confusión (filas = real, columnas = predicho)
+- summary.json: resumen con exactitud global y rendimiento
+
+La clase real de cada imagen se toma del nombre de su carpeta si está dentro de
+una subcarpeta (imgs/dog/001.jpg -> dog), o del nombre del archivo hasta el
+primer '_' (dog_001.jpg -> dog, dog.png -> dog).
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif'}
+NO_DETECTION = "none"
+
+
+def list_images(images_dir: Path) -> List[Path]:
+    """Lista todas las imágenes del directorio (recursivo) en orden determinista."""
+    if not images_dir.exists():
+        raise FileNotFoundError(f"El directorio {images_dir} no existe")
+
+    images = sorted(p for p in images_dir.rglob('*') if p.suffix.lower() in IMAGE_EXTENSIONS)
+    if not images:
+        raise ValueError(f"No se encontraron imágenes en {images_dir}")
+    return images
+
+
+def label_from_path(image_path: Path, images_dir: Path) -> str:
+    """Obtiene la clase real de una imagen a partir de su carpeta o su nombre."""
+    if image_path.parent != images_dir:
+        return image_path.parent.name.lower()
+    return image_path.stem.split('_')[0].lower()
+
+
+def _decode(image_path: Path) -> Tuple[Optional[np.ndarray], float]:
+    """Decodifica una imagen y mide el tiempo (cv2.imread libera el GIL)."""
+    start = time.perf_counter()
+    image = cv2.imread(str(image_path))
+    return image, time.perf_counter() - start
+
+
+def iter_decoded_batches(image_paths: List[Path], batch_size: int, workers: int,
+                         prefetch_batches: int = 2) -> Iterator[List[Tuple[Path, Optional[np.ndarray], float]]]:
+    """
+    Genera lotes de imágenes decodificadas en el mismo orden de image_paths.
+
+    Solo hay en vuelo batch_size * (prefetch_batches + 1) decodificaciones a la vez,
+    así la memoria no crece con el tamaño del directorio.
+    """
+    max_in_flight = batch_size * (prefetch_batches + 1)
+    pending = deque()
+    next_index = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while next_index < len(image_paths) or pending:
+            while next_index < len(image_paths) and len(pending) < max_in_flight:
+                path = image_paths[next_index]
+                pending.append((path, executor.submit(_decode, path)))
+                next_index += 1
+
+            batch = []
+            while pending and len(batch) < batch_size:
+                path, future = pending.popleft()
+                image, decode_time = future.result()
+                batch.append((path, image, decode_time))
+            yield batch
+
+
+def best_detection(result, names: Dict[int, str]) -> Tuple[str, float]:
+    """Devuelve (clase, confianza) de la detección de mayor confianza de un resultado."""
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return NO_DETECTION, 0.0
+
+    confidences = boxes.conf.cpu().numpy()
+    best = int(np.argmax(confidences))
+    class_id = int(boxes.cls[best].cpu().numpy())
+    return names[class_id].lower(), float(confidences[best])
+
+
+def compute_metrics(rows: List[Dict]) -> Tuple[List[str], np.ndarray, List[Dict]]:
+    """
+    Calcula la matriz de confusión y precisión/recall por clase.
+
+    Returns:
+        classes: Clases en el orden de filas/columnas de la matriz
+        confusion: Matriz (real x predicho) de conteos
+        per_class: Lista de diccionarios con métricas por clase
+    """
+    true_labels = [row['true_label'] for row in rows]
+    predicted = [row['predicted'] for row in rows]
+    classes = sorted(set(true_labels) | (set(predicted) - {NO_DETECTION}))
+    classes.append(NO_DETECTION)
+    index = {name: i for i, name in enumerate(classes)}
+
+    confusion = np.zeros((len(classes), len(classes)), dtype=np.int64)
+    np.add.at(confusion, ([index[t] for t in true_labels], [index[p] for p in predicted]), 1)
+
+    per_class = []
+    for name in classes[:-1]:
+        i = index[name]
+        tp = int(confusion[i, i])
+        predicted_count = int(confusion[:, i].sum())
+        support = int(confusion[i, :].sum())
+        per_class.append({
+            'class': name,
+            'support': support,
+            'predicted': predicted_count,
+            'true_positives': tp,
+            'precision': tp / predicted_count if predicted_count else 0.0,
+            'recall': tp / support if support else 0.0,
+        })
+    return classes, confusion, per_class
+
+
+def write_reports(output_dir: Path, rows: List[Dict], classes: List[str],
+                  confusion: np.ndarray, per_class: List[Dict], summary: Dict):
+    """Escribe los reportes CSV y JSON en output_dir."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(output_dir / 'per_image.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    with open(output_dir / 'per_class.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(per_class[0].keys()) if per_class else ['class'])
+        writer.writeheader()
+        writer.writerows(per_class)
+
+    with open(output_dir / 'confusion_matrix.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['true \\ predicted'] + classes)
+        for name, counts in zip(classes, confusion.tolist()):
+            writer.writerow([name] + counts)
+
+    with open(output_dir / 'summary.json', 'w', encoding='utf-8') as f:
+        json.dump({**summary, 'per_class': per_class}, f, indent=2, ensure_ascii=False)
+
+
+def evaluate(model_path: str = "yolov8n.pt",
+             images_dir: str = "imgs",
+             output_dir: str = "resultados_evaluacion",
+             batch_size: int = 16,
+             workers: int = 4,
+             confidence_threshold: float = 0.3) -> Dict:
+    """
+    Evalúa el modelo sobre todas las imágenes del directorio y guarda los reportes.
+
+    Args:
+        model_path: Ruta al modelo YOLO
+        images_dir: Directorio con las imágenes etiquetadas
+        output_dir: Directorio donde se escriben los reportes
+        batch_size: Imágenes por llamada al modelo
+        workers: Hilos de decodificación
+        confidence_threshold: Umbral de confianza para detecciones
+
+    Returns:
+        Diccionario con el resumen de la evaluación
+    """
+    images_root = Path(images_dir)
+    image_paths = list_images(images_root)
+    batch_size = max(1, batch_size)
+
+    print(f"Cargando modelo YOLO: {model_path}")
+    model = YOLO(model_path)
+
+    print(f"Evaluando {len(image_paths)} imágenes en lotes de {batch_size} ({workers} hilos de decodificación)")
+    rows = []
+    unreadable = 0
+    inference_total = 0.0
+    start_time = time.perf_counter()
+
+    for batch in iter_decoded_batches(image_paths, batch_size, workers):
+        valid = [(path, image, decode_time) for path, image, decode_time in batch if image is not None]
+        for path, image, _ in batch:
+            if image is None:
+                unreadable += 1
+                print(f"No se pudo leer la imagen: {path}")
+        if not valid:
+            continue
+
+        inference_start = time.perf_counter()
+        results = model([image for _, image, _ in valid], conf=confidence_threshold, verbose=False)
+        inference_time = time.perf_counter() - inference_start
+        inference_total += inference_time
+        per_image_inference = inference_time / len(valid)
+
+        for (path, _, decode_time), result in zip(valid, results):
+            true_label = label_from_path(path, images_root)
+            predicted, confidence = best_detection(result, model.names)
+            rows.append({
+                'image': str(path.relative_to(images_root)),
+                'true_label': true_label,
+                'predicted': predicted,
+                'confidence': round(confidence, 4),
+                'correct': int(predicted == true_label),
+                'decode_ms': round(1000 * decode_time, 3),
+                'inference_ms': round(1000 * per_image_inference, 3),
+            })
+
+        print(f"{len(rows)}/{len(image_paths)} imágenes evaluadas")
+
+    elapsed = time.perf_counter() - start_time
+    if not rows:
+        raise ValueError("No se pudo evaluar ninguna imagen")
+
+    classes, confusion, per_class = compute_metrics(rows)
+    correct = sum(row['correct'] for row in rows)
+    inference_ms = [row['inference_ms'] for row in rows]
+    decode_ms = [row['decode_ms'] for row in rows]
+
+    summary = {
+        'model_path': model_path,
+        'images_dir': str(images_root),
+        'total_images': len(rows),
+        'unreadable_images': unreadable,
+        'correct': correct,
+        'accuracy': correct / len(rows),
+        'predictions': dict(Counter(row['predicted'] for row in rows)),
+        'batch_size': batch_size,
+        'workers': workers,
+        'confidence_threshold': confidence_threshold,
+        'elapsed_seconds': elapsed,
+        'images_per_second': len(rows) / elapsed if elapsed > 0 else 0.0,
+        'mean_inference_ms': float(np.mean(inference_ms)),
+        'p95_inference_ms': float(np.percentile(inference_ms, 95)),
+        'mean_decode_ms': float(np.mean(decode_ms)),
+    }
+
+    write_reports(Path(output_dir), rows, classes, confusion, per_class, summary)
+
+    print(f"Exactitud: {100 * summary['accuracy']:.1f}% ({correct}/{len(rows)})")
+    print(f"Rendimiento: {summary['images_per_second']:.1f} imágenes/s")
+    print(f"Reportes guardados en: {output_dir}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluación offline de YOLO sobre un directorio de imágenes")
+    parser.add_argument("--model", default="yolov8n.pt", help="Ruta al modelo YOLO")
+    parser.add_argument("--images-dir", default="imgs", help="Directorio de imágenes etiquetadas")
+    parser.add_argument("--output", default="resultados_evaluacion", help="Directorio de reportes")
+    parser.add_argument("--batch-size", type=int, default=16, help="Imágenes por llamada al modelo")
+    parser.add_argument("--workers", type=int, default=4, help="Hilos de decodificación")
+    parser.add_argument("--conf", type=float, default=0.3, help="Umbral de confianza")
+    args = parser.parse_args()
+
+    try:
+        evaluate(model_path=args.model,
+                 images_dir=args.images_dir,
+                 output_dir=args.output,
+                 batch_size=args.batch_size,
+                 workers=args.workers,
+                 confidence_threshold=args.conf)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,78 @@
 import random
 import time
 import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Callable
 import cv2
 import numpy as np
 
+# Factor de reducción -> bandera de cv2.imread (decodifica directamente a menor resolución)
+REDUCED_READ_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+class DecodedImageCache:
+    def __init__(self, max_mb: float = 64.0):
+        """
+        Caché LRU de imágenes decodificadas con límite de memoria.
+        
+        Args:
+            max_mb: Memoria máxima en MB; 0 desactiva la caché
+        """
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key) -> Optional[np.ndarray]:
+        """Retorna la imagen en caché (y la marca como reciente) o None."""
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return image
+    
+    def put(self, key, image: np.ndarray):
+        """Agrega una imagen, expulsando las menos recientes si se supera el límite."""
+        if image.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._images:
+                self.current_bytes -= self._images.pop(key).nbytes
+            self._images[key] = image
+            self.current_bytes += image.nbytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+    
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'images': len(self._images),
+                'memory_mb': self.current_bytes / (1024 * 1024),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
 class ImageStreamer:
     def __init__(self, 
                  images_dir: str = "imgs", 
                  max_images: int = 15, 
-                 interval_seconds: float = 1.0):
+                 interval_seconds: float = 1.0,
+                 prefetch_size: int = 4,
+                 decode_workers: int = 2,
+                 cache_mb: float = 64.0,
+                 reduce_factor: int = 1):
         """
         Inicializa el streamer de imágenes.
         
@@ -18,10 +80,22 @@ class ImageStreamer:
             images_dir: Directorio que contiene las imágenes
             max_images: Número máximo de imágenes a mostrar
             interval_seconds: Intervalo en segundos entre imágenes
+            prefetch_size: Imágenes que se decodifican por adelantado en segundo plano
+            decode_workers: Hilos de decodificación
+            cache_mb: Memoria máxima (MB) de la caché de imágenes decodificadas
+            reduce_factor: Decodificar a 1/2, 1/4 o 1/8 de la resolución (1 = completa),
+                           útil cuando solo se necesita el tamaño de visualización
         """
+        if reduce_factor not in REDUCED_READ_FLAGS:
+            raise ValueError(f"reduce_factor debe ser uno de {sorted(REDUCED_READ_FLAGS)}")
+        
         self.images_dir = Path(images_dir)
         self.max_images = max_images
         self.interval_seconds = interval_seconds
+        self.prefetch_size = max(1, prefetch_size)
+        self.decode_workers = max(1, decode_workers)
+        self.reduce_factor = reduce_factor
+        self.cache = DecodedImageCache(cache_mb)
         self.current_image_count = 0
         self.is_streaming = False
         self.current_image = None
@@ -55,10 +129,19 @@ class ImageStreamer:
         return random.choice(self.available_images)
     
     def _load_image(self, image_path: Path) -> np.ndarray:
-        """Carga una imagen usando OpenCV."""
-        image = cv2.imread(str(image_path))
+        """Carga una imagen usando OpenCV, reutilizando la caché si ya fue decodificada."""
+        key = (image_path, self.reduce_factor)
+        image = self.cache.get(key)
+        if image is not None:
+            return image
+        
+        image = cv2.imread(str(image_path), REDUCED_READ_FLAGS[self.reduce_factor])
         if image is None:
             raise ValueError(f"No se pudo cargar la imagen: {image_path}")
+        
+        # Las imágenes en caché se comparten: se marcan de solo lectura
+        image.setflags(write=False)
+        self.cache.put(key, image)
         return image
     
     def get_current_image(self) -> Optional[np.ndarray]:
@@ -86,33 +169,51 @@ class ImageStreamer:
     
     def _streaming_loop(self):
         """Loop principal del streaming de imágenes."""
-        while self.is_streaming and self.current_image_count < self.max_images:
-            # Seleccionar imagen aleatoria
-            selected_image_path = self._select_random_image()
-            
-            try:
-                # Cargar la imagen
-                image = self._load_image(selected_image_path)
-                
-                # Actualizar estado
-                self.current_image = image
-                self.current_image_path = selected_image_path
-                self.current_image_count += 1
-                
-                animal_name = self.get_current_animal_name() or "unknown"
-                
-                print(f"Imagen {self.current_image_count}/{self.max_images}: {animal_name}")
-                
-                # Ejecutar callback si está definido
-                if self.image_callback:
-                    self.image_callback(image, animal_name)
+        # Las próximas imágenes se decodifican en segundo plano mientras se espera el intervalo
+        executor = ThreadPoolExecutor(max_workers=self.decode_workers)
+        pending = deque()
+        scheduled = self.current_image_count
+        
+        try:
+            while self.is_streaming and self.current_image_count < self.max_images:
+                # Seleccionar imágenes aleatorias y encolar su decodificación
+                while len(pending) < self.prefetch_size and scheduled < self.max_images:
+                    image_path = self._select_random_image()
+                    pending.append((image_path, executor.submit(self._load_image, image_path)))
+                    scheduled += 1
                 
-                # Esperar el intervalo especificado
-                time.sleep(self.interval_seconds)
+                if not pending:
+                    break
+                selected_image_path, future = pending.popleft()
                 
-            except Exception as e:
-                print(f"Error al procesar imagen {selected_image_path}: {e}")
-                continue
+                try:
+                    # Cargar la imagen (normalmente ya está decodificada)
+                    image = future.result()
+                    
+                    # Actualizar estado
+                    self.current_image = image
+                    self.current_image_path = selected_image_path
+                    self.current_image_count += 1
+                    
+                    animal_name = self.get_current_animal_name() or "unknown"
+                    
+                    print(f"Imagen {self.current_image_count}/{self.max_images}: {animal_name}")
+                    
+                    # Ejecutar callback si está definido
+                    if self.image_callback:
+                        self.image_callback(image, animal_name)
+                    
+                    # Esperar el intervalo especificado
+                    time.sleep(self.interval_seconds)
+                    
+                except Exception as e:
+                    print(f"Error al procesar imagen {selected_image_path}: {e}")
+                    scheduled -= 1  # Se reemplaza por otra imagen
+                    continue
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
         
         self.is_streaming = False
         print("Streaming finalizado")
@@ -144,6 +245,10 @@ class ImageStreamer:
     def get_progress(self) -> tuple:
         """Retorna el progreso actual (imagen_actual, total_imágenes)."""
         return (self.current_image_count, self.max_images)
+    
+    def get_cache_stats(self) -> dict:
+        """Retorna aciertos, fallos y memoria usada por la caché de imágenes."""
+        return self.cache.get_stats()
 
 
 # Ejemplo de uso y función de callback para mostrar imágenes
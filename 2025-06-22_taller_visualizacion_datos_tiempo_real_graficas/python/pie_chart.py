@@ -0,0 +1,143 @@
+import math
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class PieChartRenderer:
+    # Colores vibrantes para cada clase
+    COLORS = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC', '#C2C2F0', '#FFB3E6', '#C4E17F']
+    START_ANGLE = 90
+    LABEL_DISTANCE = 0.6  # Nombres dentro del segmento
+    PCT_DISTANCE = 1.1    # Porcentajes fuera del círculo
+
+    def __init__(self, width: int, height: int, dpi: int = 100):
+        """
+        Renderizador persistente del gráfico de pastel de detecciones.
+
+        Mantiene una sola figura viva, actualiza los segmentos en su lugar y
+        dibuja directamente al buffer del canvas Agg, sin codificar PNG. Solo
+        vuelve a dibujar cuando cambian los conteos.
+
+        Args:
+            width: Ancho de la imagen resultante en píxeles
+            height: Alto de la imagen resultante en píxeles
+            dpi: Resolución de la figura
+        """
+        self.width = width
+        self.height = height
+
+        self.fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi, facecolor='black')
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot(111)
+
+        self.labels: Tuple[str, ...] = ()
+        self.wedges = []
+        self.texts = []
+        self.autotexts = []
+
+        self._last_counts: Optional[Tuple[Tuple[str, int], ...]] = None
+        self._image: Optional[np.ndarray] = None
+        self.redraw_count = 0
+
+    def render(self, class_counts: Dict[str, int]) -> np.ndarray:
+        """
+        Devuelve el gráfico como imagen BGR de tamaño (height, width, 3).
+
+        Args:
+            class_counts: Conteo de detecciones por clase
+
+        Returns:
+            Imagen del gráfico; es la misma instancia mientras los conteos no cambien
+        """
+        counts = tuple(class_counts.items())
+        if self._image is not None and counts == self._last_counts:
+            return self._image
+
+        labels = tuple(label for label, _ in counts)
+        if not counts:
+            self._draw_empty()
+        elif labels == self.labels:
+            self._update_wedges([size for _, size in counts])
+        else:
+            self._draw_pie(labels, [size for _, size in counts])
+
+        self.canvas.draw()
+        rgba = np.asarray(self.canvas.buffer_rgba())
+        self._image = cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR)
+        if self._image.shape[:2] != (self.height, self.width):
+            self._image = cv2.resize(self._image, (self.width, self.height))
+
+        self._last_counts = counts
+        self.redraw_count += 1
+        return self._image
+
+    def _reset_axes(self):
+        self.ax.clear()
+        self.ax.set_facecolor('black')
+        self.labels = ()
+        self.wedges, self.texts, self.autotexts = [], [], []
+
+    def _draw_empty(self):
+        """Si no hay datos, mostrar mensaje"""
+        self._reset_axes()
+        self.ax.text(0.5, 0.5, 'Esperando\ndetecciones...',
+                     horizontalalignment='center', verticalalignment='center',
+                     transform=self.ax.transAxes, fontsize=14, color='white')
+        self.ax.set_xlim(0, 1)
+        self.ax.set_ylim(0, 1)
+        self.ax.axis('off')
+
+    def _draw_pie(self, labels: Tuple[str, ...], sizes):
+        """Crea los segmentos desde cero (solo cuando cambia el conjunto de clases)"""
+        self._reset_axes()
+        colors = [self.COLORS[i % len(self.COLORS)] for i in range(len(labels))]
+
+        self.wedges, self.texts, self.autotexts = self.ax.pie(
+            sizes, labels=labels, autopct='%1.1f%%',
+            colors=colors, startangle=self.START_ANGLE,
+            textprops={'color': 'white', 'fontsize': 9},
+            pctdistance=self.PCT_DISTANCE,
+            labeldistance=self.LABEL_DISTANCE)
+
+        # Configurar texto de las etiquetas (nombres de clase, dentro)
+        for text in self.texts:
+            text.set_fontweight('bold')
+            text.set_fontsize(10)
+
+        # Configurar texto de los porcentajes (fuera)
+        for autotext in self.autotexts:
+            autotext.set_fontweight('bold')
+            autotext.set_fontsize(9)
+
+        self.labels = labels
+        self._set_title(sum(sizes))
+
+    def _update_wedges(self, sizes):
+        """Actualiza ángulos, posiciones y porcentajes de los segmentos existentes"""
+        total = float(sum(sizes))
+        theta1 = self.START_ANGLE
+
+        for wedge, text, autotext, size in zip(self.wedges, self.texts, self.autotexts, sizes):
+            fraction = size / total
+            theta2 = theta1 + 360.0 * fraction
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+
+            middle = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            text.set_position((self.LABEL_DISTANCE * x, self.LABEL_DISTANCE * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((self.PCT_DISTANCE * x, self.PCT_DISTANCE * y))
+            autotext.set_text(f'{100 * fraction:.1f}%')
+
+            theta1 = theta2
+
+        self._set_title(int(total))
+
+    def _set_title(self, total_detections: int):
+        self.ax.set_title(f'Detecciones por Clase\n(Total: {total_detections})',
+                          color='white', fontsize=12, pad=20)
@@ -1,10 +1,11 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 import time
 from ultralytics import YOLO
-from typing import List, Dict
+from typing import List, Dict, Optional
+from pathlib import Path
 from img_stream import ImageStreamer
+from pie_chart import PieChartRenderer
 from collections import Counter
 
 class YoloAnalyzer:
@@ -13,7 +14,8 @@ class YoloAnalyzer:
                  images_dir: str = "imgs",
                  max_images: int = 15,
                  interval_seconds: float = 1.0,
-                 confidence_threshold: float = 0.5):
+                 confidence_threshold: float = 0.5,
+                 batch_size: int = 8):
         """
         Inicializa el analizador YOLO con streaming de imágenes.
         
@@ -23,6 +25,7 @@ class YoloAnalyzer:
             max_images: Número máximo de imágenes a procesar
             interval_seconds: Intervalo entre imágenes
             confidence_threshold: Umbral de confianza para detecciones
+            batch_size: Imágenes por llamada al modelo en el modo por lotes
         """
         self.model_path = model_path
         self.confidence_threshold = confidence_threshold
@@ -32,6 +35,14 @@ class YoloAnalyzer:
         self.display_image = None
         self.is_running = False
         self.class_counts = Counter()  # Contador para las clases detectadas
+        self.pie_renderer = None
+        self.batch_size = max(1, batch_size)
+        self.batch_stats = {}
+        
+        # Totales acumulados (el log solo guarda las últimas entradas)
+        self.total_images_processed = 0
+        self.total_images_correct = 0
+        self.total_detections = 0
         
         # Configurar el streamer de imágenes
         self.image_streamer = ImageStreamer(
@@ -267,7 +278,10 @@ class YoloAnalyzer:
     
     def _create_pie_chart(self, width: int, height: int) -> np.ndarray:
         """
-        Crea un gráfico de pastel dinámico con matplotlib.
+        Obtiene el gráfico de pastel de las clases detectadas.
+        
+        El renderizador mantiene la figura viva y solo vuelve a dibujar cuando
+        cambian los conteos de clases.
         
         Args:
             width: Ancho del gráfico
@@ -276,86 +290,10 @@ class YoloAnalyzer:
         Returns:
             Imagen del gráfico de pastel como array de NumPy
         """
-        # Configurar matplotlib para no mostrar ventanas
-        plt.ioff()
-        
-        # Crear figura con fondo negro
-        fig, ax = plt.subplots(figsize=(width/100, height/100), facecolor='black')
-        ax.set_facecolor('black')
-        
-        if not self.class_counts:
-            # Si no hay datos, mostrar mensaje
-            ax.text(0.5, 0.5, 'Esperando\ndetecciones...', 
-                   horizontalalignment='center', verticalalignment='center',
-                   transform=ax.transAxes, fontsize=14, color='white')
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-        else:
-            # Datos para el gráfico de pastel
-            labels = list(self.class_counts.keys())
-            sizes = list(self.class_counts.values())
-            total_detections = sum(sizes)
-            
-            # Colores vibrantes para cada clase
-            colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC', '#C2C2F0', '#FFB3E6', '#C4E17F']
-            colors = colors[:len(labels)]  # Usar solo los colores necesarios
-            
-            # Crear gráfico de pastel
-            # labels va dentro del segmento (nombres de clase)
-            # autopct va fuera del segmento (porcentajes)
-            pie_result = ax.pie(sizes, labels=labels, autopct='%1.1f%%',
-                              colors=colors, startangle=90,
-                              textprops={'color': 'white', 'fontsize': 9},
-                              pctdistance=1.1,  # Porcentajes fuera del círculo
-                              labeldistance=0.6)  # Nombres dentro del segmento
-            
-            # Título
-            ax.set_title(f'Detecciones por Clase\n(Total: {total_detections})', 
-                        color='white', fontsize=12, pad=20)
-            
-            # Mejorar la apariencia del texto si hay elementos suficientes
-            if len(pie_result) >= 3:
-                wedges, texts, autotexts = pie_result
-                
-                # Configurar texto de las etiquetas (nombres de clase, dentro)
-                for text in texts:
-                    text.set_color('white')
-                    text.set_fontweight('bold')
-                    text.set_fontsize(10)
-                
-                # Configurar texto de los porcentajes (fuera)
-                for autotext in autotexts:
-                    autotext.set_color('white')
-                    autotext.set_fontweight('bold')
-                    autotext.set_fontsize(9)
-        
-        # Convertir la figura a imagen usando PIL
-        from PIL import Image
-        import io
-        
-        # Guardar la figura en un buffer
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', facecolor='black', bbox_inches='tight', dpi=100)
-        buf.seek(0)
-        
-        # Cargar la imagen con PIL y convertir a array NumPy
-        pil_image = Image.open(buf)
-        image_array = np.array(pil_image)
-        
-        # Convertir RGBA a BGR si es necesario
-        if image_array.shape[2] == 4:  # RGBA
-            image_array = cv2.cvtColor(image_array, cv2.COLOR_RGBA2BGR)
-        elif image_array.shape[2] == 3:  # RGB
-            image_array = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
-        
-        # Redimensionar si es necesario
-        if image_array.shape[1] != width or image_array.shape[0] != height:
-            image_array = cv2.resize(image_array, (width, height))
-        
-        plt.close(fig)
-        buf.close()
-        return image_array
+        if (self.pie_renderer is None or self.pie_renderer.width != width
+                or self.pie_renderer.height != height):
+            self.pie_renderer = PieChartRenderer(width, height)
+        return self.pie_renderer.render(self.class_counts)
     
     def _update_detection_log(self, detections: List[Dict], true_animal: str):
         """
@@ -378,6 +316,10 @@ class YoloAnalyzer:
         
         self.detection_log.append(log_entry)
         
+        self.total_images_processed += 1
+        self.total_images_correct += int(correct_detections > 0)
+        self.total_detections += len(detections)
+        
         # Mantener solo las últimas 50 entradas para evitar uso excesivo de memoria
         if len(self.detection_log) > 50:
             self.detection_log = self.detection_log[-50:]
@@ -454,6 +396,70 @@ class YoloAnalyzer:
             
         print("Análisis detenido exitosamente")
     
+    def _process_batch(self, images: List[np.ndarray], animal_names: List[str]):
+        """
+        Procesa un grupo de imágenes con una sola llamada al modelo.
+        
+        Args:
+            images: Imágenes a procesar
+            animal_names: Nombre real del animal de cada imagen
+        """
+        if self.model is None or not images:
+            return
+        results = self.model(images, conf=self.confidence_threshold, verbose=False)
+        
+        for result, animal_name in zip(results, animal_names):
+            detections = self._extract_detections(result, animal_name)
+            self.current_detections = detections
+            self._update_detection_log(detections, animal_name)
+    
+    def start_batch_analysis(self, image_paths: Optional[List[Path]] = None):
+        """
+        Analiza imágenes en lotes, sin ventana ni intervalo entre imágenes.
+        
+        Args:
+            image_paths: Imágenes a procesar. Por defecto, las imágenes del
+                         directorio en orden, hasta max_images.
+        """
+        if image_paths is None:
+            image_paths = sorted(self.image_streamer.available_images)[:self.image_streamer.max_images]
+        
+        total = len(image_paths)
+        print(f"Análisis por lotes iniciado: {total} imágenes en lotes de {self.batch_size}")
+        
+        processed = 0
+        inference_time = 0.0
+        start_time = time.time()
+        
+        for start in range(0, total, self.batch_size):
+            batch_paths = image_paths[start:start + self.batch_size]
+            images = []
+            animal_names = []
+            for image_path in batch_paths:
+                try:
+                    images.append(self.image_streamer._load_image(image_path))
+                    animal_names.append(image_path.stem)
+                except ValueError as e:
+                    print(e)
+            
+            batch_start = time.time()
+            self._process_batch(images, animal_names)
+            inference_time += time.time() - batch_start
+            processed += len(images)
+            
+            done = min(start + self.batch_size, total)
+            print(f"Lote {start // self.batch_size + 1}: {done}/{total} imágenes")
+        
+        elapsed = time.time() - start_time
+        self.batch_stats = {
+            'batch_size': self.batch_size,
+            'elapsed_seconds': elapsed,
+            'inference_seconds': inference_time,
+            'images_per_second': (processed / elapsed) if elapsed > 0 else 0,
+        }
+        print(f"Análisis por lotes completado: {processed} imágenes en {elapsed:.2f}s "
+              f"({self.batch_stats['images_per_second']:.1f} imágenes/s)")
+    
     def get_statistics(self) -> Dict:
         """
         Retorna estadísticas del análisis.
@@ -461,21 +467,22 @@ class YoloAnalyzer:
         Returns:
             Diccionario con estadísticas
         """
-        if not self.detection_log:
+        if self.total_images_processed == 0:
             return {}
         
-        total_images = len(self.detection_log)
-        total_correct = sum(entry['correct_detections'] > 0 for entry in self.detection_log)
-        total_detections = sum(entry['total_detections'] for entry in self.detection_log)
+        total_images = self.total_images_processed
+        total_correct = self.total_images_correct
+        total_detections = self.total_detections
         
-        return {
+        stats = {
             'total_images_processed': total_images,
             'images_with_correct_detection': total_correct,
             'accuracy': (total_correct / total_images * 100) if total_images > 0 else 0,
             'total_detections': total_detections,
             'average_detections_per_image': (total_detections / total_images) if total_images > 0 else 0
         }
-
+        stats.update(self.batch_stats)
+        return stats
 
 if __name__ == "__main__":
     try:
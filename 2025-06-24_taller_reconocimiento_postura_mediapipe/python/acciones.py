@@ -0,0 +1,20 @@
+"""
+Reglas de las acciones del taller, escritas con el motor de reglas.
+
+El orden importa: igual que en la cadena if/elif original, gana la primera
+regla que se cumple.
+"""
+
+from reglas import MotorReglas, Regla, cerca, punto
+
+hombro_izq, hombro_der = punto("LEFT_SHOULDER"), punto("RIGHT_SHOULDER")
+muneca_izq, muneca_der = punto("LEFT_WRIST"), punto("RIGHT_WRIST")
+cadera_izq, cadera_der = punto("LEFT_HIP"), punto("RIGHT_HIP")
+rodilla_izq, rodilla_der = punto("LEFT_KNEE"), punto("RIGHT_KNEE")
+
+ACCIONES = MotorReglas([
+    # Ambas muñecas por encima de los hombros (y crece hacia abajo)
+    Regla("Levantando brazos", (muneca_izq.y < hombro_izq.y) & (muneca_der.y < hombro_der.y)),
+    Regla("Sentado", (cadera_izq.y > rodilla_izq.y) & (cadera_der.y > rodilla_der.y)),
+    Regla("Caminando", cerca(cadera_izq.y, cadera_der.y, 0.05) & cerca(rodilla_izq.y, rodilla_der.y, 0.05)),
+], por_defecto="Accion no reconocida")
@@ -0,0 +1,112 @@
+"""
+Evaluación offline de las reglas de postura sobre una secuencia de landmarks.
+
+Acepta una grabación .lmk hecha con `python solucion.py --grabar sesion.lmk` o
+un array (T, 33, 4) guardado con np.save. Clasifica todos los cuadros en lote
+con el motor de reglas y muestra cuántos cuadros recibió cada acción, cuántas
+veces cambió la etiqueta y el rendimiento en cuadros por segundo. Además
+reproduce la secuencia cuadro a cuadro por el mismo camino que el programa en
+vivo (suavizado One-Euro + clasificación). No necesita cámara ni MediaPipe.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from acciones import ACCIONES
+from landmarks import NUM_LANDMARKS, X, Z
+from suavizado import FiltroOneEuro
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from comun.grabacion_landmarks import Grabacion, leer_grabacion, reproducir
+
+FPS_NPY = 30.0  # los .npy no traen marcas de tiempo
+
+
+def cargar_secuencia(ruta):
+    """
+    Returns:
+        Grabacion con el flujo "pose" (T, 1, 33, 4); en las grabaciones .lmk
+        solo se conservan los cuadros en los que se detectó una persona
+    """
+    if ruta.endswith(".npy"):
+        secuencia = np.load(ruta)
+        if secuencia.ndim != 3 or secuencia.shape[1:] != (NUM_LANDMARKS, 4):
+            raise ValueError(f"Se esperaba un array (T, {NUM_LANDMARKS}, 4) y se obtuvo {secuencia.shape}")
+        total = len(secuencia)
+        return Grabacion(np.arange(total) / FPS_NPY, {"pose": secuencia.astype(np.float32)[:, None]},
+                         {"pose": np.ones(total, dtype=np.int32)}, [b""] * total, None, {})
+
+    grabacion = leer_grabacion(ruta)
+    if "pose" not in grabacion.flujos:
+        raise ValueError(f"{ruta} no contiene landmarks de pose")
+    con_pose = grabacion.conteos["pose"] > 0
+    return Grabacion(grabacion.tiempos[con_pose], {"pose": grabacion.flujos["pose"][con_pose]},
+                     {"pose": grabacion.conteos["pose"][con_pose]}, [b""] * int(con_pose.sum()),
+                     None, grabacion.metadatos)
+
+
+def evaluar(secuencia, motor=ACCIONES, repeticiones=10):
+    """
+    Clasifica la secuencia y mide el tiempo de la evaluación en lote.
+
+    Returns:
+        etiquetas (T,), segundos por pasada
+    """
+    etiquetas = motor.clasificar_lote(secuencia)
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        motor.clasificar_lote(secuencia)
+    return etiquetas, (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evalúa las reglas de postura sobre landmarks grabados")
+    parser.add_argument("secuencia", help="Grabación .lmk o archivo .npy con un array (T, 33, 4)")
+    parser.add_argument("--repeticiones", type=int, default=10, help="Pasadas para medir el tiempo")
+    args = parser.parse_args()
+
+    try:
+        grabacion = cargar_secuencia(args.secuencia)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    secuencia = grabacion.flujos["pose"][:, 0]
+    if not len(secuencia):
+        print("La secuencia no tiene cuadros con pose")
+        return 1
+
+    etiquetas, segundos = evaluar(secuencia, repeticiones=args.repeticiones)
+    cambios = int(np.count_nonzero(etiquetas[1:] != etiquetas[:-1]))
+
+    print(f"Cuadros: {len(secuencia)}  Reglas: {len(ACCIONES.reglas)}")
+    for regla in ACCIONES.reglas:
+        print(f"  {regla}")
+    print("Cuadros por acción:")
+    for accion, cantidad in Counter(etiquetas.tolist()).most_common():
+        print(f"  {accion:<22} {cantidad}")
+    print(f"Cambios de etiqueta: {cambios}")
+    print(f"Evaluación en lote: {1000 * segundos:.2f} ms ({len(secuencia) / segundos:,.0f} cuadros/s)")
+
+    # Cuadro a cuadro, como en vivo: suavizado + clasificación
+    filtro = FiltroOneEuro()
+    suavizadas = []
+
+    def procesar(indice, t):
+        puntos = secuencia[indice].copy()
+        puntos[:, X:Z + 1] = filtro(puntos[:, X:Z + 1], t)
+        suavizadas.append(ACCIONES.clasificar(puntos))
+
+    estadisticas = reproducir(grabacion, procesar)
+    suavizadas = np.array(suavizadas)
+    print(f"Cuadro a cuadro con suavizado: {estadisticas.resumen()}")
+    print(f"Cambios de etiqueta con suavizado: {int(np.count_nonzero(suavizadas[1:] != suavizadas[:-1]))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
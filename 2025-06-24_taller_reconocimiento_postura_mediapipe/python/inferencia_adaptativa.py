@@ -0,0 +1,130 @@
+"""
+Inferencia de pose cada k cuadros con extrapolación de landmarks.
+
+pose.process es lo más caro del ciclo. PoseAdaptativa lo ejecuta solo en uno de
+cada k cuadros y, en los cuadros intermedios, extrapola los landmarks con la
+velocidad estimada entre las dos últimas inferencias, de modo que el dibujo y
+la clasificación siguen ocurriendo en todos los cuadros.
+
+k se ajusta solo: con el tiempo medio de inferencia y el del resto del
+procesamiento de un cuadro, se elige el menor k que deja el costo promedio por
+cuadro dentro del presupuesto 1 / fps_objetivo.
+"""
+
+import math
+import time
+
+from landmarks import landmarks_a_array
+
+MAX_EXTRAPOLACION = 0.5  # segundos; más allá se congela la última pose
+
+
+class PoseAdaptativa:
+    """
+    Envuelve un mp_pose.Pose y decide en qué cuadros ejecutar la inferencia.
+
+    Args:
+        pose: Instancia de mp.solutions.pose.Pose
+        fps_objetivo: Cuadros por segundo que debe sostener el ciclo completo
+        k_maximo: Máximo de cuadros entre inferencias
+        suavizado: Peso de la medición nueva en los promedios móviles de tiempos
+    """
+
+    def __init__(self, pose, fps_objetivo=30.0, k_maximo=4, suavizado=0.2):
+        self.pose = pose
+        self.presupuesto = 1.0 / fps_objetivo
+        self.k_maximo = k_maximo
+        self.suavizado = suavizado
+
+        self.k = 1
+        self.desde_inferencia = 0
+        self.tiempo_inferencia = None  # promedio móvil (s)
+        self.tiempo_resto = None       # promedio móvil del resto del cuadro (s)
+        self.inferencia_cuadro = 0.0   # segundos de pose.process en el cuadro actual
+
+        self.puntos = None       # landmarks de la última inferencia (33, 4)
+        self.t_puntos = None
+        self.velocidad = None    # (33, 3) unidades normalizadas por segundo
+
+        self.inferencias = 0
+        self.cuadros = 0
+        self.suma_k = 0
+
+    def _promediar(self, actual, nuevo):
+        return nuevo if actual is None else actual + self.suavizado * (nuevo - actual)
+
+    def _ajustar_k(self):
+        """Menor k con tiempo_resto + tiempo_inferencia / k <= presupuesto"""
+        disponible = self.presupuesto - (self.tiempo_resto or 0.0)
+        if disponible <= 0:
+            self.k = self.k_maximo
+        else:
+            self.k = min(self.k_maximo, max(1, math.ceil(self.tiempo_inferencia / disponible)))
+
+    def _inferir(self, frame_rgb, t):
+        inicio = time.perf_counter()
+        results = self.pose.process(frame_rgb)
+        self.inferencia_cuadro = time.perf_counter() - inicio
+        self.tiempo_inferencia = self._promediar(self.tiempo_inferencia, self.inferencia_cuadro)
+        self.inferencias += 1
+        self.desde_inferencia = 0
+        self._ajustar_k()
+
+        if not results.pose_landmarks:
+            self.puntos = self.velocidad = None
+            return None
+
+        puntos = landmarks_a_array(results.pose_landmarks)
+        if self.puntos is not None and t > self.t_puntos:
+            nueva = (puntos[:, :3] - self.puntos[:, :3]) / (t - self.t_puntos)
+            self.velocidad = nueva if self.velocidad is None else 0.5 * (self.velocidad + nueva)
+        self.puntos, self.t_puntos = puntos, t
+        return puntos.copy()
+
+    def _extrapolar(self, t):
+        if self.puntos is None:
+            return None
+        if self.velocidad is None:
+            return self.puntos.copy()
+        puntos = self.puntos.copy()
+        puntos[:, :3] += self.velocidad * min(t - self.t_puntos, MAX_EXTRAPOLACION)
+        return puntos
+
+    def procesar(self, frame_rgb, t=None):
+        """
+        Landmarks del cuadro actual, inferidos o extrapolados.
+
+        Args:
+            frame_rgb: Cuadro en RGB
+            t: Marca de tiempo del cuadro en segundos (por defecto, ahora)
+
+        Returns:
+            (puntos, inferido): array (33, 4) o None si no hay persona, y si en
+            este cuadro se ejecutó pose.process
+        """
+        t = time.perf_counter() if t is None else t
+        self.cuadros += 1
+        self.suma_k += self.k
+        self.inferencia_cuadro = 0.0
+
+        self.desde_inferencia += 1
+        if self.tiempo_inferencia is None or self.desde_inferencia >= self.k:
+            return self._inferir(frame_rgb, t), True
+        return self._extrapolar(t), False
+
+    def registrar_costo_cuadro(self, segundos):
+        """
+        Informa cuánto tardó el procesamiento completo del cuadro (sin esperar a
+        la cámara ni a la ventana); la parte que no fue inferencia ajusta k.
+        """
+        resto = max(0.0, segundos - self.inferencia_cuadro)
+        self.tiempo_resto = self._promediar(self.tiempo_resto, resto)
+
+    def reporte(self):
+        """Resumen de cuántos cuadros se infirieron y el k promedio"""
+        if not self.cuadros:
+            return "Sin cuadros procesados"
+        return (f"Inferencias: {self.inferencias} de {self.cuadros} cuadros "
+                f"(k promedio {self.suma_k / self.cuadros:.2f}, "
+                f"inferencia {1000 * (self.tiempo_inferencia or 0):.1f} ms, "
+                f"resto {1000 * (self.tiempo_resto or 0):.1f} ms)")
@@ -0,0 +1,34 @@
+"""
+Landmarks de MediaPipe Pose como arrays de NumPy.
+
+Los landmarks de un cuadro se convierten una sola vez en un array (33, 4) con
+columnas x, y, z y visibilidad; el resto del código (suavizado, extrapolación,
+clasificación y dibujo) trabaja sobre ese array.
+"""
+
+import numpy as np
+
+# Columnas del array de landmarks
+X, Y, Z, VISIBILIDAD = range(4)
+NUM_LANDMARKS = 33
+UMBRAL_VISIBILIDAD = 0.5
+
+# Nombres en el orden de mp.solutions.pose.PoseLandmark; permiten usar los
+# landmarks sin importar MediaPipe (por ejemplo, al evaluar grabaciones)
+NOMBRES_LANDMARKS = (
+    "NOSE", "LEFT_EYE_INNER", "LEFT_EYE", "LEFT_EYE_OUTER",
+    "RIGHT_EYE_INNER", "RIGHT_EYE", "RIGHT_EYE_OUTER", "LEFT_EAR", "RIGHT_EAR",
+    "MOUTH_LEFT", "MOUTH_RIGHT", "LEFT_SHOULDER", "RIGHT_SHOULDER",
+    "LEFT_ELBOW", "RIGHT_ELBOW", "LEFT_WRIST", "RIGHT_WRIST",
+    "LEFT_PINKY", "RIGHT_PINKY", "LEFT_INDEX", "RIGHT_INDEX",
+    "LEFT_THUMB", "RIGHT_THUMB", "LEFT_HIP", "RIGHT_HIP",
+    "LEFT_KNEE", "RIGHT_KNEE", "LEFT_ANKLE", "RIGHT_ANKLE",
+    "LEFT_HEEL", "RIGHT_HEEL", "LEFT_FOOT_INDEX", "RIGHT_FOOT_INDEX",
+)
+INDICE_LANDMARK = {nombre: i for i, nombre in enumerate(NOMBRES_LANDMARKS)}
+
+
+def landmarks_a_array(pose_landmarks):
+    """Convierte results.pose_landmarks en un array (33, 4): x, y, z, visibilidad"""
+    return np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in pose_landmarks.landmark],
+                    dtype=np.float32)
@@ -0,0 +1,227 @@
+"""
+Motor declarativo de reglas de postura sobre arrays de landmarks.
+
+Una regla es una expresión sobre coordenadas de landmarks que se escribe con
+operadores normales de Python y se evalúa de forma vectorizada:
+
+    brazos_arriba = ((punto("LEFT_WRIST").y < punto("LEFT_SHOULDER").y) &
+                     (punto("RIGHT_WRIST").y < punto("RIGHT_SHOULDER").y))
+
+La expresión no calcula nada al construirse: guarda un árbol de operaciones que
+luego se evalúa sobre un array (..., 33, 4). Con un solo cuadro (33, 4) el
+resultado es un booleano; con una secuencia grabada (T, 33, 4) es un array (T,)
+y todas las reglas se evalúan para todos los cuadros con unas pocas operaciones
+de NumPy cada una.
+"""
+
+import operator
+
+import numpy as np
+
+from landmarks import INDICE_LANDMARK, NOMBRES_LANDMARKS, UMBRAL_VISIBILIDAD, VISIBILIDAD, X, Y, Z
+
+
+def _como_expresion(valor):
+    return valor if isinstance(valor, Expresion) else Constante(valor)
+
+
+class Expresion:
+    """Nodo del árbol de una regla; las subclases implementan evaluar()"""
+
+    def evaluar(self, puntos):
+        raise NotImplementedError
+
+    def _operacion(self, funcion, simbolo, otro, invertida=False):
+        otro = _como_expresion(otro)
+        operandos = (otro, self) if invertida else (self, otro)
+        return Operacion(funcion, simbolo, *operandos)
+
+    def __add__(self, otro):
+        return self._operacion(operator.add, "+", otro)
+
+    def __radd__(self, otro):
+        return self._operacion(operator.add, "+", otro, invertida=True)
+
+    def __sub__(self, otro):
+        return self._operacion(operator.sub, "-", otro)
+
+    def __rsub__(self, otro):
+        return self._operacion(operator.sub, "-", otro, invertida=True)
+
+    def __mul__(self, otro):
+        return self._operacion(operator.mul, "*", otro)
+
+    def __rmul__(self, otro):
+        return self._operacion(operator.mul, "*", otro, invertida=True)
+
+    def __truediv__(self, otro):
+        return self._operacion(operator.truediv, "/", otro)
+
+    def __lt__(self, otro):
+        return self._operacion(operator.lt, "<", otro)
+
+    def __le__(self, otro):
+        return self._operacion(operator.le, "<=", otro)
+
+    def __gt__(self, otro):
+        return self._operacion(operator.gt, ">", otro)
+
+    def __ge__(self, otro):
+        return self._operacion(operator.ge, ">=", otro)
+
+    def __and__(self, otro):
+        return self._operacion(np.logical_and, "&", otro)
+
+    def __or__(self, otro):
+        return self._operacion(np.logical_or, "|", otro)
+
+    def __invert__(self):
+        return Operacion(np.logical_not, "~", self)
+
+    def __neg__(self):
+        return Operacion(np.negative, "-", self)
+
+    def __abs__(self):
+        return Operacion(np.abs, "abs", self)
+
+
+class Constante(Expresion):
+    def __init__(self, valor):
+        self.valor = valor
+
+    def evaluar(self, puntos):
+        return self.valor
+
+    def __repr__(self):
+        return repr(self.valor)
+
+
+class Coordenada(Expresion):
+    """Una columna (x, y, z o visibilidad) de un landmark"""
+
+    COLUMNAS = {X: "x", Y: "y", Z: "z", VISIBILIDAD: "visibilidad"}
+
+    def __init__(self, indice, columna):
+        self.indice = indice
+        self.columna = columna
+
+    def evaluar(self, puntos):
+        return puntos[..., self.indice, self.columna]
+
+    def __repr__(self):
+        return f"{NOMBRES_LANDMARKS[self.indice]}.{self.COLUMNAS[self.columna]}"
+
+
+class Operacion(Expresion):
+    def __init__(self, funcion, simbolo, *operandos):
+        self.funcion = funcion
+        self.simbolo = simbolo
+        self.operandos = operandos
+
+    def evaluar(self, puntos):
+        return self.funcion(*(operando.evaluar(puntos) for operando in self.operandos))
+
+    def __repr__(self):
+        if len(self.operandos) == 1:
+            texto = repr(self.operandos[0])
+            return f"{self.simbolo}{texto}" if texto.startswith("(") else f"{self.simbolo}({texto})"
+        izquierdo, derecho = self.operandos
+        return f"({izquierdo!r} {self.simbolo} {derecho!r})"
+
+
+class Punto:
+    """Acceso por nombre a las coordenadas de un landmark dentro de una regla"""
+
+    def __init__(self, nombre):
+        if nombre not in INDICE_LANDMARK:
+            raise ValueError(f"Landmark desconocido: {nombre}")
+        self.indice = INDICE_LANDMARK[nombre]
+
+    @property
+    def x(self):
+        return Coordenada(self.indice, X)
+
+    @property
+    def y(self):
+        return Coordenada(self.indice, Y)
+
+    @property
+    def z(self):
+        return Coordenada(self.indice, Z)
+
+    @property
+    def visibilidad(self):
+        return Coordenada(self.indice, VISIBILIDAD)
+
+    @property
+    def visible(self):
+        return Coordenada(self.indice, VISIBILIDAD) >= UMBRAL_VISIBILIDAD
+
+
+def punto(nombre):
+    return Punto(nombre)
+
+
+def cerca(a, b, tolerancia):
+    """|a - b| < tolerancia"""
+    return abs(_como_expresion(a) - b) < tolerancia
+
+
+class Regla:
+    def __init__(self, nombre, condicion):
+        self.nombre = nombre
+        self.condicion = condicion
+
+    def __repr__(self):
+        return f"{self.nombre}: {self.condicion!r}"
+
+
+class MotorReglas:
+    """
+    Evalúa un conjunto ordenado de reglas; como una cadena if/elif, la etiqueta
+    de un cuadro es la de la primera regla que se cumple.
+
+    Args:
+        reglas: Lista de Regla en orden de prioridad
+        por_defecto: Etiqueta si ninguna regla se cumple
+    """
+
+    def __init__(self, reglas, por_defecto):
+        self.reglas = list(reglas)
+        self.por_defecto = por_defecto
+        self.etiquetas = np.array([regla.nombre for regla in self.reglas] + [por_defecto])
+
+    def evaluar(self, puntos):
+        """
+        Resultado de cada regla.
+
+        Args:
+            puntos: Array (33, 4) o (..., 33, 4)
+
+        Returns:
+            Booleanos (..., num_reglas)
+        """
+        puntos = np.asarray(puntos)
+        forma = puntos.shape[:-2]
+        return np.stack([np.broadcast_to(regla.condicion.evaluar(puntos), forma)
+                         for regla in self.reglas], axis=-1)
+
+    def indices(self, puntos):
+        """Índice de la regla ganadora de cada cuadro (len(reglas) = por defecto)"""
+        cumplidas = self.evaluar(puntos)
+        return np.where(cumplidas.any(axis=-1), cumplidas.argmax(axis=-1), len(self.reglas))
+
+    def clasificar(self, puntos):
+        """
+        Etiqueta de un cuadro (33, 4). Con un solo cuadro no hay nada que
+        vectorizar, así que se evalúa regla por regla y se para en la primera
+        que se cumple.
+        """
+        for regla in self.reglas:
+            if regla.condicion.evaluar(puntos):
+                return regla.nombre
+        return self.por_defecto
+
+    def clasificar_lote(self, secuencia):
+        """Etiquetas de una secuencia grabada (T, 33, 4) como array de strings (T,)"""
+        return self.etiquetas[self.indices(secuencia)]
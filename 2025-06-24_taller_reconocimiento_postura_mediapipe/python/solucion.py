@@ -1,61 +1,189 @@
+import argparse
+import os
+import sys
+import time
+
 import cv2
 import mediapipe as mp
 import numpy as np
 
+from acciones import ACCIONES
+from inferencia_adaptativa import PoseAdaptativa
+from landmarks import Z, VISIBILIDAD, UMBRAL_VISIBILIDAD, landmarks_a_array
+from suavizado import FiltroOneEuro
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from comun.grabacion_landmarks import GrabadorLandmarks
+from comun.fuentes_video import agregar_argumentos, abrir_desde_argumentos
+
 # Inicializar MediaPipe Pose
 mp_pose = mp.solutions.pose
-pose = mp_pose.Pose()
-mp_drawing = mp.solutions.drawing_utils
-
-# Inicializar captura de video
-cap = cv2.VideoCapture(0)
-
-while cap.isOpened():
-    ret, frame = cap.read()
-    
-    if not ret:
-        print("No se pudo leer el frame.")
-        break
-    
-    # Convertir el frame a RGB
-    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    
-    # Realizar detección de postura
+
+
+def detectar_pose(pose, frame_rgb):
+    """Ejecuta pose.process y devuelve el array de landmarks o None si no hay persona"""
     results = pose.process(frame_rgb)
-    
-    # Dibujar los puntos clave del cuerpo
-    if results.pose_landmarks:
-        mp_drawing.draw_landmarks(frame, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-        
-        # Obtener coordenadas de puntos clave importantes (por ejemplo, hombros, muñecas)
-        landmarks = results.pose_landmarks.landmark
-        left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER]
-        right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER]
-        left_wrist = landmarks[mp_pose.PoseLandmark.LEFT_WRIST]
-        right_wrist = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST]
-        left_hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP]
-        right_hip = landmarks[mp_pose.PoseLandmark.RIGHT_HIP]
-        left_knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE]
-        right_knee = landmarks[mp_pose.PoseLandmark.RIGHT_KNEE]
-        
-        # Condiciones lógicas para detectar acciones
-        if left_wrist.y < left_shoulder.y and right_wrist.y < right_shoulder.y:
-            action = "Levantando brazos"
-        elif left_hip.y > left_knee.y and right_hip.y > right_knee.y:
-            action = "Sentado"
-        elif abs(left_hip.y - right_hip.y) < 0.05 and abs(left_knee.y - right_knee.y) < 0.05:
-            action = "Caminando"
+    if not results.pose_landmarks:
+        return None
+    return landmarks_a_array(results.pose_landmarks)
+
+
+def dibujar_pose(frame, puntos):
+    """Dibuja los puntos clave y sus conexiones (como mp_drawing, pero desde el array)"""
+    alto, ancho = frame.shape[:2]
+    pixeles = (puntos[:, :2] * (ancho, alto)).astype(np.int32)
+    visibles = puntos[:, VISIBILIDAD] >= UMBRAL_VISIBILIDAD
+
+    for a, b in mp_pose.POSE_CONNECTIONS:
+        if visibles[a] and visibles[b]:
+            cv2.line(frame, tuple(pixeles[a]), tuple(pixeles[b]), (224, 224, 224), 2)
+    for x, y in pixeles[visibles]:
+        cv2.circle(frame, (int(x), int(y)), 3, (0, 0, 255), -1)
+
+
+class Estabilidad:
+    """Cuenta cuántas veces cambia la etiqueta; menos cambios = clasificación más estable"""
+
+    def __init__(self):
+        self.anterior = None
+        self.cambios = 0
+        self.cuadros = 0
+
+    def registrar(self, etiqueta):
+        if self.anterior is not None and etiqueta != self.anterior:
+            self.cambios += 1
+        self.anterior = etiqueta
+        self.cuadros += 1
+
+    def por_cien_cuadros(self):
+        return 100.0 * self.cambios / self.cuadros if self.cuadros else 0.0
+
+
+def imprimir_reporte(cuadros, duracion, tiempo_pose, tiempo_suavizado, crudo, suave, suavizar):
+    """Resume FPS, costo de cada etapa y estabilidad de la clasificación"""
+    if not cuadros or duracion <= 0:
+        return
+    print("\nResumen:")
+    print(f"  Cuadros procesados: {cuadros} en {duracion:.1f} s ({cuadros / duracion:.1f} FPS)")
+    print(f"  pose.process: {1000 * tiempo_pose / cuadros:.2f} ms por cuadro")
+    if suavizar:
+        print(f"  Suavizado:    {1000 * tiempo_suavizado / cuadros:.3f} ms por cuadro "
+              f"(sin él: {cuadros / (duracion - tiempo_suavizado):.1f} FPS)")
+    print(f"  Cambios de etiqueta sin suavizado: {crudo.cambios} "
+          f"({crudo.por_cien_cuadros():.1f} por cada 100 cuadros con pose)")
+    if suavizar:
+        print(f"  Cambios de etiqueta con suavizado: {suave.cambios} "
+              f"({suave.por_cien_cuadros():.1f} por cada 100 cuadros con pose)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconocimiento de acciones simples con MediaPipe Pose")
+    parser.add_argument("--complejidad", type=int, choices=(0, 1, 2), default=0,
+                        help="Complejidad del modelo de pose (0 = ligero)")
+    parser.add_argument("--sin-suavizado", action="store_true", help="Clasificar los landmarks crudos")
+    parser.add_argument("--corte-minimo", type=float, default=1.0, help="Corte mínimo del filtro One-Euro (Hz)")
+    parser.add_argument("--beta", type=float, default=5.0, help="Beta del filtro One-Euro")
+    parser.add_argument("--fps-objetivo", type=float, default=None,
+                        help="Activa la inferencia cada k cuadros, con k ajustado para sostener estos FPS")
+    parser.add_argument("--k-maximo", type=int, default=4, help="Máximo de cuadros entre inferencias")
+    parser.add_argument("--grabar", metavar="RUTA",
+                        help="Graba los landmarks (antes del suavizado) en un .lmk para evaluar_secuencia.py")
+    parser.add_argument("--escala-cuadros", type=float, default=None,
+                        help="Guarda también cada cuadro reducido a esta escala en la grabación")
+    parser.add_argument("--sin-ventana", action="store_true",
+                        help="No muestra la ventana (para medir con video grabado en un servidor)")
+    agregar_argumentos(parser)
+    args = parser.parse_args()
+
+    suavizar = not args.sin_suavizado
+    pose = mp_pose.Pose(model_complexity=args.complejidad)
+    adaptativa = None
+    if args.fps_objetivo:
+        adaptativa = PoseAdaptativa(pose, fps_objetivo=args.fps_objetivo, k_maximo=args.k_maximo)
+    filtro = FiltroOneEuro(corte_minimo=args.corte_minimo, beta=args.beta)
+
+    # Estabilidad de la etiqueta con landmarks crudos y suavizados sobre los mismos cuadros
+    crudo, suave = Estabilidad(), Estabilidad()
+    tiempo_pose = tiempo_suavizado = 0.0
+    cuadros = 0
+
+    # Inicializar captura de video (cámara, video, carpeta de imágenes o escena sintética)
+    cap = abrir_desde_argumentos(args)
+    grabador = None
+    if args.grabar:
+        grabador = GrabadorLandmarks(args.grabar, {"pose": (1, 33, 4)}, escala_imagen=args.escala_cuadros,
+                                     metadatos={"ancho": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                                "alto": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))})
+    inicio = time.perf_counter()
+
+    while cap.isOpened():
+        ret, frame = cap.read()
+
+        if not ret:
+            print("No se pudo leer el frame." if cap.isOpened() else "Fin de la fuente de video.")
+            break
+        inicio_cuadro = time.perf_counter()
+        marca = cap.tiempo_cuadro
+
+        # Convertir el frame a RGB y realizar detección de postura
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if adaptativa is not None:
+            # pose.process solo cada k cuadros; en los demás, landmarks extrapolados
+            puntos, _ = adaptativa.procesar(frame_rgb, marca)
+            tiempo_pose += adaptativa.inferencia_cuadro
         else:
-            action = "Accion no reconocida"
-        
-        # Mostrar el nombre de la acción en la pantalla
-        cv2.putText(frame, f"Acción: {action}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
-    
-    # Mostrar la imagen con la detección de postura
-    cv2.imshow("Reconocimiento de Postura", frame)
-    
-    if cv2.waitKey(1) & 0xFF == 27:  # Salir con la tecla ESC
-        break
-
-cap.release()
-cv2.destroyAllWindows()
+            t0 = time.perf_counter()
+            puntos = detectar_pose(pose, frame_rgb)
+            tiempo_pose += time.perf_counter() - t0
+        cuadros += 1
+        if grabador is not None:
+            grabador.agregar({"pose": puntos}, frame, marca)
+
+        if puntos is not None:
+            action = ACCIONES.clasificar(puntos)
+            crudo.registrar(action)
+
+            if suavizar:
+                t0 = time.perf_counter()
+                puntos[:, :Z + 1] = filtro(puntos[:, :Z + 1], marca)
+                action = ACCIONES.clasificar(puntos)
+                tiempo_suavizado += time.perf_counter() - t0
+                suave.registrar(action)
+
+            dibujar_pose(frame, puntos)
+
+            # Mostrar el nombre de la acción en la pantalla
+            cv2.putText(frame, f"Acción: {action}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
+        else:
+            # Sin persona en cuadro: el filtro empieza de cero en la siguiente detección
+            filtro.reiniciar()
+
+        if adaptativa is not None:
+            cv2.putText(frame, f"k = {adaptativa.k}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 1, cv2.LINE_AA)
+
+        # Mostrar la imagen con la detección de postura
+        if not args.sin_ventana:
+            cv2.imshow("Reconocimiento de Postura", frame)
+        if adaptativa is not None:
+            adaptativa.registrar_costo_cuadro(time.perf_counter() - inicio_cuadro)
+
+        if not args.sin_ventana and cv2.waitKey(1) & 0xFF == 27:  # Salir con la tecla ESC
+            break
+
+    duracion = time.perf_counter() - inicio
+    cap.release()
+    if not args.sin_ventana:
+        cv2.destroyAllWindows()
+    pose.close()
+    if grabador is not None:
+        grabador.cerrar()
+        print(f"Grabación guardada en {args.grabar} ({grabador.cuadros} cuadros)")
+
+    imprimir_reporte(cuadros, duracion, tiempo_pose, tiempo_suavizado, crudo, suave, suavizar)
+    print(f"  Fuente: {cap.resumen()}")
+    if adaptativa is not None:
+        print(f"  {adaptativa.reporte()}")
+
+
+if __name__ == "__main__":
+    main()
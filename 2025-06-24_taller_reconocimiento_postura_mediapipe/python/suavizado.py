@@ -0,0 +1,78 @@
+"""
+Suavizado de landmarks con el filtro One-Euro.
+
+El filtro One-Euro es un pasa-bajas cuya frecuencia de corte crece con la
+velocidad de la señal: cuando el cuerpo está quieto filtra fuerte y elimina el
+temblor de los landmarks, y cuando se mueve rápido filtra poco para no agregar
+retraso. Aquí trabaja sobre el array completo de landmarks (33, k) a la vez,
+con una frecuencia de corte independiente por coordenada.
+
+Referencia: Casiez, Roussel y Vogel, "1€ Filter: A Simple Speed-based Low-pass
+Filter for Noisy Input in Interactive Systems" (CHI 2012).
+"""
+
+import math
+
+import numpy as np
+
+
+def _alfa(dt, corte):
+    """Factor de suavizado exponencial para un periodo dt y una frecuencia de corte"""
+    tau = 1.0 / (2.0 * math.pi * corte)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class FiltroOneEuro:
+    """
+    Filtro One-Euro vectorizado.
+
+    Args:
+        corte_minimo: Frecuencia de corte (Hz) con la señal quieta; menor = más suave
+        beta: Cuánto sube el corte por unidad de velocidad; mayor = menos retraso
+        corte_derivada: Frecuencia de corte (Hz) para estimar la velocidad
+        frecuencia: Frecuencia de muestreo supuesta si no se dan marcas de tiempo
+    """
+
+    def __init__(self, corte_minimo=1.0, beta=5.0, corte_derivada=1.0, frecuencia=30.0):
+        self.corte_minimo = corte_minimo
+        self.beta = beta
+        self.corte_derivada = corte_derivada
+        self.periodo = 1.0 / frecuencia
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Olvida el estado; se usa cuando se pierde la detección"""
+        self.x = None
+        self.dx = None
+        self.t = None
+
+    def __call__(self, valores, t=None):
+        """
+        Filtra una nueva muestra.
+
+        Args:
+            valores: Array de cualquier forma (por ejemplo (33, 3))
+            t: Marca de tiempo en segundos; None supone la frecuencia del constructor
+
+        Returns:
+            Array suavizado con la misma forma (es el estado interno, no modificar)
+        """
+        valores = np.asarray(valores, dtype=np.float32)
+        if self.x is None:
+            self.x = valores.copy()
+            self.dx = np.zeros_like(self.x)
+            self.t = t
+            return self.x
+
+        dt = self.periodo if t is None or self.t is None else max(t - self.t, 1e-6)
+        self.t = t
+
+        # Velocidad suavizada con un corte fijo
+        a_d = _alfa(dt, self.corte_derivada)
+        self.dx += a_d * ((valores - self.x) / dt - self.dx)
+
+        # Corte adaptativo por coordenada según la velocidad
+        corte = self.corte_minimo + self.beta * np.abs(self.dx)
+        a = 1.0 / (1.0 + 1.0 / (2.0 * np.pi * corte * dt))
+        self.x += a * (valores - self.x)
+        return self.x
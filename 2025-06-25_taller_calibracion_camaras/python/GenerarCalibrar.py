@@ -17,7 +17,7 @@ def verificar_patron_ajedrez():
     if not os.path.exists(ruta_patron):
         print("Generando patrón de ajedrez...")
         try:
-            ruta_script_patron = os.path.join(directorio_actual, "generar_patron.py")
+            ruta_script_patron = os.path.join(directorio_actual, "GenerarPatron.py")
             subprocess.run([sys.executable, ruta_script_patron], check=True)
         except subprocess.CalledProcessError:
             print("Error al generar el patrón de ajedrez")
@@ -37,7 +37,7 @@ def generar_todas_imagenes():
     # Generar imágenes para calibración de una cámara
     print("\n=== Generando imágenes para calibración de una cámara ===")
     try:
-        ruta_script_una_camara = os.path.join(directorio_actual, "generar_imagenes_una_camara.py")
+        ruta_script_una_camara = os.path.join(directorio_actual, "GenerarUnaCamara.py")
         subprocess.run([sys.executable, ruta_script_una_camara], check=True)
     except subprocess.CalledProcessError:
         print("Error al generar imágenes para calibración de una cámara")
@@ -45,7 +45,7 @@ def generar_todas_imagenes():
     # Generar imágenes para calibración estéreo
     print("\n=== Generando imágenes para calibración estéreo ===")
     try:
-        ruta_script_estereo = os.path.join(directorio_actual, "generar_imagenes_estereo.py")
+        ruta_script_estereo = os.path.join(directorio_actual, "GenerarEstereo.py")
         subprocess.run([sys.executable, ruta_script_estereo], check=True)
     except subprocess.CalledProcessError:
         print("Error al generar imágenes para calibración estéreo")
@@ -64,16 +64,20 @@ def ejecutar_calibraciones():
     # Ejecutar calibración de una cámara
     print("\n=== Ejecutando calibración de una cámara ===")
     try:
-        ruta_script_una_camara = os.path.join(directorio_actual, "una_camara", "calibracion_una_camara.py")
-        subprocess.run([sys.executable, ruta_script_una_camara], check=True)
+        # Los resultados y la caché de esquinas se guardan relativos al directorio del script;
+        # las imágenes sin cambios no se vuelven a detectar
+        ruta_script_una_camara = os.path.join(directorio_actual, "una_camara", "solucion.py")
+        subprocess.run([sys.executable, ruta_script_una_camara], check=True,
+                       cwd=os.path.dirname(ruta_script_una_camara))
     except subprocess.CalledProcessError:
         print("Error al ejecutar la calibración de una cámara")
     
     # Ejecutar calibración estéreo
     print("\n=== Ejecutando calibración estéreo ===")
     try:
-        ruta_script_estereo = os.path.join(directorio_actual, "dos_camaras", "calibracion_estereo.py") 
-        subprocess.run([sys.executable, ruta_script_estereo], check=True)
+        ruta_script_estereo = os.path.join(directorio_actual, "dos_camaras", "solucion.py")
+        subprocess.run([sys.executable, ruta_script_estereo], check=True,
+                       cwd=os.path.dirname(ruta_script_estereo))
     except subprocess.CalledProcessError:
         print("Error al ejecutar la calibración estéreo")
     
@@ -3,17 +3,73 @@ Generación de pares de imágenes sintéticas de un patrón de ajedrez para cali
 Este script genera pares de imágenes que simulan vistas desde dos cámaras separadas
 """
 
+import argparse
 import numpy as np
 import cv2
 import os
 import os.path
 import sys
-import random
-import math
+
+from generacion_vistas import agregar_argumentos, generar_vistas, resumen_generacion
+
+# Separación estéreo (desplazamiento horizontal) como % de la anchura
+SEPARACION_ESTEREO_BASE = 0.05  # 5% de la anchura
+
+def renderizar_par(patron, i, rng):
+    """
+    Deforma el patrón para simular el par estéreo i.
+    
+    Args:
+        patron: Imagen del patrón de ajedrez
+        i: Número de par
+        rng: Generador aleatorio propio del par
+    
+    Returns:
+        Tupla (imagen_izquierda, imagen_derecha)
+    """
+    altura, anchura = patron.shape[:2]
+    
+    # Definir los puntos de las esquinas del patrón en coordenadas homogéneas
+    esquinas_patron = np.float32([
+        [0, 0],
+        [anchura - 1, 0],
+        [anchura - 1, altura - 1],
+        [0, altura - 1]
+    ])
+    
+    # Variar la separación estéreo ligeramente para cada par
+    separacion_estereo = SEPARACION_ESTEREO_BASE * rng.uniform(0.8, 1.2)
+    desplazamiento_pixels = int(anchura * separacion_estereo)
+    
+    # Simular diferentes posiciones del patrón en el espacio
+    # Inclinación en X e Y
+    inclinacion_x = rng.uniform(-20, 20)
+    inclinacion_y = rng.uniform(-20, 20)
+    
+    # Perspectiva para la vista izquierda
+    esquinas_izquierda = np.float32([
+        [anchura * 0.1 + inclinacion_x, altura * 0.1 + inclinacion_y],
+        [anchura * 0.9 - inclinacion_x, altura * 0.1 + inclinacion_y],
+        [anchura * 0.9 - inclinacion_x, altura * 0.9 - inclinacion_y],
+        [anchura * 0.1 + inclinacion_x, altura * 0.9 - inclinacion_y]
+    ])
+    
+    M_izquierda = cv2.getPerspectiveTransform(esquinas_patron, esquinas_izquierda)
+    imagen_izquierda = cv2.warpPerspective(patron, M_izquierda, (anchura, altura))
+    
+    # Ajustar perspectiva para la vista derecha (simular desplazamiento horizontal)
+    # Para un par estéreo, la vista derecha está desplazada horizontalmente
+    esquinas_derecha = esquinas_izquierda - np.float32([desplazamiento_pixels, 0])
+    
+    M_derecha = cv2.getPerspectiveTransform(esquinas_patron, esquinas_derecha)
+    imagen_derecha = cv2.warpPerspective(patron, M_derecha, (anchura, altura))
+    
+    return imagen_izquierda, imagen_derecha
 
 def generar_imagenes_calibracion_estereo(patron_path, num_pares=15, 
                                         directorio_izquierda="../imagenes/calibracion_estereo/izquierda",
-                                        directorio_derecha="../imagenes/calibracion_estereo/derecha"):
+                                        directorio_derecha="../imagenes/calibracion_estereo/derecha",
+                                        procesos=None, semilla=None, formato="jpg", calidad=None):
     """
     Genera pares de imágenes sintéticas para calibración estéreo.
     
@@ -22,109 +78,45 @@ def generar_imagenes_calibracion_estereo(patron_path, num_pares=15,
         num_pares: Número de pares de imágenes a generar
         directorio_izquierda: Directorio para imágenes de la cámara izquierda
         directorio_derecha: Directorio para imágenes de la cámara derecha
+        procesos: Procesos para generar (None = todos los núcleos, 1 = secuencial)
+        semilla: Semilla de la generación (None = al azar); el resultado no depende de procesos
+        formato: Formato de las imágenes ("jpg", "png" o "webp")
+        calidad: Calidad JPEG/WebP o compresión PNG (None = valor por defecto de OpenCV)
+    
+    Returns:
+        Semilla usada
     """
-    # Crear los directorios de salida si no existen
-    os.makedirs(directorio_izquierda, exist_ok=True)
-    os.makedirs(directorio_derecha, exist_ok=True)
-      # Verificar que la ruta sea absoluta
+    # Verificar que la ruta sea absoluta
     if not os.path.isabs(patron_path):
         # Obtener la ruta absoluta del directorio actual
         directorio_actual = os.path.dirname(os.path.abspath(__file__))
         patron_path = os.path.join(directorio_actual, patron_path)
     
-    # Cargar la imagen del patrón
-    patron = cv2.imread(patron_path)
-    if patron is None:
-        raise ValueError(f"No se pudo cargar la imagen del patrón: {patron_path}")
-    
-    altura, anchura = patron.shape[:2]
-    
-    # Definir los puntos de las esquinas del patrón en coordenadas homogéneas
-    esquinas_patron = np.float32([
-        [0, 0],
-        [anchura - 1, 0],
-        [anchura - 1, altura - 1],
-        [0, altura - 1]
-    ])
-    
-    # Separación estéreo (desplazamiento horizontal) como % de la anchura
-    separacion_estereo_base = 0.05  # 5% de la anchura
-    
-    # Generar los pares de imágenes con diferentes perspectivas
-    for i in range(num_pares):
-        # Variar la separación estéreo ligeramente para cada par
-        separacion_estereo = separacion_estereo_base * random.uniform(0.8, 1.2)
-        desplazamiento_pixels = int(anchura * separacion_estereo)
-        
-        # Parámetros de transformación aleatorios para esta vista
-        angulo_base = random.uniform(-25, 25)  # Grados
-        escala_base = random.uniform(0.7, 1.3)
-        
-        # Simular diferentes posiciones del patrón en el espacio
-        # Inclinación en X e Y
-        inclinacion_x = random.uniform(-20, 20)
-        inclinacion_y = random.uniform(-20, 20)
-        
-        # Desplazamiento Z (profundidad)
-        prof_factor = random.uniform(0.8, 1.2)
-        
-        # Generar transformación para la vista izquierda
-        # Simulamos una transformación 3D proyectada en 2D
-        # Más compleja para simular mejor los efectos de perspectiva
-        esc_x = escala_base * prof_factor
-        esc_y = escala_base * prof_factor
-        
-        # Perspectiva para la vista izquierda
-        esquinas_izquierda = np.float32([
-            [anchura * 0.1 + inclinacion_x, altura * 0.1 + inclinacion_y],
-            [anchura * 0.9 - inclinacion_x, altura * 0.1 + inclinacion_y],
-            [anchura * 0.9 - inclinacion_x, altura * 0.9 - inclinacion_y],
-            [anchura * 0.1 + inclinacion_x, altura * 0.9 - inclinacion_y]
-        ])
-        
-        M_izquierda = cv2.getPerspectiveTransform(esquinas_patron, esquinas_izquierda)
-        imagen_izquierda = cv2.warpPerspective(patron, M_izquierda, (anchura, altura))
-        
-        # Ajustar perspectiva para la vista derecha (simular desplazamiento horizontal)
-        # Para un par estéreo, la vista derecha está desplazada horizontalmente
-        esquinas_derecha = np.float32([
-            [anchura * 0.1 + inclinacion_x - desplazamiento_pixels, altura * 0.1 + inclinacion_y],
-            [anchura * 0.9 - inclinacion_x - desplazamiento_pixels, altura * 0.1 + inclinacion_y],
-            [anchura * 0.9 - inclinacion_x - desplazamiento_pixels, altura * 0.9 - inclinacion_y],
-            [anchura * 0.1 + inclinacion_x - desplazamiento_pixels, altura * 0.9 - inclinacion_y]
-        ])
-        
-        M_derecha = cv2.getPerspectiveTransform(esquinas_patron, esquinas_derecha)
-        imagen_derecha = cv2.warpPerspective(patron, M_derecha, (anchura, altura))
-        
-        # Añadir un poco de ruido gaussiano diferente a cada imagen
-        ruido_izquierda = np.zeros(imagen_izquierda.shape, np.uint8)
-        ruido_derecha = np.zeros(imagen_derecha.shape, np.uint8)
-        cv2.randn(ruido_izquierda, 0, 5)
-        cv2.randn(ruido_derecha, 0, 5)
-        
-        imagen_izquierda = cv2.add(imagen_izquierda, ruido_izquierda)
-        imagen_derecha = cv2.add(imagen_derecha, ruido_derecha)
-        
-        # Guardar las imágenes
-        ruta_izquierda = os.path.join(directorio_izquierda, f"left_{i+1:02d}.jpg")
-        ruta_derecha = os.path.join(directorio_derecha, f"right_{i+1:02d}.jpg")
-        
-        cv2.imwrite(ruta_izquierda, imagen_izquierda)
-        cv2.imwrite(ruta_derecha, imagen_derecha)
-        
-        print(f"Par estéreo guardado: {ruta_izquierda} y {ruta_derecha}")
+    # Renderizar, añadir ruido distinto a cada imagen (desviación estándar 5) y guardar cada par en paralelo
+    salidas = [(directorio_izquierda, "left"), (directorio_derecha, "right")]
+    semilla, tiempos = generar_vistas(renderizar_par, patron_path, salidas, num_pares, sigma_ruido=5,
+                                      procesos=procesos, semilla=semilla, formato=formato, calidad=calidad)
     
     print(f"Se generaron {num_pares} pares de imágenes para calibración estéreo")
     print(f"Imágenes izquierdas en: {directorio_izquierda}")
     print(f"Imágenes derechas en: {directorio_derecha}")
+    print(resumen_generacion(num_pares, semilla, tiempos, procesos))
+    return semilla
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera pares sintéticos del patrón para calibración estéreo")
+    agregar_argumentos(parser, num_por_defecto=15)
+    parser.add_argument("--salida", default=None,
+                        help="Directorio con las carpetas izquierda/ y derecha/ (por defecto, ../imagenes/calibracion_estereo)")
+    parser.add_argument("--patron", default=None,
+                        help="Imagen del patrón (por defecto, ../imagenes/patron_ajedrez.jpg)")
+    args = parser.parse_args()
+    
     # Obtener la ruta absoluta del directorio actual
     directorio_actual = os.path.dirname(os.path.abspath(__file__))
     
     # Ruta al patrón de ajedrez generado anteriormente
-    patron_path = os.path.join(directorio_actual, "..", "imagenes", "patron_ajedrez.jpg")
+    patron_path = args.patron or os.path.join(directorio_actual, "..", "imagenes", "patron_ajedrez.jpg")
     
     # Verificar que existe el patrón
     if not os.path.exists(patron_path):
@@ -133,12 +125,17 @@ if __name__ == "__main__":
         sys.exit(1)
     
     # Generar pares de imágenes para calibración estéreo
-    directorio_izquierda = os.path.join(directorio_actual, "..", "imagenes", "calibracion_estereo", "izquierda")
-    directorio_derecha = os.path.join(directorio_actual, "..", "imagenes", "calibracion_estereo", "derecha")
+    directorio_estereo = args.salida or os.path.join(directorio_actual, "..", "imagenes", "calibracion_estereo")
+    directorio_izquierda = os.path.join(directorio_estereo, "izquierda")
+    directorio_derecha = os.path.join(directorio_estereo, "derecha")
     
     generar_imagenes_calibracion_estereo(
         patron_path, 
-        num_pares=15, 
+        num_pares=args.num, 
         directorio_izquierda=directorio_izquierda, 
-        directorio_derecha=directorio_derecha
-    )
\ No newline at end of file
+        directorio_derecha=directorio_derecha,
+        procesos=args.procesos,
+        semilla=args.semilla,
+        formato=args.formato,
+        calidad=args.calidad
+    )
@@ -1,62 +1,272 @@
 """
-Generación de un patrón de tablero de ajedrez para calibración de cámaras
+Generación de patrones de calibración de cámaras: tablero de ajedrez,
+rejilla de círculos y tablero ChArUco.
+
+Cada patrón se calcula por franjas horizontales con operaciones vectorizadas
+de NumPy, sin recorrer cuadro por cuadro: la paridad de las columnas se
+calcula una vez para todo el ancho, lo que da las pocas filas de píxeles
+distintas del patrón, y cada fila de la franja se copia de la que le
+corresponde según su fila de cuadros.
+Las funciones generar_patron_* calculan la imagen completa en memoria;
+guardar_patron_por_franjas escribe la misma imagen en un PNG franja por
+franja, así que la memoria no depende del tamaño del patrón (útil para
+tableros de impresión de gran formato, por ejemplo de 20000 px de ancho).
 """
 
+import argparse
+import struct
+import time
+import zlib
+
 import numpy as np
 import cv2
 import matplotlib.pyplot as plt
 import os
 import os.path
 
-def generar_patron_ajedrez(filas, columnas, tamano_cuadro=50, guardar=True, nombre_archivo='patron_ajedrez.jpg'):
+def _ruta_imagenes(nombre_archivo):
+    """Ruta del archivo en la carpeta de imágenes del taller"""
+    # Obtener la ruta absoluta del directorio actual
+    directorio_actual = os.path.dirname(os.path.abspath(__file__))
+    directorio_imagenes = os.path.join(directorio_actual, "..", "imagenes")
+    os.makedirs(directorio_imagenes, exist_ok=True)
+    return os.path.join(directorio_imagenes, nombre_archivo)
+
+def _indices(inicio, fin, borde, lado, cantidad):
+    """
+    Índice de cuadro (o de círculo) y posición dentro de él para los píxeles [inicio, fin).
+
+    Returns:
+        indice: Índice del cuadro de cada píxel
+        dentro: True si el píxel cae dentro del tablero (fuera del borde)
+        offset: Posición del píxel dentro de su cuadro, en píxeles
+    """
+    posiciones = np.arange(inicio, fin) - borde
+    indice = posiciones // lado
+    dentro = (posiciones >= 0) & (indice < cantidad)
+    return indice, dentro, posiciones - indice * lado
+
+def _franja_ajedrez(y0, y1, ancho, filas, columnas, tamano_cuadro, borde, paridad_negra=0):
+    """Filas [y0, y1) del tablero de ajedrez con borde blanco"""
+    fila, dentro_y, _ = _indices(y0, y1, borde, tamano_cuadro, filas)
+    columna, dentro_x, _ = _indices(0, ancho, borde, tamano_cuadro, columnas)
+    # Cuadro negro cuando (fila + columna) % 2 == paridad_negra (0, igual que el doble ciclo original).
+    # Solo hay tres filas de píxeles distintas: fila de cuadros par, impar y borde; se calculan
+    # una vez y cada fila de la franja se copia de la que le toca
+    tabla = np.full((3, ancho), 255, dtype=np.uint8)
+    tabla[0, dentro_x & (columna % 2 == paridad_negra)] = 0
+    tabla[1, dentro_x & (columna % 2 != paridad_negra)] = 0
+    return tabla[np.where(dentro_y, fila % 2, 2)]
+
+def _franja_circulos(y0, y1, ancho, filas, columnas, separacion, borde, radio):
+    """Filas [y0, y1) de la rejilla simétrica de círculos negros con borde blanco"""
+    _, dentro_y, offset_y = _indices(y0, y1, borde, separacion, filas)
+    _, dentro_x, offset_x = _indices(0, ancho, borde, separacion, columnas)
+    # Distancia al cuadrado del centro de cada píxel al centro del círculo de su celda
+    dx = offset_x + 0.5 - separacion / 2
+    dx2 = np.where(dentro_x, dx * dx, np.inf)
+    dy = np.arange(separacion) + 0.5 - separacion / 2
+    # Una fila de píxeles por cada posición vertical dentro de la celda, más la fila del borde
+    tabla = np.full((separacion + 1, ancho), 255, dtype=np.uint8)
+    tabla[:separacion][(dy * dy)[:, None] + dx2[None, :] <= radio * radio] = 0
+    return tabla[np.where(dentro_y, offset_y, separacion)]
+
+def _franja_charuco(y0, y1, ancho, filas, columnas, tamano_cuadro, borde, marcadores, diccionario, paridad_negra):
+    """Filas [y0, y1) del tablero ChArUco: ajedrez más los marcadores que cruzan la franja"""
+    franja = _franja_ajedrez(y0, y1, ancho, filas, columnas, tamano_cuadro, borde, paridad_negra)
+    for id_marcador, x, y, lado in marcadores:
+        if y >= y1 or y + lado <= y0:
+            continue
+        # Se genera el marcador solo cuando toca la franja, así no se guardan todos en memoria
+        marcador = cv2.aruco.generateImageMarker(diccionario, id_marcador, lado, borderBits=1)
+        desde = max(y0, y)
+        hasta = min(y1, y + lado)
+        franja[desde - y0:hasta - y0, x:x + lado] = marcador[desde - y:hasta - y]
+    return franja
+
+def _diccionario_aruco(nombre):
+    return cv2.aruco.getPredefinedDictionary(getattr(cv2.aruco, nombre))
+
+def _marcadores_charuco(filas, columnas, tamano_cuadro, borde, proporcion_marcador, nombre_diccionario):
+    """
+    Posición en píxeles de los marcadores, tomada del CharucoBoard de OpenCV.
+
+    Returns:
+        (marcadores, diccionario, paridad_negra): lista de (id, x, y, lado) y
+        paridad de (fila + columna) de los cuadros negros
+    """
+    diccionario = _diccionario_aruco(nombre_diccionario)
+    if (filas * columnas) // 2 > diccionario.bytesList.shape[0]:
+        raise ValueError(f"{nombre_diccionario} no tiene marcadores suficientes para un tablero de "
+                         f"{filas}x{columnas}")
+    tablero = cv2.aruco.CharucoBoard((columnas, filas), 1.0, proporcion_marcador, diccionario)
+    lado = int(round(proporcion_marcador * tamano_cuadro))
+    marcadores = []
+    paridad_negra = 0
+    for id_marcador, esquinas in zip(tablero.getIds().ravel(), tablero.getObjPoints()):
+        # La esquina superior izquierda del marcador está en unidades de cuadro
+        x, y = esquinas[0][:2]
+        # Los marcadores van en los cuadros blancos
+        paridad_negra = 1 - (int(x) + int(y)) % 2
+        marcadores.append((int(id_marcador), borde + int(round(x * tamano_cuadro)),
+                           borde + int(round(y * tamano_cuadro)), lado))
+    return marcadores, diccionario, paridad_negra
+
+def _describir_patron(tipo, filas, columnas, tamano_cuadro, borde, radio=None, proporcion_marcador=0.7,
+                      diccionario="DICT_5X5_1000"):
+    """
+    Tamaño del patrón y función que calcula una franja de filas.
+
+    Returns:
+        (alto, ancho, franja): franja(y0, y1) devuelve las filas [y0, y1) en uint8
+    """
+    alto = filas * tamano_cuadro + 2 * borde
+    ancho = columnas * tamano_cuadro + 2 * borde
+    if tipo == "ajedrez":
+        return alto, ancho, lambda y0, y1: _franja_ajedrez(y0, y1, ancho, filas, columnas, tamano_cuadro, borde)
+    if tipo == "circulos":
+        radio = radio if radio is not None else 0.3 * tamano_cuadro
+        return alto, ancho, lambda y0, y1: _franja_circulos(y0, y1, ancho, filas, columnas, tamano_cuadro,
+                                                            borde, radio)
+    if tipo == "charuco":
+        marcadores, dicc, paridad_negra = _marcadores_charuco(filas, columnas, tamano_cuadro, borde,
+                                                              proporcion_marcador, diccionario)
+        return alto, ancho, lambda y0, y1: _franja_charuco(y0, y1, ancho, filas, columnas, tamano_cuadro,
+                                                           borde, marcadores, dicc, paridad_negra)
+    raise ValueError(f"Tipo de patrón desconocido: {tipo}")
+
+def generar_patron_ajedrez(filas, columnas, tamano_cuadro=50, guardar=True, nombre_archivo='patron_ajedrez.jpg',
+                           borde=50):
     """
     Genera un patrón de tablero de ajedrez para calibración de cámaras.
-    
+
     Args:
         filas: Número de filas en el tablero
         columnas: Número de columnas en el tablero
         tamano_cuadro: Tamaño de cada cuadro en píxeles
         guardar: Si es True, guarda el patrón como imagen
         nombre_archivo: Nombre del archivo de salida
-    
+        borde: Borde blanco para impresión, en píxeles
+
     Returns:
         patron: Imagen del patrón de tablero de ajedrez
     """
-    # Calcular dimensiones de la imagen
-    ancho = columnas * tamano_cuadro
-    alto = filas * tamano_cuadro
-    
-    # Crear imagen base blanca
-    patron = np.ones((alto, ancho), dtype=np.uint8) * 255
-    
-    # Dibujar cuadros negros en posiciones pares/impares
-    for i in range(filas):
-        for j in range(columnas):
-            if (i + j) % 2 == 0:
-                y_inicio = i * tamano_cuadro
-                x_inicio = j * tamano_cuadro
-                patron[y_inicio:y_inicio+tamano_cuadro, x_inicio:x_inicio+tamano_cuadro] = 0
-    
-    # Añadir borde blanco para impresión
-    borde = 50
-    patron_con_borde = np.ones((alto + 2*borde, ancho + 2*borde), dtype=np.uint8) * 255
-    patron_con_borde[borde:alto+borde, borde:ancho+borde] = patron
-      # Guardar patrón
+    alto, _, franja = _describir_patron("ajedrez", filas, columnas, tamano_cuadro, borde)
+    patron_con_borde = franja(0, alto)
+
+    # Guardar patrón
     if guardar:
-        # Obtener la ruta absoluta del directorio actual
-        directorio_actual = os.path.dirname(os.path.abspath(__file__))
-        directorio_imagenes = os.path.join(directorio_actual, "..", "imagenes")
-        os.makedirs(directorio_imagenes, exist_ok=True)
-        ruta_completa = os.path.join(directorio_imagenes, nombre_archivo)
+        ruta_completa = _ruta_imagenes(nombre_archivo)
         cv2.imwrite(ruta_completa, patron_con_borde)
         print(f"Patrón guardado como {ruta_completa}")
-    
+
     return patron_con_borde
 
+def generar_patron_circulos(filas, columnas, separacion=50, radio=None, guardar=True,
+                            nombre_archivo='patron_circulos.png', borde=50):
+    """
+    Genera una rejilla simétrica de círculos negros (para findCirclesGrid).
+
+    Args:
+        filas: Número de filas de círculos
+        columnas: Número de columnas de círculos
+        separacion: Distancia entre centros en píxeles
+        radio: Radio de cada círculo en píxeles (por defecto, 0.3 * separacion)
+        guardar: Si es True, guarda el patrón como imagen
+        nombre_archivo: Nombre del archivo de salida
+        borde: Borde blanco para impresión, en píxeles
+
+    Returns:
+        patron: Imagen de la rejilla de círculos
+    """
+    alto, _, franja = _describir_patron("circulos", filas, columnas, separacion, borde, radio=radio)
+    patron = franja(0, alto)
+    if guardar:
+        ruta_completa = _ruta_imagenes(nombre_archivo)
+        cv2.imwrite(ruta_completa, patron)
+        print(f"Patrón guardado como {ruta_completa}")
+    return patron
+
+def generar_patron_charuco(filas, columnas, tamano_cuadro=50, proporcion_marcador=0.7, diccionario="DICT_5X5_1000",
+                           guardar=True, nombre_archivo='patron_charuco.png', borde=50):
+    """
+    Genera un tablero ChArUco con la misma disposición que cv2.aruco.CharucoBoard.
+
+    Args:
+        filas: Número de filas de cuadros
+        columnas: Número de columnas de cuadros
+        tamano_cuadro: Tamaño de cada cuadro en píxeles
+        proporcion_marcador: Lado del marcador como fracción del cuadro
+        diccionario: Nombre del diccionario ArUco (ej. "DICT_5X5_1000")
+        guardar: Si es True, guarda el patrón como imagen
+        nombre_archivo: Nombre del archivo de salida
+        borde: Borde blanco para impresión, en píxeles
+
+    Returns:
+        patron: Imagen del tablero ChArUco
+    """
+    alto, _, franja = _describir_patron("charuco", filas, columnas, tamano_cuadro, borde,
+                                        proporcion_marcador=proporcion_marcador, diccionario=diccionario)
+    patron = franja(0, alto)
+    if guardar:
+        ruta_completa = _ruta_imagenes(nombre_archivo)
+        cv2.imwrite(ruta_completa, patron)
+        print(f"Patrón guardado como {ruta_completa}")
+    return patron
+
+def _escribir_bloque_png(archivo, tipo, datos):
+    archivo.write(struct.pack(">I", len(datos)))
+    archivo.write(tipo)
+    archivo.write(datos)
+    archivo.write(struct.pack(">I", zlib.crc32(tipo + datos) & 0xFFFFFFFF))
+
+def guardar_patron_por_franjas(ruta, tipo, filas, columnas, tamano_cuadro, borde=50, alto_franja=1024, dpi=None,
+                               compresion=6, **opciones):
+    """
+    Escribe un patrón en un PNG en escala de grises, franja por franja.
+
+    Solo hay una franja de alto_franja filas en memoria a la vez: las filas se
+    comprimen con zlib a medida que se calculan y se escriben como bloques IDAT.
+
+    Args:
+        ruta: Archivo .png de salida
+        tipo: "ajedrez", "circulos" o "charuco"
+        filas, columnas, tamano_cuadro, borde: Como en generar_patron_* (en círculos,
+                                               tamano_cuadro es la separación)
+        alto_franja: Filas calculadas por franja
+        dpi: Si se da, se guarda en el PNG para imprimir al tamaño correcto
+        compresion: Nivel de zlib (0-9)
+        **opciones: radio, proporcion_marcador o diccionario según el tipo
+
+    Returns:
+        (alto, ancho) del patrón
+    """
+    alto, ancho, franja = _describir_patron(tipo, filas, columnas, tamano_cuadro, borde, **opciones)
+    compresor = zlib.compressobj(compresion)
+    # Cada fila del PNG empieza con el byte de filtro (0 = sin filtro)
+    filas_png = np.zeros((alto_franja, ancho + 1), dtype=np.uint8)
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(b"\x89PNG\r\n\x1a\n")
+        # 8 bits, escala de grises, sin entrelazado
+        _escribir_bloque_png(archivo, b"IHDR", struct.pack(">IIBBBBB", ancho, alto, 8, 0, 0, 0, 0))
+        if dpi:
+            pixeles_por_metro = int(round(dpi / 0.0254))
+            _escribir_bloque_png(archivo, b"pHYs", struct.pack(">IIB", pixeles_por_metro, pixeles_por_metro, 1))
+        for y0 in range(0, alto, alto_franja):
+            y1 = min(y0 + alto_franja, alto)
+            filas_png[:y1 - y0, 1:] = franja(y0, y1)
+            datos = compresor.compress(filas_png[:y1 - y0].tobytes())
+            if datos:
+                _escribir_bloque_png(archivo, b"IDAT", datos)
+        _escribir_bloque_png(archivo, b"IDAT", compresor.flush())
+        _escribir_bloque_png(archivo, b"IEND", b"")
+    return alto, ancho
+
 def visualizar_patron(patron):
     """
     Visualiza el patrón generado.
-    
+
     Args:
         patron: Imagen del patrón de tablero de ajedrez
     """
@@ -68,14 +278,48 @@ def visualizar_patron(patron):
     plt.show()
 
 if __name__ == "__main__":
-    # Generar patrón con 7x10 cuadros (para obtener 6x9 esquinas internas)
-    filas = 7
-    columnas = 10
-    tamano_cuadro = 80  # En píxeles
-    
-    # Generar y mostrar patrón
-    patron = generar_patron_ajedrez(filas, columnas, tamano_cuadro, guardar=True)
-    visualizar_patron(patron)
-    
-    print(f"Patrón generado con {filas} filas y {columnas} columnas")
-    print(f"Este patrón tiene {filas-1}x{columnas-1} esquinas internas para calibración")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Genera patrones de calibración (ajedrez, círculos o ChArUco)")
+    parser.add_argument("--tipo", choices=["ajedrez", "circulos", "charuco"], default="ajedrez",
+                        help="Tipo de patrón")
+    parser.add_argument("--filas", type=int, default=7,
+                        help="Filas de cuadros (o de círculos)")
+    parser.add_argument("--columnas", type=int, default=10,
+                        help="Columnas de cuadros (o de círculos)")
+    parser.add_argument("--tamano-cuadro", type=int, default=80,
+                        help="Tamaño de cuadro (o separación entre círculos) en píxeles")
+    parser.add_argument("--borde", type=int, default=50,
+                        help="Borde blanco en píxeles")
+    parser.add_argument("--salida", default=None,
+                        help="Escribe el patrón en este PNG por franjas, con memoria acotada (para gran formato)")
+    parser.add_argument("--alto-franja", type=int, default=1024,
+                        help="Filas por franja al escribir con --salida")
+    parser.add_argument("--dpi", type=float, default=None,
+                        help="Resolución de impresión guardada en el PNG de --salida")
+    parser.add_argument("--sin-ventana", action="store_true",
+                        help="No mostrar el patrón generado")
+    args = parser.parse_args()
+
+    if args.salida:
+        inicio = time.perf_counter()
+        alto, ancho = guardar_patron_por_franjas(args.salida, args.tipo, args.filas, args.columnas,
+                                                 args.tamano_cuadro, borde=args.borde,
+                                                 alto_franja=args.alto_franja, dpi=args.dpi)
+        print(f"Patrón {args.tipo} de {ancho}x{alto} px guardado como {args.salida} "
+              f"en {time.perf_counter() - inicio:.2f} s")
+    else:
+        # Por defecto, patrón con 7x10 cuadros (para obtener 6x9 esquinas internas)
+        if args.tipo == "ajedrez":
+            patron = generar_patron_ajedrez(args.filas, args.columnas, args.tamano_cuadro, guardar=True,
+                                            borde=args.borde)
+        elif args.tipo == "circulos":
+            patron = generar_patron_circulos(args.filas, args.columnas, args.tamano_cuadro, guardar=True,
+                                             borde=args.borde)
+        else:
+            patron = generar_patron_charuco(args.filas, args.columnas, args.tamano_cuadro, guardar=True,
+                                            borde=args.borde)
+        if not args.sin_ventana:
+            visualizar_patron(patron)
+
+    print(f"Patrón generado con {args.filas} filas y {args.columnas} columnas")
+    if args.tipo == "ajedrez":
+        print(f"Este patrón tiene {args.filas-1}x{args.columnas-1} esquinas internas para calibración")
@@ -3,36 +3,27 @@ Generación de imágenes sintéticas de un patrón de ajedrez para calibración
 Este script genera imágenes del patrón desde diferentes ángulos y distancias
 """
 
+import argparse
 import numpy as np
 import cv2
 import os
 import os.path
 import sys
-import random
-import math
 
-def generar_imagenes_calibracion_una_camara(patron_path, num_imagenes=15, directorio_salida="../imagenes/calibracion_una_camara"):
+from generacion_vistas import agregar_argumentos, generar_vistas, resumen_generacion
+
+def renderizar_vista(patron, i, rng):
     """
-    Genera imágenes sintéticas de un patrón de ajedrez desde diferentes ángulos.
+    Deforma el patrón para simular la vista i desde un ángulo distinto.
     
     Args:
-        patron_path: Ruta a la imagen del patrón de ajedrez
-        num_imagenes: Número de imágenes a generar
-        directorio_salida: Directorio donde se guardarán las imágenes
-    """
-    # Crear el directorio de salida si no existe
-    os.makedirs(directorio_salida, exist_ok=True)
-      # Verificar que la ruta sea absoluta
-    if not os.path.isabs(patron_path):
-        # Obtener la ruta absoluta del directorio actual
-        directorio_actual = os.path.dirname(os.path.abspath(__file__))
-        patron_path = os.path.join(directorio_actual, patron_path)
-    
-    # Cargar la imagen del patrón
-    patron = cv2.imread(patron_path)
-    if patron is None:
-        raise ValueError(f"No se pudo cargar la imagen del patrón: {patron_path}")
+        patron: Imagen del patrón de ajedrez
+        i: Número de vista (elige el tipo de transformación)
+        rng: Generador aleatorio propio de la vista
     
+    Returns:
+        Tupla con la imagen transformada
+    """
     altura, anchura = patron.shape[:2]
     
     # Definir los puntos de las esquinas del patrón en coordenadas homogéneas
@@ -43,85 +34,103 @@ def generar_imagenes_calibracion_una_camara(patron_path, num_imagenes=15, direct
         [0, altura - 1]
     ])
     
-    # Generar las imágenes con diferentes transformaciones de perspectiva
-    for i in range(num_imagenes):
-        # Generar transformación aleatoria para simular diferentes vistas
-        # Añadir perturbaciones aleatorias a las esquinas
-        perturbacion_max = 0.2  # Factor de perturbación máxima como porcentaje del tamaño
-        
-        # Calcular la perturbación para cada esquina
-        delta_x = anchura * perturbacion_max
-        delta_y = altura * perturbacion_max
-        
-        # Diferentes tipos de transformaciones para tener variedad
-        if i % 5 == 0:  # Rotación cerca del centro 
-            angulo = random.uniform(-30, 30)  # Grados
-            escala = random.uniform(0.8, 1.2)
-            centro = (anchura // 2, altura // 2)
-            M = cv2.getRotationMatrix2D(centro, angulo, escala)
-            imagen_transformada = cv2.warpAffine(patron, M, (anchura, altura))
-            
-        elif i % 5 == 1:  # Perspectiva moderada
-            esquinas_destino = np.float32([
-                [random.uniform(0, delta_x), random.uniform(0, delta_y)],
-                [anchura - 1 - random.uniform(0, delta_x), random.uniform(0, delta_y)],
-                [anchura - 1 - random.uniform(0, delta_x), altura - 1 - random.uniform(0, delta_y)],
-                [random.uniform(0, delta_x), altura - 1 - random.uniform(0, delta_y)]
-            ])
-            M = cv2.getPerspectiveTransform(esquinas_patron, esquinas_destino)
-            imagen_transformada = cv2.warpPerspective(patron, M, (anchura, altura))
-            
-        elif i % 5 == 2:  # Vista desde arriba con ligera inclinación
-            # Perspectiva simulando vista desde arriba
-            esquinas_destino = np.float32([
-                [anchura * 0.1, altura * 0.1],
-                [anchura * 0.9, altura * 0.1],
-                [anchura * 0.95, altura * 0.95],
-                [anchura * 0.05, altura * 0.95]
-            ])
-            M = cv2.getPerspectiveTransform(esquinas_patron, esquinas_destino)
-            imagen_transformada = cv2.warpPerspective(patron, M, (anchura, altura))
-            
-        elif i % 5 == 3:  # Vista lateral
-            # Perspectiva simulando vista desde un lado
-            esquinas_destino = np.float32([
-                [anchura * 0.2, altura * 0.3],
-                [anchura * 0.8, altura * 0.2],
-                [anchura * 0.85, altura * 0.9],
-                [anchura * 0.15, altura * 0.95]
-            ])
-            M = cv2.getPerspectiveTransform(esquinas_patron, esquinas_destino)
-            imagen_transformada = cv2.warpPerspective(patron, M, (anchura, altura))
-            
-        else:  # Vista desde abajo
-            # Perspectiva simulando vista desde abajo
-            esquinas_destino = np.float32([
-                [anchura * 0.05, altura * 0.25],
-                [anchura * 0.95, altura * 0.25],
-                [anchura * 0.8, altura * 0.05],
-                [anchura * 0.2, altura * 0.05]
-            ])
-            M = cv2.getPerspectiveTransform(esquinas_patron, esquinas_destino)
-            imagen_transformada = cv2.warpPerspective(patron, M, (anchura, altura))
-        
-        # Añadir un poco de ruido gaussiano para simular imágenes reales
-        ruido = np.zeros(imagen_transformada.shape, np.uint8)
-        cv2.randn(ruido, 0, 10)  # Media 0, desviación estándar 10
-        imagen_transformada = cv2.add(imagen_transformada, ruido)
+    # Generar transformación aleatoria para simular diferentes vistas
+    # Añadir perturbaciones aleatorias a las esquinas
+    perturbacion_max = 0.2  # Factor de perturbación máxima como porcentaje del tamaño
+    
+    # Calcular la perturbación para cada esquina
+    delta_x = anchura * perturbacion_max
+    delta_y = altura * perturbacion_max
+    
+    # Diferentes tipos de transformaciones para tener variedad
+    if i % 5 == 0:  # Rotación cerca del centro 
+        angulo = rng.uniform(-30, 30)  # Grados
+        escala = rng.uniform(0.8, 1.2)
+        centro = (anchura // 2, altura // 2)
+        M = cv2.getRotationMatrix2D(centro, angulo, escala)
+        return (cv2.warpAffine(patron, M, (anchura, altura)),)
         
-        # Guardar la imagen transformada
-        ruta_salida = os.path.join(directorio_salida, f"calibracion_{i+1:02d}.jpg")
-        cv2.imwrite(ruta_salida, imagen_transformada)
-        print(f"Imagen guardada: {ruta_salida}")
+    if i % 5 == 1:  # Perspectiva moderada
+        esquinas_destino = np.float32([
+            [rng.uniform(0, delta_x), rng.uniform(0, delta_y)],
+            [anchura - 1 - rng.uniform(0, delta_x), rng.uniform(0, delta_y)],
+            [anchura - 1 - rng.uniform(0, delta_x), altura - 1 - rng.uniform(0, delta_y)],
+            [rng.uniform(0, delta_x), altura - 1 - rng.uniform(0, delta_y)]
+        ])
+    elif i % 5 == 2:  # Vista desde arriba con ligera inclinación
+        # Perspectiva simulando vista desde arriba
+        esquinas_destino = np.float32([
+            [anchura * 0.1, altura * 0.1],
+            [anchura * 0.9, altura * 0.1],
+            [anchura * 0.95, altura * 0.95],
+            [anchura * 0.05, altura * 0.95]
+        ])
+    elif i % 5 == 3:  # Vista lateral
+        # Perspectiva simulando vista desde un lado
+        esquinas_destino = np.float32([
+            [anchura * 0.2, altura * 0.3],
+            [anchura * 0.8, altura * 0.2],
+            [anchura * 0.85, altura * 0.9],
+            [anchura * 0.15, altura * 0.95]
+        ])
+    else:  # Vista desde abajo
+        # Perspectiva simulando vista desde abajo
+        esquinas_destino = np.float32([
+            [anchura * 0.05, altura * 0.25],
+            [anchura * 0.95, altura * 0.25],
+            [anchura * 0.8, altura * 0.05],
+            [anchura * 0.2, altura * 0.05]
+        ])
+    
+    M = cv2.getPerspectiveTransform(esquinas_patron, esquinas_destino)
+    return (cv2.warpPerspective(patron, M, (anchura, altura)),)
+
+def generar_imagenes_calibracion_una_camara(patron_path, num_imagenes=15, directorio_salida="../imagenes/calibracion_una_camara",
+                                            procesos=None, semilla=None, formato="jpg", calidad=None):
+    """
+    Genera imágenes sintéticas de un patrón de ajedrez desde diferentes ángulos.
+    
+    Args:
+        patron_path: Ruta a la imagen del patrón de ajedrez
+        num_imagenes: Número de imágenes a generar
+        directorio_salida: Directorio donde se guardarán las imágenes
+        procesos: Procesos para generar (None = todos los núcleos, 1 = secuencial)
+        semilla: Semilla de la generación (None = al azar); el resultado no depende de procesos
+        formato: Formato de las imágenes ("jpg", "png" o "webp")
+        calidad: Calidad JPEG/WebP o compresión PNG (None = valor por defecto de OpenCV)
+    
+    Returns:
+        Semilla usada
+    """
+    # Verificar que la ruta sea absoluta
+    if not os.path.isabs(patron_path):
+        # Obtener la ruta absoluta del directorio actual
+        directorio_actual = os.path.dirname(os.path.abspath(__file__))
+        patron_path = os.path.join(directorio_actual, patron_path)
+    
+    # Renderizar, añadir ruido (desviación estándar 10) y guardar cada vista en paralelo
+    semilla, tiempos = generar_vistas(renderizar_vista, patron_path, [(directorio_salida, "calibracion")],
+                                      num_imagenes, sigma_ruido=10, procesos=procesos, semilla=semilla,
+                                      formato=formato, calidad=calidad)
     
     print(f"Se generaron {num_imagenes} imágenes para calibración de una cámara en {directorio_salida}")
+    print(resumen_generacion(num_imagenes, semilla, tiempos, procesos))
+    return semilla
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera imágenes sintéticas del patrón para calibrar una cámara")
+    agregar_argumentos(parser, num_por_defecto=15)
+    parser.add_argument("--salida", default=None,
+                        help="Directorio de salida (por defecto, ../imagenes/calibracion_una_camara)")
+    parser.add_argument("--patron", default=None,
+                        help="Imagen del patrón (por defecto, ../imagenes/patron_ajedrez.jpg)")
+    args = parser.parse_args()
+    
     # Obtener la ruta absoluta del directorio actual
     directorio_actual = os.path.dirname(os.path.abspath(__file__))
     
     # Ruta al patrón de ajedrez generado anteriormente
-    patron_path = os.path.join(directorio_actual, "..", "imagenes", "patron_ajedrez.jpg")
+    patron_path = args.patron or os.path.join(directorio_actual, "..", "imagenes", "patron_ajedrez.jpg")
     
     # Verificar que existe el patrón
     if not os.path.exists(patron_path):
@@ -130,5 +139,7 @@ if __name__ == "__main__":
         sys.exit(1)
     
     # Generar imágenes para calibración de una cámara
-    directorio_salida = os.path.join(directorio_actual, "..", "imagenes", "calibracion_una_camara")
-    generar_imagenes_calibracion_una_camara(patron_path, num_imagenes=15, directorio_salida=directorio_salida)
\ No newline at end of file
+    directorio_salida = args.salida or os.path.join(directorio_actual, "..", "imagenes", "calibracion_una_camara")
+    generar_imagenes_calibracion_una_camara(patron_path, num_imagenes=args.num, directorio_salida=directorio_salida,
+                                            procesos=args.procesos, semilla=args.semilla,
+                                            formato=args.formato, calidad=args.calidad)
@@ -2,14 +2,25 @@
 Calibración de un par de cámaras estéreo utilizando un patrón de tablero de ajedrez
 """
 
+import argparse
 import numpy as np
 import cv2
 import glob
 import os
+import sys
+import time
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from esquinas import CacheEsquinas, detectar_en_paralelo, dibujar_esquinas, resumen_deteccion
+
+# Banderas de calibrateCamera que se pueden elegir por línea de comandos (sin el prefijo CALIB_)
+BANDERAS_MODELO = ["FIX_ASPECT_RATIO", "FIX_PRINCIPAL_POINT", "ZERO_TANGENT_DIST",
+                   "FIX_K1", "FIX_K2", "FIX_K3", "RATIONAL_MODEL"]
+
 def calibrar_camaras_estereo(directorio_izquierda, directorio_derecha, patron_filas, patron_columnas, 
-                            tamano_cuadro=1.0, mostrar_proceso=True, guardar_resultados=True):
+                            tamano_cuadro=1.0, mostrar_proceso=True, guardar_resultados=True,
+                            procesos=None, lado_busqueda=None, banderas=0, usar_cache=True):
     """
     Realiza la calibración estéreo de dos cámaras utilizando imágenes del mismo patrón visto desde ambas cámaras.
     
@@ -21,6 +32,12 @@ def calibrar_camaras_estereo(directorio_izquierda, directorio_derecha, patron_fi
         tamano_cuadro: Tamaño de cada cuadro del patrón (en unidades arbitrarias, por defecto 1.0)
         mostrar_proceso: Si es True, muestra imágenes del proceso
         guardar_resultados: Si es True, guarda imágenes y parámetros de calibración
+        procesos: Procesos para detectar las esquinas (None = todos los núcleos, 1 = secuencial)
+        lado_busqueda: Si se da, busca el patrón en la imagen reducida hasta este lado mayor
+                       y refina las esquinas a resolución completa
+        banderas: Banderas CALIB_* para la calibración individual de cada cámara
+        usar_cache: Si es True (y se guardan resultados), reutiliza las esquinas de las
+                    imágenes sin cambios desde la ejecución anterior (esquinas_cache.npz)
     
     Returns:
         retStereo: Error de calibración estéreo
@@ -62,60 +79,60 @@ def calibrar_camaras_estereo(directorio_izquierda, directorio_derecha, patron_fi
     
     # Criterios para refinamiento de esquinas
     criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
-      # Procesar cada par de imágenes
+    
+    # Detectar y refinar las esquinas de ambas cámaras en paralelo (una imagen por tarea)
+    patron = (patron_columnas, patron_filas)
+    cache = None
+    if usar_cache and guardar_resultados:
+        cache = CacheEsquinas(os.path.join(directorio_resultados, 'esquinas_cache.npz'))
+    inicio = time.perf_counter()
+    detecciones_izquierda = detectar_en_paralelo(imagenes_izquierda, patron, procesos, lado_busqueda, cache)
+    print("Cámara izquierda:\n" + resumen_deteccion(detecciones_izquierda, time.perf_counter() - inicio))
+    inicio = time.perf_counter()
+    detecciones_derecha = detectar_en_paralelo(imagenes_derecha, patron, procesos, lado_busqueda, cache)
+    print("Cámara derecha:\n" + resumen_deteccion(detecciones_derecha, time.perf_counter() - inicio))
+    if cache is not None:
+        cache.guardar()
+    
     valid_images_found = False
     image_shape = None
+    pares_validos = []
     
-    for i, (img_left_path, img_right_path) in enumerate(zip(imagenes_izquierda, imagenes_derecha)):
-        img_left = cv2.imread(img_left_path)
-        img_right = cv2.imread(img_right_path)
-        
-        if img_left is None or img_right is None:
-            print(f"No se pudieron leer las imágenes: {img_left_path} o {img_right_path}")
+    for i, (deteccion_left, deteccion_right) in enumerate(zip(detecciones_izquierda, detecciones_derecha)):
+        if deteccion_left.forma is None or deteccion_right.forma is None:
+            print(f"No se pudieron leer las imágenes: {deteccion_left.ruta} o {deteccion_right.ruta}")
             continue
         
-        gray_left = cv2.cvtColor(img_left, cv2.COLOR_BGR2GRAY)
-        gray_right = cv2.cvtColor(img_right, cv2.COLOR_BGR2GRAY)
-        
         # Guardar las dimensiones de la imagen para calibración
         if image_shape is None:
-            image_shape = gray_left.shape[::-1]
+            image_shape = deteccion_left.forma
         
-        # Buscar esquinas del patrón en ambas imágenes
-        ret_left, corners_left = cv2.findChessboardCorners(gray_left, (patron_columnas, patron_filas), None)
-        ret_right, corners_right = cv2.findChessboardCorners(gray_right, (patron_columnas, patron_filas), None)
-          # Si se encuentran las esquinas en ambas imágenes, se añaden a los arrays
-        if ret_left and ret_right:
+        # Si se encuentran las esquinas en ambas imágenes, se añaden a los arrays
+        if deteccion_left.encontrada and deteccion_right.encontrada:
             valid_images_found = True
             objpoints.append(objp)
+            imgpoints_left.append(deteccion_left.esquinas)
+            imgpoints_right.append(deteccion_right.esquinas)
+            pares_validos.append((i, deteccion_left, deteccion_right))
+    
+    # Dibujar, mostrar y guardar las esquinas después de detectar, fuera del camino crítico
+    if mostrar_proceso or guardar_resultados:
+        for i, deteccion_left, deteccion_right in pares_validos:
+            if not mostrar_proceso and i >= 3:
+                break
+            img_left_corners = dibujar_esquinas(deteccion_left, patron)
+            img_right_corners = dibujar_esquinas(deteccion_right, patron)
+            combined_img = np.hstack((img_left_corners, img_right_corners))
             
-            # Refinar las esquinas encontradas
-            corners_left2 = cv2.cornerSubPix(gray_left, corners_left, (11, 11), (-1, -1), criteria)
-            corners_right2 = cv2.cornerSubPix(gray_right, corners_right, (11, 11), (-1, -1), criteria)
-            
-            imgpoints_left.append(corners_left2)
-            imgpoints_right.append(corners_right2)
+            if mostrar_proceso:
+                # Mostrar imágenes lado a lado
+                cv2.imshow('Esquinas detectadas (Izquierda - Derecha)', combined_img)
+                cv2.waitKey(500)
             
-            # Dibujar y mostrar las esquinas
-            if mostrar_proceso or guardar_resultados:
-                img_left_corners = img_left.copy()
-                img_right_corners = img_right.copy()
-                
-                cv2.drawChessboardCorners(img_left_corners, (patron_columnas, patron_filas), corners_left2, ret_left)
-                cv2.drawChessboardCorners(img_right_corners, (patron_columnas, patron_filas), corners_right2, ret_right)
-                
-                if mostrar_proceso:
-                    # Mostrar imágenes lado a lado
-                    combined_img = np.hstack((img_left_corners, img_right_corners))
-                    cv2.imshow('Esquinas detectadas (Izquierda - Derecha)', combined_img)
-                    cv2.waitKey(500)
-                
-                if guardar_resultados and i < 3:  # Guardar solo las primeras 3 variaciones
-                    cv2.imwrite(os.path.join(directorio_resultados, f'patron_variacion_{i}_izquierda.jpg'), img_left_corners)
-                    cv2.imwrite(os.path.join(directorio_resultados, f'patron_variacion_{i}_derecha.jpg'), img_right_corners)
-                      # Crear y guardar imagen combinada
-                    combined_img = np.hstack((img_left_corners, img_right_corners))
-                    cv2.imwrite(os.path.join(directorio_resultados, f'patron_variacion_{i}_combinado.jpg'), combined_img)
+            if guardar_resultados and i < 3:  # Guardar solo las primeras 3 variaciones
+                cv2.imwrite(os.path.join(directorio_resultados, f'patron_variacion_{i}_izquierda.jpg'), img_left_corners)
+                cv2.imwrite(os.path.join(directorio_resultados, f'patron_variacion_{i}_derecha.jpg'), img_right_corners)
+                cv2.imwrite(os.path.join(directorio_resultados, f'patron_variacion_{i}_combinado.jpg'), combined_img)
     
     if mostrar_proceso:
         cv2.destroyAllWindows()    # Verificar si se encontraron suficientes puntos para calibración
@@ -129,11 +146,11 @@ def calibrar_camaras_estereo(directorio_izquierda, directorio_derecha, patron_fi
         return None, None, None, None, None, None, None, None, None    # Calibrar cada cámara individualmente
     if len(objpoints) > 0 and valid_images_found and image_shape is not None:
         ret_left, mtx_left, dist_left, rvecs_left, tvecs_left = cv2.calibrateCamera(
-            objpoints, imgpoints_left, image_shape, None, None
+            objpoints, imgpoints_left, image_shape, None, None, flags=banderas
         )
         
         ret_right, mtx_right, dist_right, rvecs_right, tvecs_right = cv2.calibrateCamera(
-            objpoints, imgpoints_right, image_shape, None, None
+            objpoints, imgpoints_right, image_shape, None, None, flags=banderas
         )
         
         # Calibración estéreo
@@ -248,11 +265,29 @@ def calibrar_camaras_estereo(directorio_izquierda, directorio_derecha, patron_fi
     return retStereo, cameraMatrix1, distCoeffs1, cameraMatrix2, distCoeffs2, R, T, E, F
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibración estéreo de dos cámaras con un tablero de ajedrez")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Procesos para detectar las esquinas (por defecto, todos los núcleos; 1 = secuencial)")
+    parser.add_argument("--lado-busqueda", type=int, default=640,
+                        help="Lado mayor de la imagen reducida donde se busca el patrón (0 = resolución completa)")
+    parser.add_argument("--sin-ventanas", action="store_true",
+                        help="No mostrar las esquinas ni las imágenes rectificadas")
+    parser.add_argument("--imagenes", default=None,
+                        help="Carpeta con izquierda/ y derecha/ (por defecto, ../imagenes/calibracion_estereo)")
+    parser.add_argument("--sin-cache", action="store_true",
+                        help="Detectar las esquinas de todas las imágenes aunque estén en la caché")
+    parser.add_argument("--tamano-cuadro", type=float, default=1.0,
+                        help="Tamaño de cada cuadro del patrón (ej. cm)")
+    parser.add_argument("--banderas", nargs="*", default=[], choices=BANDERAS_MODELO,
+                        help="Banderas CALIB_* del modelo para calibrateCamera (ej. FIX_K3 ZERO_TANGENT_DIST)")
+    args = parser.parse_args()
+    
     # Parámetros de calibración
     # Obtener la ruta absoluta del directorio actual
     directorio_actual = os.path.dirname(os.path.abspath(__file__))
-    directorio_izquierda = os.path.join(directorio_actual, "..", "imagenes", "calibracion_estereo", "izquierda")
-    directorio_derecha = os.path.join(directorio_actual, "..", "imagenes", "calibracion_estereo", "derecha")
+    directorio_estereo = args.imagenes or os.path.join(directorio_actual, "..", "imagenes", "calibracion_estereo")
+    directorio_izquierda = os.path.join(directorio_estereo, "izquierda")
+    directorio_derecha = os.path.join(directorio_estereo, "derecha")
     
     # Verificar que existan los directorios
     for directorio in [directorio_izquierda, directorio_derecha]:
@@ -268,7 +303,10 @@ if __name__ == "__main__":
     
     patron_filas = 6      # Número de esquinas internas en filas
     patron_columnas = 9   # Número de esquinas internas en columnas
-    tamano_cuadro = 1.0   # Tamaño de cuadro en unidades arbitrarias (ej. cm)
+    tamano_cuadro = args.tamano_cuadro  # Tamaño de cuadro en unidades arbitrarias (ej. cm)
+    banderas = 0
+    for nombre in args.banderas:
+        banderas |= getattr(cv2, "CALIB_" + nombre)
     
     # Ejecutar calibración estéreo
     retStereo, cameraMatrix1, distCoeffs1, cameraMatrix2, distCoeffs2, R, T, E, F = calibrar_camaras_estereo(
@@ -277,8 +315,12 @@ if __name__ == "__main__":
         patron_filas, 
         patron_columnas, 
         tamano_cuadro,
-        mostrar_proceso=True,
-        guardar_resultados=True
+        mostrar_proceso=not args.sin_ventanas,
+        guardar_resultados=True,
+        procesos=args.procesos,
+        lado_busqueda=args.lado_busqueda or None,
+        banderas=banderas,
+        usar_cache=not args.sin_cache
     )
     
     # Verificar si la calibración fue exitosa
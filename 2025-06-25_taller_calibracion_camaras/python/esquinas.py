@@ -0,0 +1,242 @@
+"""
+Detección de esquinas del tablero de ajedrez en paralelo.
+
+Cada imagen es independiente: se lee en gris, se buscan las esquinas con
+findChessboardCorners y se refinan con cornerSubPix. detectar_en_paralelo()
+reparte una imagen por tarea en un pool de procesos y devuelve los resultados
+en el mismo orden que las rutas, así que la calibración es idéntica a la
+secuencial. Dibujar o mostrar las esquinas queda para después
+(dibujar_esquinas), fuera del camino crítico.
+
+CacheEsquinas guarda las esquinas ya detectadas en un .npz junto a los
+resultados, con el hash SHA-1 del contenido de cada imagen como clave. Volver
+a calibrar con otras banderas o con otro tamaño de cuadro solo repite
+calibrateCamera/stereoCalibrate; una imagen modificada cambia de hash y se
+vuelve a detectar sola.
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+# Criterio de parada para cornerSubPix
+CRITERIO_SUBPIX = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+
+# Banderas por defecto de findChessboardCorners más la verificación rápida
+BANDERAS_BUSQUEDA_RAPIDA = (cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_NORMALIZE_IMAGE |
+                            cv2.CALIB_CB_FAST_CHECK)
+
+
+class Deteccion:
+    """
+    Resultado de buscar el patrón en una imagen.
+
+    Attributes:
+        ruta: Imagen procesada
+        forma: (ancho, alto) de la imagen, o None si no se pudo leer
+        esquinas: Esquinas refinadas (N, 1, 2) float32, o None si no se encontró el patrón
+        segundos: Tiempo de detección + refinamiento (sin la lectura del archivo)
+        niveles: Veces que se redujo la imagen con pyrDown antes de buscar
+        en_cache: True si el resultado salió de CacheEsquinas sin detectar
+    """
+
+    def __init__(self, ruta, forma, esquinas, segundos, niveles=0, en_cache=False):
+        self.ruta = ruta
+        self.forma = forma
+        self.esquinas = esquinas
+        self.segundos = segundos
+        self.niveles = niveles
+        self.en_cache = en_cache
+
+    @property
+    def encontrada(self):
+        return self.esquinas is not None
+
+
+def detectar_esquinas(ruta, patron, lado_busqueda=None):
+    """
+    Busca y refina las esquinas del patrón en una imagen.
+
+    Args:
+        ruta: Ruta de la imagen
+        patron: (columnas, filas) de esquinas internas
+        lado_busqueda: Lado mayor máximo de la imagen en la que se busca el
+                       patrón (grueso a fino); None busca en la imagen completa
+                       como findChessboardCorners sin banderas
+    """
+    img = cv2.imread(ruta)
+    if img is None:
+        return Deteccion(ruta, None, None, 0.0)
+    inicio = time.perf_counter()
+    # Igual que cvtColor en la versión secuencial (IMREAD_GRAYSCALE decodifica distinto)
+    gris = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+    niveles = 0
+    if lado_busqueda is None:
+        ret, esquinas = cv2.findChessboardCorners(gris, patron, None)
+    else:
+        reducida = gris
+        while max(reducida.shape) > lado_busqueda:
+            reducida = cv2.pyrDown(reducida)
+            niveles += 1
+        ret, esquinas = cv2.findChessboardCorners(reducida, patron, BANDERAS_BUSQUEDA_RAPIDA)
+        if ret and niveles:
+            # Centros de píxel del nivel reducido -> resolución completa
+            escala = 2 ** niveles
+            esquinas = (esquinas + 0.5) * escala - 0.5
+
+    if ret:
+        esquinas = cv2.cornerSubPix(gris, esquinas, (11, 11), (-1, -1), CRITERIO_SUBPIX)
+    else:
+        esquinas = None
+    return Deteccion(ruta, gris.shape[::-1], esquinas, time.perf_counter() - inicio, niveles)
+
+
+class CacheEsquinas:
+    """
+    Esquinas detectadas por imagen, persistidas en un archivo .npz.
+
+    La clave combina el hash del contenido de la imagen, el patrón y
+    lado_busqueda, así que no depende de la ruta ni de la fecha del archivo.
+    guardar() escribe solo las entradas usadas desde que se abrió la caché:
+    las de imágenes borradas o modificadas desaparecen en la siguiente
+    ejecución. Si cambia la versión de OpenCV, la caché se descarta entera.
+
+    Args:
+        ruta: Archivo .npz (se crea al guardar si no existe)
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.entradas = {}  # clave -> (forma, esquinas o None, niveles)
+        self.usadas = {}
+        if os.path.exists(ruta):
+            self._cargar()
+
+    def _cargar(self):
+        try:
+            datos = np.load(self.ruta)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo leer la caché de esquinas {self.ruta}: {e}")
+            return
+        with datos:
+            if str(datos["version_opencv"]) != cv2.__version__:
+                return
+            for clave in datos["claves"]:
+                clave = str(clave)
+                ancho, alto, niveles = (int(v) for v in datos[f"{clave}_forma"])
+                esquinas = datos[f"{clave}_esquinas"]
+                self.entradas[clave] = ((ancho, alto), esquinas if len(esquinas) else None, niveles)
+
+    @staticmethod
+    def clave(ruta_imagen, patron, lado_busqueda):
+        """Clave de la imagen, o None si no se puede leer"""
+        try:
+            with open(ruta_imagen, "rb") as f:
+                resumen = hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
+        return f"{resumen}_{patron[0]}x{patron[1]}_{lado_busqueda or 0}"
+
+    def buscar(self, clave, ruta_imagen):
+        """Deteccion guardada para la clave, o None si hay que detectar"""
+        entrada = self.entradas.get(clave) if clave is not None else None
+        if entrada is None:
+            return None
+        self.usadas[clave] = entrada
+        forma, esquinas, niveles = entrada
+        return Deteccion(ruta_imagen, forma, esquinas, 0.0, niveles, en_cache=True)
+
+    def agregar(self, clave, deteccion):
+        if clave is None or deteccion.forma is None:
+            return  # las imágenes ilegibles se vuelven a intentar
+        entrada = (deteccion.forma, deteccion.esquinas, deteccion.niveles)
+        self.entradas[clave] = entrada
+        self.usadas[clave] = entrada
+
+    def guardar(self):
+        arrays = {"version_opencv": np.array(cv2.__version__),
+                  "claves": np.array(sorted(self.usadas), dtype=str)}
+        for clave, (forma, esquinas, niveles) in self.usadas.items():
+            arrays[f"{clave}_forma"] = np.array([forma[0], forma[1], niveles], dtype=np.int32)
+            arrays[f"{clave}_esquinas"] = (esquinas if esquinas is not None
+                                           else np.empty((0, 1, 2), dtype=np.float32))
+        np.savez(self.ruta, **arrays)
+
+
+def _inicializar_proceso():
+    # Cada proceso usa un solo hilo de OpenCV; el paralelismo viene del pool
+    cv2.setNumThreads(1)
+
+
+def _detectar_tarea(argumentos):
+    return detectar_esquinas(*argumentos)
+
+
+def _detectar_todas(tareas, procesos):
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(tareas) <= 1:
+        return [_detectar_tarea(tarea) for tarea in tareas]
+
+    procesos = min(procesos, len(tareas))
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_proceso) as pool:
+        # map conserva el orden de las tareas
+        return list(pool.map(_detectar_tarea, tareas))
+
+
+def detectar_en_paralelo(rutas, patron, procesos=None, lado_busqueda=None, cache=None):
+    """
+    Detecta el patrón en todas las imágenes, una imagen por tarea.
+
+    Args:
+        rutas: Lista de rutas de imágenes
+        patron: (columnas, filas) de esquinas internas
+        procesos: Número de procesos (None = núcleos disponibles; 1 = secuencial, sin pool)
+        lado_busqueda: Ver detectar_esquinas
+        cache: CacheEsquinas opcional; solo se detectan las imágenes que no estén en ella
+
+    Returns:
+        Lista de Deteccion en el mismo orden que rutas
+    """
+    if cache is None:
+        return _detectar_todas([(ruta, patron, lado_busqueda) for ruta in rutas], procesos)
+
+    claves = [cache.clave(ruta, patron, lado_busqueda) for ruta in rutas]
+    detecciones = [cache.buscar(clave, ruta) for clave, ruta in zip(claves, rutas)]
+    pendientes = [i for i, deteccion in enumerate(detecciones) if deteccion is None]
+    nuevas = _detectar_todas([(rutas[i], patron, lado_busqueda) for i in pendientes], procesos)
+    for i, deteccion in zip(pendientes, nuevas):
+        cache.agregar(claves[i], deteccion)
+        detecciones[i] = deteccion
+    return detecciones
+
+
+def dibujar_esquinas(deteccion, patron):
+    """Lee la imagen a color y dibuja las esquinas detectadas"""
+    img = cv2.imread(deteccion.ruta)
+    cv2.drawChessboardCorners(img, patron, deteccion.esquinas, True)
+    return img
+
+
+def resumen_deteccion(detecciones, segundos):
+    """Texto con imágenes válidas, rechazadas y tiempos de la detección"""
+    validas = sum(d.encontrada for d in detecciones)
+    ilegibles = sum(d.forma is None for d in detecciones)
+    total = len(detecciones)
+    tiempos = [d.segundos for d in detecciones if d.forma is not None and not d.en_cache]
+    en_cache = sum(d.en_cache for d in detecciones)
+    lineas = [f"Esquinas encontradas en {validas} de {total} imágenes "
+              f"({total - validas - ilegibles} rechazadas, {ilegibles} ilegibles) "
+              f"en {segundos:.2f} s ({total / max(segundos, 1e-9):.1f} imágenes/s)"]
+    if en_cache:
+        lineas.append(f"{en_cache} de {total} imágenes sin cambios tomadas de la caché")
+    if tiempos:
+        niveles = max(d.niveles for d in detecciones if not d.en_cache)
+        busqueda = f"búsqueda reducida {niveles} nivel(es) de pirámide" if niveles else "búsqueda a resolución completa"
+        lineas.append(f"Detección por imagen: media {1000 * sum(tiempos) / len(tiempos):.1f} ms, "
+                      f"máx {1000 * max(tiempos):.1f} ms ({busqueda})")
+    return "\n".join(lineas)
@@ -0,0 +1,156 @@
+"""
+Generación de vistas sintéticas del patrón en un pool de procesos.
+
+Cada vista es independiente: se deforma el patrón (warp), se le suma ruido,
+se codifica (encode) y se escribe el archivo. generar_vistas() reparte las
+vistas entre procesos y mide el tiempo de cada etapa por separado.
+
+Cada vista tiene su propio generador aleatorio, creado a partir de la semilla
+y del número de la vista (no del proceso que la ejecuta), así que con la misma
+semilla se obtienen exactamente los mismos archivos con 1 o con N procesos.
+El ruido usa el RNG de OpenCV, sembrado también por vista.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+ETAPAS = ("warp", "ruido", "codificacion", "escritura")
+
+# Formato -> (extensión, parámetro de calidad de imencode)
+FORMATOS = {
+    "jpg": (".jpg", cv2.IMWRITE_JPEG_QUALITY),
+    "png": (".png", cv2.IMWRITE_PNG_COMPRESSION),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY),
+}
+
+# Estado de cada proceso, fijado una vez por _inicializar_proceso
+_estado = {}
+
+
+def _inicializar_proceso(patron_path, renderizar, salidas, sigma_ruido, semilla, formato, calidad, ancho_indice):
+    cv2.setNumThreads(1)  # el paralelismo viene del pool
+    patron = cv2.imread(patron_path)
+    extension, parametro = FORMATOS[formato]
+    _estado.update(patron=patron, renderizar=renderizar, salidas=salidas, sigma_ruido=sigma_ruido,
+                   semilla=semilla, extension=extension, ancho_indice=ancho_indice,
+                   parametros=[] if calidad is None else [parametro, calidad])
+
+
+def _generar_vista(i):
+    """Genera y escribe la vista i; devuelve los segundos de cada etapa"""
+    tiempos = dict.fromkeys(ETAPAS, 0.0)
+    rng = np.random.default_rng([_estado["semilla"], i])
+
+    inicio = time.perf_counter()
+    imagenes = _estado["renderizar"](_estado["patron"], i, rng)
+    tiempos["warp"] = time.perf_counter() - inicio
+
+    for imagen, (directorio, prefijo) in zip(imagenes, _estado["salidas"]):
+        inicio = time.perf_counter()
+        # Ruido gaussiano para simular imágenes reales (cv2.add satura en uint8)
+        cv2.setRNGSeed(int(rng.integers(2 ** 31)))
+        ruido = np.zeros(imagen.shape, np.uint8)
+        cv2.randn(ruido, 0, _estado["sigma_ruido"])
+        imagen = cv2.add(imagen, ruido)
+        tiempos["ruido"] += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        ok, datos = cv2.imencode(_estado["extension"], imagen, _estado["parametros"])
+        if not ok:
+            raise RuntimeError(f"No se pudo codificar la vista {i} como {_estado['extension']}")
+        tiempos["codificacion"] += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        nombre = f"{prefijo}_{i + 1:0{_estado['ancho_indice']}d}{_estado['extension']}"
+        with open(os.path.join(directorio, nombre), "wb") as f:
+            f.write(datos.tobytes())
+        tiempos["escritura"] += time.perf_counter() - inicio
+
+    return tiempos
+
+
+def generar_vistas(renderizar, patron_path, salidas, num_vistas, sigma_ruido, procesos=None, semilla=None,
+                   formato="jpg", calidad=None):
+    """
+    Genera num_vistas vistas del patrón en paralelo.
+
+    Args:
+        renderizar: Función de módulo (patron, i, rng) -> tupla de imágenes deformadas,
+                    una por salida
+        patron_path: Ruta de la imagen del patrón
+        salidas: Lista de (directorio, prefijo) para cada imagen que devuelve renderizar
+        num_vistas: Número de vistas
+        sigma_ruido: Desviación estándar del ruido gaussiano
+        procesos: Número de procesos (None = núcleos disponibles; 1 = secuencial, sin pool)
+        semilla: Semilla de la generación (None = una al azar, que se imprime para repetirla)
+        formato: "jpg", "png" o "webp"
+        calidad: Calidad JPEG/WebP (0-100) o compresión PNG (0-9); None = valor por defecto de OpenCV
+
+    Returns:
+        (semilla, tiempos): semilla usada y segundos totales por etapa (más "total", de reloj)
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato} (opciones: {', '.join(FORMATOS)})")
+    if cv2.imread(patron_path) is None:
+        raise ValueError(f"No se pudo cargar la imagen del patrón: {patron_path}")
+    if semilla is None:
+        semilla = int(np.random.SeedSequence().entropy % 2 ** 32)
+    for directorio, _ in salidas:
+        os.makedirs(directorio, exist_ok=True)
+
+    # Mismo ancho de índice en todos los nombres para que el orden alfabético sea el numérico
+    ancho_indice = max(2, len(str(num_vistas)))
+    argumentos = (patron_path, renderizar, salidas, sigma_ruido, semilla, formato, calidad, ancho_indice)
+    procesos = min(procesos or os.cpu_count() or 1, max(num_vistas, 1))
+    paso_progreso = max(1, num_vistas // 10)
+
+    inicio = time.perf_counter()
+    totales = dict.fromkeys(ETAPAS, 0.0)
+    if procesos == 1:
+        _inicializar_proceso(*argumentos)
+        resultados = map(_generar_vista, range(num_vistas))
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_proceso, initargs=argumentos)
+        resultados = pool.map(_generar_vista, range(num_vistas),
+                              chunksize=max(1, num_vistas // (procesos * 8)))
+    try:
+        for hechas, tiempos in enumerate(resultados, start=1):
+            for etapa in ETAPAS:
+                totales[etapa] += tiempos[etapa]
+            if hechas % paso_progreso == 0 or hechas == num_vistas:
+                print(f"{hechas}/{num_vistas} vistas generadas")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    totales["total"] = time.perf_counter() - inicio
+    return semilla, totales
+
+
+def resumen_generacion(num_vistas, semilla, tiempos, procesos):
+    """Texto con el rendimiento total y el costo de cada etapa por vista"""
+    total = tiempos["total"]
+    lineas = [f"{num_vistas} vistas en {total:.2f} s ({num_vistas / max(total, 1e-9):.1f} vistas/s, "
+              f"{procesos or os.cpu_count() or 1} proceso(s), semilla {semilla})"]
+    if num_vistas:
+        etapas = ", ".join(f"{etapa} {1000 * tiempos[etapa] / num_vistas:.1f} ms" for etapa in ETAPAS)
+        lineas.append(f"Por vista (suma de procesos): {etapas}")
+    return "\n".join(lineas)
+
+
+def agregar_argumentos(parser, num_por_defecto):
+    """Argumentos comunes de los generadores"""
+    parser.add_argument("--num", type=int, default=num_por_defecto,
+                        help=f"Número de vistas a generar (por defecto, {num_por_defecto})")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Procesos para generar (por defecto, todos los núcleos; 1 = secuencial)")
+    parser.add_argument("--semilla", type=int, default=None,
+                        help="Semilla para repetir exactamente la misma generación")
+    parser.add_argument("--formato", choices=sorted(FORMATOS), default="jpg",
+                        help="Formato de las imágenes (las calibraciones leen .jpg)")
+    parser.add_argument("--calidad", type=int, default=None,
+                        help="Calidad JPEG/WebP (0-100) o compresión PNG (0-9)")
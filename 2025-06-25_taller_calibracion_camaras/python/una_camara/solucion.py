@@ -2,13 +2,24 @@
 Calibración de una cámara utilizando un patrón de tablero de ajedrez
 """
 
+import argparse
 import numpy as np
 import cv2
 import glob
 import os
+import sys
+import time
 import matplotlib.pyplot as plt
 
-def calibrar_una_camara(directorio_imagenes, patron_filas, patron_columnas, tamano_cuadro=1.0, mostrar_proceso=True, guardar_resultados=True):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from esquinas import CacheEsquinas, detectar_en_paralelo, dibujar_esquinas, resumen_deteccion
+
+# Banderas de calibrateCamera que se pueden elegir por línea de comandos (sin el prefijo CALIB_)
+BANDERAS_MODELO = ["FIX_ASPECT_RATIO", "FIX_PRINCIPAL_POINT", "ZERO_TANGENT_DIST",
+                   "FIX_K1", "FIX_K2", "FIX_K3", "RATIONAL_MODEL"]
+
+def calibrar_una_camara(directorio_imagenes, patron_filas, patron_columnas, tamano_cuadro=1.0, mostrar_proceso=True, guardar_resultados=True,
+                        procesos=None, lado_busqueda=None, banderas=0, usar_cache=True):
     """
     Realiza la calibración de una cámara usando un conjunto de imágenes de un patrón de tablero de ajedrez.
     
@@ -19,6 +30,12 @@ def calibrar_una_camara(directorio_imagenes, patron_filas, patron_columnas, tama
         tamano_cuadro: Tamaño de cada cuadro del patrón (en unidades arbitrarias, por defecto 1.0)
         mostrar_proceso: Si es True, muestra imágenes del proceso
         guardar_resultados: Si es True, guarda imágenes y parámetros de calibración
+        procesos: Procesos para detectar las esquinas (None = todos los núcleos, 1 = secuencial)
+        lado_busqueda: Si se da, busca el patrón en la imagen reducida hasta este lado mayor
+                       y refina a resolución completa (None = búsqueda a resolución completa)
+        banderas: Banderas CALIB_* para calibrateCamera
+        usar_cache: Si es True (y se guardan resultados), reutiliza las esquinas de las
+                    imágenes sin cambios desde la ejecución anterior (esquinas_cache.npz)
     
     Returns:
         ret: Valor RMS del error de reproyección
@@ -33,8 +50,9 @@ def calibrar_una_camara(directorio_imagenes, patron_filas, patron_columnas, tama
     
     # Arrays para almacenar puntos del objeto y puntos de la imagen de todas las imágenes
     objpoints = [] # puntos 3D en el espacio real (sistema de coordenadas del objeto)
-    imgpoints = [] # puntos 2D en el plano de la imagen    # Lista de todas las imágenes de calibración
-    imagenes = glob.glob(os.path.join(directorio_imagenes, '*.jpg'))
+    imgpoints = [] # puntos 2D en el plano de la imagen
+    # Lista de todas las imágenes de calibración (ordenada para que el resultado sea reproducible)
+    imagenes = sorted(glob.glob(os.path.join(directorio_imagenes, '*.jpg')))
     
     # Verificar si hay imágenes disponibles
     if len(imagenes) == 0:
@@ -42,53 +60,54 @@ def calibrar_una_camara(directorio_imagenes, patron_filas, patron_columnas, tama
         print("Asegúrese de que las imágenes de calibración existan antes de ejecutar este script.")
         return None, None, None, None, None
     
-    # Contador para nombrar las imágenes resultantes
-    contador_imagen = 0
-    
     # Crear directorio para resultados si no existe
     if guardar_resultados:
         directorio_resultados = '../../resultados_una_camara'
         os.makedirs(directorio_resultados, exist_ok=True)
     
+    # Detectar y refinar las esquinas de todas las imágenes en paralelo (una imagen por tarea)
+    patron = (patron_columnas, patron_filas)
+    cache = None
+    if usar_cache and guardar_resultados:
+        cache = CacheEsquinas(os.path.join(directorio_resultados, 'esquinas_cache.npz'))
+    inicio = time.perf_counter()
+    detecciones = detectar_en_paralelo(imagenes, patron, procesos, lado_busqueda, cache)
+    print(resumen_deteccion(detecciones, time.perf_counter() - inicio))
+    if cache is not None:
+        cache.guardar()
+    
     # Variable para almacenar dimensiones de imagen para calibración
     img_shape = None
     valid_images_found = False
-      # Procesar cada imagen para detectar esquinas
-    for imagen_path in imagenes:
-        img = cv2.imread(imagen_path)
-        if img is None:
-            print(f"No se pudo leer la imagen: {imagen_path}")
+    for deteccion in detecciones:
+        if deteccion.forma is None:
+            print(f"No se pudo leer la imagen: {deteccion.ruta}")
             continue
-            
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         if img_shape is None:
-            img_shape = gray.shape[::-1]  # Guardar dimensiones para calibración
-        
-        # Buscar esquinas del patrón
-        ret, corners = cv2.findChessboardCorners(gray, (patron_columnas, patron_filas), None)
+            img_shape = deteccion.forma  # Guardar dimensiones para calibración
         
         # Si se encuentran las esquinas, se añaden a los arrays
-        if ret:
+        if deteccion.encontrada:
             valid_images_found = True
             objpoints.append(objp)
+            imgpoints.append(deteccion.esquinas)
+    
+    # Dibujar, mostrar y guardar las esquinas después de detectar, fuera del camino crítico
+    if mostrar_proceso or guardar_resultados:
+        contador_imagen = 0  # Contador para nombrar las imágenes resultantes
+        for deteccion in detecciones:
+            if not deteccion.encontrada:
+                continue
+            img = dibujar_esquinas(deteccion, patron)
+            
+            if mostrar_proceso:
+                cv2.imshow('Esquinas detectadas', img)
+                cv2.waitKey(500)
             
-            # Refinar las esquinas encontradas
-            criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
-            corners2 = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
-            imgpoints.append(corners2)
+            if guardar_resultados:
+                cv2.imwrite(os.path.join(directorio_resultados, f'patron_variacion_{contador_imagen}_esquinas.jpg'), img)
             
-            # Dibujar y mostrar las esquinas
-            if mostrar_proceso or guardar_resultados:
-                cv2.drawChessboardCorners(img, (patron_columnas, patron_filas), corners2, ret)
-                
-                if mostrar_proceso:
-                    cv2.imshow('Esquinas detectadas', img)
-                    cv2.waitKey(500)
-                
-                if guardar_resultados:
-                    cv2.imwrite(os.path.join(directorio_resultados, f'patron_variacion_{contador_imagen}_esquinas.jpg'), img)
-                
-                contador_imagen += 1
+            contador_imagen += 1
     
     if mostrar_proceso:
         cv2.destroyAllWindows()    # Verificar si se encontraron suficientes puntos para calibración
@@ -101,7 +120,7 @@ def calibrar_una_camara(directorio_imagenes, patron_filas, patron_columnas, tama
         return None, None, None, None, None    # Calibrar la cámara
     if len(objpoints) > 0 and valid_images_found and img_shape is not None:
         ret, mtx, dist, rvecs, tvecs = cv2.calibrateCamera(
-            objpoints, imgpoints, img_shape, None, None
+            objpoints, imgpoints, img_shape, None, None, flags=banderas
         )
     else:
         print("Error: No hay suficientes datos para calibrar la cámara.")
@@ -161,10 +180,27 @@ def calibrar_una_camara(directorio_imagenes, patron_filas, patron_columnas, tama
     return ret, mtx, dist, rvecs, tvecs
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibración de una cámara con un tablero de ajedrez")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Procesos para detectar las esquinas (por defecto, todos los núcleos; 1 = secuencial)")
+    parser.add_argument("--lado-busqueda", type=int, default=640,
+                        help="Lado mayor de la imagen reducida donde se busca el patrón (0 = resolución completa)")
+    parser.add_argument("--sin-ventanas", action="store_true",
+                        help="No mostrar las esquinas ni la comparación de distorsión")
+    parser.add_argument("--imagenes", default=None,
+                        help="Carpeta con las imágenes (por defecto, ../imagenes/calibracion_una_camara)")
+    parser.add_argument("--sin-cache", action="store_true",
+                        help="Detectar las esquinas de todas las imágenes aunque estén en la caché")
+    parser.add_argument("--tamano-cuadro", type=float, default=1.0,
+                        help="Tamaño de cada cuadro del patrón (ej. cm)")
+    parser.add_argument("--banderas", nargs="*", default=[], choices=BANDERAS_MODELO,
+                        help="Banderas CALIB_* del modelo para calibrateCamera (ej. FIX_K3 ZERO_TANGENT_DIST)")
+    args = parser.parse_args()
+    
     # Parámetros de calibración
     # Obtener la ruta absoluta del directorio actual
     directorio_actual = os.path.dirname(os.path.abspath(__file__))
-    directorio_imagenes = os.path.join(directorio_actual, "..", "imagenes", "calibracion_una_camara")
+    directorio_imagenes = args.imagenes or os.path.join(directorio_actual, "..", "imagenes", "calibracion_una_camara")
     
     # Verificar que exista el directorio
     if not os.path.exists(directorio_imagenes):
@@ -175,7 +211,10 @@ if __name__ == "__main__":
     
     patron_filas = 6      # Número de esquinas internas en filas
     patron_columnas = 9   # Número de esquinas internas en columnas
-    tamano_cuadro = 1.0   # Tamaño de cuadro en unidades arbitrarias (ej. cm)
+    tamano_cuadro = args.tamano_cuadro  # Tamaño de cuadro en unidades arbitrarias (ej. cm)
+    banderas = 0
+    for nombre in args.banderas:
+        banderas |= getattr(cv2, "CALIB_" + nombre)
     
     # Ejecutar calibración
     ret, mtx, dist, rvecs, tvecs = calibrar_una_camara(
@@ -183,8 +222,12 @@ if __name__ == "__main__":
         patron_filas, 
         patron_columnas, 
         tamano_cuadro,
-        mostrar_proceso=True,
-        guardar_resultados=True
+        mostrar_proceso=not args.sin_ventanas,
+        guardar_resultados=True,
+        procesos=args.procesos,
+        lado_busqueda=args.lado_busqueda or None,
+        banderas=banderas,
+        usar_cache=not args.sin_cache
     )
     
     # Verificar si la calibración fue exitosa
@@ -7,10 +7,17 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext
 from PIL import Image, ImageTk
 import threading
+import sys
+import argparse
 from queue import Queue
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from comun.grafo_filtros import Cadena, Grises, Binario, Bordes, Desenfoque, Superponer, FiltroFuncion
+from comun.fuentes_video import agregar_argumentos, abrir_desde_argumentos
+
 class VideoProcessorGUI:
-    def __init__(self):
+    def __init__(self, args):
+        self.args = args
         self.root = tk.Tk()
         self.root.title("🧪 Taller: Cámara en Vivo - YOLO y OpenCV")
         self.root.geometry("1280x720")
@@ -25,10 +32,23 @@ class VideoProcessorGUI:
         self.is_running = False
         
         self.log_queue = Queue()
+        self.setup_pipelines()
         self.setup_gui()
         self.setup_camera()
         self.setup_yolo()
     
+    def setup_pipelines(self):
+        # Cada filtro es una cadena con buffers propios que se reutilizan entre cuadros
+        self.pipelines = {
+            'original': Cadena([]),
+            'grayscale': Cadena([Grises()]),
+            'binary': Cadena([Grises(), Binario(127)]),
+            'edges': Cadena([Grises(), Bordes(100, 200)]),
+            'blur': Cadena([Desenfoque(15)]),
+            'overlay': Cadena([Desenfoque(5), Bordes(50, 150), Superponer((0, 255, 0))]),
+            'yolo': Cadena([FiltroFuncion('yolo', self.detect_objects)]),
+        }
+    
     def configure_dark_theme(self):
         # Configurar colores del tema oscuro
         self.colors = {
@@ -143,10 +163,12 @@ class VideoProcessorGUI:
         buttons_frame = tk.Frame(controls_frame, bg=self.colors['bg_secondary'])
         buttons_frame.pack(side=tk.RIGHT)
         
-        ttk.Button(buttons_frame, text="▶️ Iniciar", command=self.start_video, 
-                  style='DarkButton.TButton').pack(side=tk.LEFT, padx=2)
-        ttk.Button(buttons_frame, text="⏸️ Pausar", command=self.toggle_pause, 
-                  style='DarkButton.TButton').pack(side=tk.LEFT, padx=2)
+        self.start_btn = ttk.Button(buttons_frame, text="▶️ Iniciar", command=self.start_video, 
+                                    style='DarkButton.TButton')
+        self.start_btn.pack(side=tk.LEFT, padx=2)
+        self.pause_btn = ttk.Button(buttons_frame, text="⏸️ Pausar", command=self.toggle_pause, 
+                                    style='DarkButton.TButton')
+        self.pause_btn.pack(side=tk.LEFT, padx=2)
         ttk.Button(buttons_frame, text="📷 Capturar", command=self.capture_frame, 
                   style='DarkButton.TButton').pack(side=tk.LEFT, padx=2)
         ttk.Button(buttons_frame, text="❓ Ayuda", command=self.show_help, 
@@ -166,6 +188,7 @@ class VideoProcessorGUI:
             ("Binario", "binary"),
             ("Bordes", "edges"),
             ("Blur", "blur"),
+            ("Contornos", "overlay"),
             ("YOLO", "yolo")
         ]
         
@@ -193,9 +216,9 @@ class VideoProcessorGUI:
         self.log("📝 Usa los botones o las teclas para controlar la aplicación")
         
     def setup_camera(self):
-        self.cap = cv2.VideoCapture(0)
+        self.cap = abrir_desde_argumentos(self.args)
         if not self.cap.isOpened():
-            raise RuntimeError("No se pudo acceder a la cámara")
+            raise RuntimeError(f"No se pudo abrir la fuente de video '{self.args.fuente}'")
         
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
@@ -240,7 +263,7 @@ class VideoProcessorGUI:
     
     def capture_frame(self):
         if hasattr(self, 'current_frame') and self.current_frame is not None:
-            processed = self.process_frame(self.current_frame)
+            processed = self.process_frame(self.current_frame, copy=True)
             timestamp = int(time.time())
             filename = f"capture_{self.current_filter}_{timestamp}.jpg"
             cv2.imwrite(filename, processed)
@@ -261,6 +284,9 @@ class VideoProcessorGUI:
         elif key == 'l':
             self.filter_var.set('blur')
             self.change_filter()
+        elif key == 'c':
+            self.filter_var.set('overlay')
+            self.change_filter()
         elif key == 'o':
             self.filter_var.set('original')
             self.change_filter()
@@ -271,33 +297,23 @@ class VideoProcessorGUI:
             self.toggle_pause()
         elif key == 's':
             self.capture_frame()
+        elif key == 't':
+            self.show_timing_report()
         elif key == 'h':
             self.show_help()
         elif key == 'q':
             self.cleanup()
     
-    def apply_grayscale_filter(self, frame):
-        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    
-    def apply_binary_filter(self, frame):
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
-        return binary
-    
-    def apply_edge_detection(self, frame):
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, 100, 200)
-        return edges
-    
-    def apply_blur_filter(self, frame):
-        return cv2.GaussianBlur(frame, (15, 15), 0)
-    
-    def detect_objects(self, frame):
+    def detect_objects(self, frame, dst=None):
         if self.model is None:
             return frame
             
         results = self.model(frame, verbose=False)
-        annotated_frame = frame.copy()
+        if dst is None:
+            annotated_frame = frame.copy()
+        else:
+            np.copyto(dst, frame)
+            annotated_frame = dst
         current_objects = {}
         
         for result in results:
@@ -345,11 +361,13 @@ class VideoProcessorGUI:
         self.log("  'b' - Filtro binario")
         self.log("  'e' - Detección de bordes")
         self.log("  'l' - Filtro blur")
+        self.log("  'c' - Contornos sobre la imagen")
         self.log("  'o' - Frame original")
         self.log("  'y' - Detección YOLO")
         self.log("🎮 CONTROLES:")
         self.log("  'p' - Pausar/Reanudar")
         self.log("  's' - Capturar imagen")
+        self.log("  't' - Tiempos por etapa del filtro")
         self.log("  'h' - Mostrar ayuda")
         self.log("  'q' - Salir")
         self.log("💡 También puedes usar los botones y controles de la interfaz")
@@ -361,24 +379,15 @@ class VideoProcessorGUI:
         cv2.imwrite(filename, frame)
         print(f"Imagen guardada como: {filename}")
     
-    def process_frame(self, frame):
-        if self.current_filter == 'grayscale':
-            processed = self.apply_grayscale_filter(frame)
-            processed = cv2.cvtColor(processed, cv2.COLOR_GRAY2BGR)
-        elif self.current_filter == 'binary':
-            processed = self.apply_binary_filter(frame)
-            processed = cv2.cvtColor(processed, cv2.COLOR_GRAY2BGR)
-        elif self.current_filter == 'edges':
-            processed = self.apply_edge_detection(frame)
-            processed = cv2.cvtColor(processed, cv2.COLOR_GRAY2BGR)
-        elif self.current_filter == 'blur':
-            processed = self.apply_blur_filter(frame)
-        elif self.current_filter == 'yolo':
-            processed = self.detect_objects(frame)
-        else:
-            processed = frame.copy()
-        
-        return processed
+    def process_frame(self, frame, copy=False):
+        pipeline = self.pipelines.get(self.current_filter, self.pipelines['original'])
+        return pipeline.procesar(frame, copiar=copy)
+    
+    def show_timing_report(self):
+        pipeline = self.pipelines.get(self.current_filter, self.pipelines['original'])
+        self.log(f"⏱️ Tiempos del filtro '{self.current_filter}':")
+        for line in pipeline.reporte_texto().splitlines():
+            self.log(f"  {line}")
     
     def video_loop(self):
         self.log("🎥 Bucle de video iniciado")
@@ -388,10 +397,16 @@ class VideoProcessorGUI:
                 if self.cap is None:
                     self.log("❌ Error: Cámara no inicializada")
                     break
-                    
+                
+                # Sin espera fija: la fuente marca el ritmo (tiempo-real o la cámara)
+                # y con --ritmo maximo se procesa tan rápido como se pueda
                 ret, frame = self.cap.read()
                 if not ret:
-                    self.log("❌ Error: No se pudo leer el frame")
+                    if self.cap.isOpened():
+                        self.log("❌ Error: No se pudo leer el frame")
+                    else:
+                        self.log(f"⏹️ Fin de la fuente de video: {self.cap.resumen()}")
+                    self.root.after(0, self.on_source_end)
                     break
                 
                 self.frame_count += 1
@@ -406,8 +421,16 @@ class VideoProcessorGUI:
                 
                 # Actualizar GUI en thread principal
                 self.root.after(0, self.update_video_display, original_image, processed_image)
-                
-            time.sleep(0.03)  # ~30 FPS
+            else:
+                time.sleep(0.1)
+    
+    def on_source_end(self):
+        """Detener el bucle y restaurar los controles al terminar la fuente"""
+        self.is_running = False
+        self.is_paused = False
+        self.start_btn.config(text="▶️ Iniciar", state='normal')
+        self.pause_btn.config(text="⏸️ Pausar")
+        self.status_label.config(text=f"Filtro: {self.current_filter} | Frame: {self.frame_count} | Estado: Detenido")
     
     def cv2_to_tkinter(self, cv_img):
         # Redimensionar para ajustarse a la interfaz
@@ -457,8 +480,11 @@ class VideoProcessorGUI:
         self.root.destroy()
 
 def main():
+    parser = argparse.ArgumentParser(description="Cámara en vivo con filtros de OpenCV y YOLOv8")
+    agregar_argumentos(parser)
+    args = parser.parse_args()
     try:
-        processor = VideoProcessorGUI()
+        processor = VideoProcessorGUI(args)
         processor.run()
     except KeyboardInterrupt:
         print("\nInterrupción del usuario detectada")
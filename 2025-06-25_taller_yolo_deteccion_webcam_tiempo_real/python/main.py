@@ -7,14 +7,47 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext
 from PIL import Image, ImageTk
 import threading
+import sys
+import argparse
 from queue import Queue
-from collections import defaultdict
+from collections import defaultdict, deque
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from comun.fuentes_video import agregar_argumentos, abrir_desde_argumentos
+
+class LatestFrameQueue:
+    """Cola acotada donde el cuadro más nuevo reemplaza a los que no se alcanzaron a consumir"""
+    def __init__(self, maxsize=1):
+        self.items = deque(maxlen=maxsize)
+        self.condition = threading.Condition()
+        self.dropped = 0
+        
+    def put(self, item):
+        with self.condition:
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1  # El más viejo se descarta al agregar
+            self.items.append(item)
+            self.condition.notify()
+            
+    def get(self, timeout=None):
+        """Devuelve el siguiente elemento o None si se agota el tiempo de espera"""
+        with self.condition:
+            if not self.items:
+                self.condition.wait(timeout)
+            if not self.items:
+                return None
+            return self.items.popleft()
+    
+    def clear(self):
+        with self.condition:
+            self.items.clear()
+
 class YOLODetectorGUI:
-    def __init__(self):
+    def __init__(self, args):
+        self.args = args
         self.root = tk.Tk()
         self.root.title("🎯 YOLO Real-Time Object Detection - Webcam")
         self.root.geometry("1400x900")
@@ -37,9 +70,17 @@ class YOLODetectorGUI:
         self.detection_stats = defaultdict(int)
         self.total_detections = 0
         
-        # Threading
+        # Threading: captura -> inferencia -> render, conectados por colas de último cuadro
         self.log_queue = Queue()
         self.video_thread = None
+        self.pipeline_threads = []
+        self.capture_queue = LatestFrameQueue(maxsize=1)
+        self.render_queue = LatestFrameQueue(maxsize=1)
+        
+        # Métricas del pipeline (cada contador lo escribe solo su propia etapa)
+        self.stage_counts = {'capture': 0, 'inference': 0, 'render': 0}
+        self.stage_times = {'capture': 0.0, 'inference': 0.0, 'render': 0.0}
+        self.latency_history = deque(maxlen=30)
         
         self.setup_gui()
         self.setup_camera()
@@ -277,6 +318,15 @@ class YOLODetectorGUI:
         self.canvas = FigureCanvasTkAgg(self.fig, stats_frame)
         self.canvas.get_tk_widget().pack(fill=tk.X, pady=(0, 10))
         
+        # Rendimiento por etapa del pipeline
+        self.pipeline_label = tk.Label(stats_frame,
+                                     text="Latencia E2E: -- ms\nCaptura: -- | Inferencia: -- | Render: --",
+                                     bg=self.colors['bg_secondary'],
+                                     fg=self.colors['accent_orange'],
+                                     font=("Consolas", 9),
+                                     justify=tk.LEFT)
+        self.pipeline_label.pack(anchor=tk.W, pady=(0, 10))
+        
         # Lista de objetos detectados
         self.stats_text = scrolledtext.ScrolledText(stats_frame, height=8, 
                                                   bg=self.colors['bg_card'], 
@@ -300,18 +350,18 @@ class YOLODetectorGUI:
         self.console.pack(fill=tk.BOTH)
         
     def setup_camera(self):
-        """Configurar cámara"""
+        """Configurar cámara o fuente de video"""
         try:
-            self.cap = cv2.VideoCapture(0)
+            self.cap = abrir_desde_argumentos(self.args)
             if not self.cap.isOpened():
-                raise RuntimeError("No se pudo acceder a la cámara")
+                raise RuntimeError(f"No se pudo abrir la fuente de video '{self.args.fuente}'")
             
-            # Configurar resolución
+            # Configurar resolución (solo aplica a cámaras)
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             self.cap.set(cv2.CAP_PROP_FPS, 30)
             
-            self.log("✅ Cámara inicializada correctamente")
+            self.log(f"✅ Fuente de video inicializada: {self.args.fuente}")
             
         except Exception as e:
             self.log(f"❌ Error al inicializar cámara: {str(e)}")
@@ -380,9 +430,18 @@ class YOLODetectorGUI:
         if not self.is_running and self.cap and self.model:
             self.is_running = True
             self.is_paused = False
-            self.video_thread = threading.Thread(target=self.detection_loop)
-            self.video_thread.daemon = True
-            self.video_thread.start()
+            self.capture_queue.clear()
+            self.render_queue.clear()
+            
+            # Un hilo por etapa para que la cámara y Tk no frenen la inferencia
+            self.pipeline_threads = [
+                threading.Thread(target=self.capture_loop, daemon=True),
+                threading.Thread(target=self.inference_loop, daemon=True),
+                threading.Thread(target=self.render_loop, daemon=True),
+            ]
+            for thread in self.pipeline_threads:
+                thread.start()
+            self.video_thread = self.pipeline_threads[-1]
             
             self.start_btn.config(text="🔄 Detectando...", state='disabled')
             self.status_label.config(text="Estado: Detectando objetos...")
@@ -419,55 +478,69 @@ class YOLODetectorGUI:
             self.cleanup()
             self.root.quit()
             
+    def run_inference(self, frame):
+        """Ejecutar YOLO y devolver las cajas de las clases seleccionadas"""
+        start_time = time.time()
+        results = self.model(frame, verbose=False, conf=self.confidence_threshold)
+        inference_time = time.time() - start_time
+        
+        boxes_out = []
+        current_detections = defaultdict(int)
+        
+        for result in results:
+            boxes = result.boxes
+            if boxes is not None:
+                for box in boxes:
+                    x1, y1, x2, y2 = map(int, box.xyxy[0])
+                    confidence = float(box.conf[0])
+                    class_id = int(box.cls[0])
+                    class_name = self.model.names[class_id]
+                    
+                    # Filtrar por clases seleccionadas
+                    if self.selected_classes and class_name not in self.selected_classes:
+                        continue
+                        
+                    current_detections[class_name] += 1
+                    boxes_out.append((x1, y1, x2, y2, confidence, class_name))
+        
+        return boxes_out, current_detections, inference_time
+    
+    def annotate_frame(self, frame, boxes, fps):
+        """Dibujar cajas, etiquetas e información de FPS sobre una copia del frame"""
+        annotated_frame = frame.copy()
+        
+        for x1, y1, x2, y2, confidence, class_name in boxes:
+            # Dibujar bounding box
+            color = self.get_class_color(class_name)
+            cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
+            
+            # Etiqueta con fondo
+            label = f"{class_name}: {confidence:.2f}"
+            label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+            cv2.rectangle(annotated_frame, (x1, y1 - label_size[1] - 10), 
+                        (x1 + label_size[0], y1), color, -1)
+            cv2.putText(annotated_frame, label, (x1, y1 - 5), 
+                      cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        
+        # Mostrar información en el frame
+        info_text = f"FPS: {fps:.1f} | Objetos: {len(boxes)}"
+        cv2.putText(annotated_frame, info_text, (10, 30), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        
+        return annotated_frame
+    
     def detect_objects(self, frame):
         """Detectar objetos con YOLO"""
         if self.model is None:
             return frame, {}
             
         try:
-            start_time = time.time()
-            results = self.model(frame, verbose=False, conf=self.confidence_threshold)
-            inference_time = time.time() - start_time
-            
-            annotated_frame = frame.copy()
-            current_detections = defaultdict(int)
-            
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        x1, y1, x2, y2 = map(int, box.xyxy[0])
-                        confidence = float(box.conf[0])
-                        class_id = int(box.cls[0])
-                        class_name = self.model.names[class_id]
-                        
-                        # Filtrar por clases seleccionadas
-                        if self.selected_classes and class_name not in self.selected_classes:
-                            continue
-                            
-                        current_detections[class_name] += 1
-                        
-                        # Dibujar bounding box
-                        color = self.get_class_color(class_name)
-                        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
-                        
-                        # Etiqueta con fondo
-                        label = f"{class_name}: {confidence:.2f}"
-                        label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
-                        cv2.rectangle(annotated_frame, (x1, y1 - label_size[1] - 10), 
-                                    (x1 + label_size[0], y1), color, -1)
-                        cv2.putText(annotated_frame, label, (x1, y1 - 5), 
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            boxes, current_detections, inference_time = self.run_inference(frame)
             
             # Calcular FPS
             fps = 1.0 / inference_time if inference_time > 0 else 0
             
-            # Mostrar información en el frame
-            info_text = f"FPS: {fps:.1f} | Objetos: {sum(current_detections.values())}"
-            cv2.putText(annotated_frame, info_text, (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            
-            return annotated_frame, current_detections
+            return self.annotate_frame(frame, boxes, fps), current_detections
             
         except Exception as e:
             self.log(f"❌ Error en detección: {str(e)}")
@@ -482,42 +555,75 @@ class YOLODetectorGUI:
         ]
         return colors[hash(class_name) % len(colors)]
         
-    def detection_loop(self):
-        """Loop principal de detección"""
-        fps_counter = 0
-        fps_start_time = time.time()
-        
+    def capture_loop(self):
+        """Etapa 1: leer cuadros de la cámara lo más rápido posible"""
         while self.is_running:
             if self.is_paused:
                 time.sleep(0.1)
                 continue
-                
+            
             ret, frame = self.cap.read()
             if not ret:
+                if not self.cap.isOpened():
+                    self.log(f"⏹️ Fin de la fuente de video: {self.cap.resumen()}")
+                    self.root.after(0, self.on_source_end)
+                    break
                 continue
-                
-            self.current_frame = frame.copy()
             
-            # Procesar frame
-            processed_frame, detections = self.detect_objects(frame)
+            # read() espera al siguiente cuadro de la cámara (o al ritmo tiempo-real):
+            # la latencia y la etapa de captura se miden desde que el cuadro está listo
+            capture_time = time.time()
+            self.current_frame = frame
+            
+            # Si la inferencia no alcanzó a tomar el cuadro anterior, se reemplaza
+            self.capture_queue.put((capture_time, frame))
+            self.stage_times['capture'] += time.time() - capture_time
+            self.stage_counts['capture'] += 1
+    
+    def on_source_end(self):
+        """Detener el pipeline y restaurar los controles al terminar la fuente"""
+        self.is_running = False
+        self.is_paused = False
+        self.start_btn.config(text="▶️ Iniciar Detección", state='normal')
+        self.pause_btn.config(text="⏸️ Pausar")
+        self.status_label.config(text="Estado: Fuente de video terminada")
+    
+    def inference_loop(self):
+        """Etapa 2: ejecutar YOLO sobre el cuadro más reciente"""
+        while self.is_running:
+            item = self.capture_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            capture_time, frame = item
+            
+            try:
+                boxes, detections, inference_time = self.run_inference(frame)
+            except Exception as e:
+                self.log(f"❌ Error en detección: {str(e)}")
+                continue
+            
+            self.stage_times['inference'] += inference_time
+            self.stage_counts['inference'] += 1
+            self.render_queue.put((capture_time, frame, boxes, detections, inference_time))
+    
+    def render_loop(self):
+        """Etapa 3: anotar, convertir a Tk y publicar en la GUI"""
+        fps_counter = 0
+        fps_start_time = time.time()
+        last_counts = dict(self.stage_counts)
+        
+        while self.is_running:
+            item = self.render_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            capture_time, frame, boxes, detections, inference_time = item
+            start_time = time.time()
             
             # Actualizar estadísticas
             self.update_detection_stats(detections)
             
-            # Calcular FPS promedio
-            fps_counter += 1
-            if fps_counter >= 10:  # Cada 10 frames
-                elapsed = time.time() - fps_start_time
-                avg_fps = fps_counter / elapsed
-                self.fps_history.append(avg_fps)
-                if len(self.fps_history) > 50:
-                    self.fps_history.pop(0)
-                    
-                fps_counter = 0
-                fps_start_time = time.time()
-                
-                # Actualizar GUI
-                self.root.after(0, self.update_gui_stats, avg_fps, detections)
+            fps = 1.0 / inference_time if inference_time > 0 else 0
+            processed_frame = self.annotate_frame(frame, boxes, fps)
             
             # Mostrar frame
             try:
@@ -525,21 +631,59 @@ class YOLODetectorGUI:
                 self.root.after(0, self.update_video_display, tk_image)
             except Exception as e:
                 self.log(f"❌ Error actualizando display: {str(e)}")
-                
+            
+            now = time.time()
+            self.stage_times['render'] += now - start_time
+            self.stage_counts['render'] += 1
+            self.latency_history.append(now - capture_time)
             self.frame_count += 1
             
+            # Calcular FPS promedio y throughput por etapa
+            fps_counter += 1
+            if fps_counter >= 10:  # Cada 10 frames
+                elapsed = now - fps_start_time
+                avg_fps = fps_counter / elapsed
+                self.fps_history.append(avg_fps)
+                if len(self.fps_history) > 50:
+                    self.fps_history.pop(0)
+                
+                counts = dict(self.stage_counts)
+                throughput = {stage: (counts[stage] - last_counts[stage]) / elapsed for stage in counts}
+                pipeline_stats = {
+                    'latency_ms': 1000 * sum(self.latency_history) / len(self.latency_history),
+                    'throughput': throughput,
+                    'stage_ms': {stage: 1000 * self.stage_times[stage] / max(counts[stage], 1) for stage in counts},
+                    'dropped': self.capture_queue.dropped + self.render_queue.dropped,
+                }
+                last_counts = counts
+                fps_counter = 0
+                fps_start_time = now
+                
+                # Actualizar GUI
+                self.root.after(0, self.update_gui_stats, avg_fps, detections, pipeline_stats)
+    
     def update_detection_stats(self, current_detections):
         """Actualizar estadísticas de detección"""
         for class_name, count in current_detections.items():
             self.detection_stats[class_name] += count
             self.total_detections += count
             
-    def update_gui_stats(self, fps, current_detections):
+    def update_gui_stats(self, fps, current_detections, pipeline_stats=None):
         """Actualizar estadísticas en GUI"""
         # Actualizar labels
         self.fps_label.config(text=f"FPS: {fps:.1f}")
         self.detections_label.config(text=f"Detecciones: {sum(current_detections.values())}")
         
+        if pipeline_stats:
+            throughput = pipeline_stats['throughput']
+            stage_ms = pipeline_stats['stage_ms']
+            self.pipeline_label.config(text=(
+                f"Latencia E2E: {pipeline_stats['latency_ms']:.0f} ms | "
+                f"Descartados: {pipeline_stats['dropped']}\n"
+                f"Captura:    {throughput['capture']:5.1f} fps ({stage_ms['capture']:.1f} ms)\n"
+                f"Inferencia: {throughput['inference']:5.1f} fps ({stage_ms['inference']:.1f} ms)\n"
+                f"Render:     {throughput['render']:5.1f} fps ({stage_ms['render']:.1f} ms)"))
+        
         # Actualizar gráfica de FPS
         if self.fps_history:
             self.ax.clear()
@@ -614,8 +758,11 @@ class YOLODetectorGUI:
 
 def main():
     """Función principal"""
+    parser = argparse.ArgumentParser(description="Detección de objetos en tiempo real con YOLOv8")
+    agregar_argumentos(parser)
+    args = parser.parse_args()
     try:
-        app = YOLODetectorGUI()
+        app = YOLODetectorGUI(args)
         app.run()
     except Exception as e:
         print(f"Error fatal: {str(e)}")
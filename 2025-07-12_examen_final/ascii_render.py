@@ -0,0 +1,109 @@
+"""
+Renderizado ASCII con atlas de glifos.
+
+Cada carácter de la rampa se dibuja con cv2.putText una sola vez, al crear el
+renderizador. Luego cada cuadro se arma indexando el atlas con la grilla de
+brillo cuantizada y reacomodando los bloques con NumPy, sin ninguna llamada
+por celda.
+"""
+
+import cv2
+import numpy as np
+
+# Caracteres de más claro a más oscuro
+RAMPA_ASCII = " .:-=+*#%@"
+
+
+class RenderizadorAscii:
+    """
+    Convierte cuadros BGR en arte ASCII usando un atlas de glifos precalculado.
+
+    Args:
+        rampa: Caracteres ordenados por intensidad
+        ancho_celda: Ancho en píxeles de cada carácter
+        alto_celda: Alto en píxeles de cada carácter
+        color: Color BGR del texto cuando no se usa tinte por celda
+        tintado: Si es True, cada carácter toma el color promedio de su celda
+    """
+
+    def __init__(self, rampa=RAMPA_ASCII, ancho_celda=8, alto_celda=12,
+                 color=(255, 255, 255), tintado=False):
+        self.rampa = rampa
+        self.ancho_celda = ancho_celda
+        self.alto_celda = alto_celda
+        self.color = np.asarray(color, dtype=np.uint8)
+        self.tintado = tintado
+
+        self.atlas = self._construir_atlas()
+
+        # Brillo (0-255) -> índice en la rampa, igual que int(pixel / 255 * (n - 1))
+        n = len(rampa)
+        self._indice_por_brillo = (np.arange(256) * (n - 1) // 255).astype(np.intp)
+
+        # Buffers reutilizados mientras no cambie el tamaño del cuadro
+        self._forma = None
+        self._salida = None
+
+    def _construir_atlas(self):
+        """Rasteriza cada carácter de la rampa en una máscara de 0/1"""
+        escala = self.alto_celda / 12.0
+        base = int(round(self.alto_celda * 10 / 12))
+
+        atlas = np.zeros((len(self.rampa), self.alto_celda, self.ancho_celda), dtype=np.uint8)
+        for i, caracter in enumerate(self.rampa):
+            cv2.putText(atlas[i], caracter, (0, base), cv2.FONT_HERSHEY_PLAIN, escala, 1, 1)
+        return atlas
+
+    def _preparar_buffers(self, forma):
+        if self._forma != forma:
+            self._forma = forma
+            self._salida = np.zeros(forma[:2] + (3,), dtype=np.uint8)
+
+    def render(self, frame, out=None):
+        """
+        Genera la versión ASCII de un cuadro.
+
+        Args:
+            frame: Imagen BGR uint8
+            out: Buffer BGR uint8 del tamaño del cuadro donde se escribe el
+                 resultado; sin él se usa el buffer interno del renderizador
+
+        Returns:
+            Imagen BGR del mismo tamaño que el cuadro de entrada (out, si se
+            dio). El sobrante que no alcanza a formar una celda completa
+            queda en negro.
+        """
+        h, w = frame.shape[:2]
+        filas = h // self.alto_celda
+        columnas = w // self.ancho_celda
+        if out is None:
+            self._preparar_buffers(frame.shape)
+            out = self._salida
+        if filas == 0 or columnas == 0:
+            out[:] = 0
+            return out
+
+        alto_util = filas * self.alto_celda
+        ancho_util = columnas * self.ancho_celda
+
+        # Una muestra por celda, promediando el área que cubre
+        pequeno = cv2.resize(frame, (columnas, filas), interpolation=cv2.INTER_AREA)
+        gris = cv2.cvtColor(pequeno, cv2.COLOR_BGR2GRAY)
+
+        # (filas, columnas, alto, ancho) -> (filas * alto, columnas * ancho)
+        glifos = self.atlas[self._indice_por_brillo[gris]]
+        mascara = glifos.transpose(0, 2, 1, 3).reshape(alto_util, ancho_util)
+
+        # Limpiar el sobrante por si se dibujó encima del cuadro anterior
+        out[alto_util:] = 0
+        out[:, ancho_util:] = 0
+
+        region = out[:alto_util, :ancho_util]
+        if self.tintado:
+            # Cada celda se expande a su bloque de píxeles con vecino más cercano
+            colores = cv2.resize(pequeno, (ancho_util, alto_util), interpolation=cv2.INTER_NEAREST)
+            np.multiply(colores, mascara[..., None], out=region)
+        else:
+            np.multiply(self.color, mascara[..., None], out=region)
+
+        return out
@@ -0,0 +1,92 @@
+"""
+Benchmark de la lógica de gestos sobre una grabación, sin cámara ni MediaPipe.
+
+Reproduce una grabación hecha con `python main.py --grabar sesion.lmk` y, en
+cada cuadro, ejecuta todos los detectores de gestos que usa main.py (inclinación
+y asentimiento de cabeza, pulgar arriba/abajo, conteo de dedos y marco con dos
+manos), sin importar el modo en que estaba la aplicación. Como la entrada es
+siempre la misma, los tiempos son comparables entre versiones del código.
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter, deque
+
+from gestos import (CENTER_POINT_INDEX, contar_dedos_landmarks, detect_head_tilt, detect_nod,
+                    detect_thumb_gesture, get_rectangle_from_two_hands)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.grabacion_landmarks import como_mediapipe, leer_grabacion, reproducir
+
+
+def crear_procesador(grabacion, conteo):
+    """Devuelve la función por cuadro que alimenta los detectores de gestos"""
+    w = grabacion.metadatos.get("ancho", 640)
+    h = grabacion.metadatos.get("alto", 480)
+    x_history = deque(maxlen=20)
+    y_history = deque(maxlen=20)
+    angle_history = deque(maxlen=5)
+
+    # Los resultados estilo MediaPipe se arman antes de medir, igual que en vivo
+    # llegan ya construidos desde face_mesh.process / hands.process
+    caras_por_cuadro = [como_mediapipe(grabacion.landmarks(i, "cara")) for i in range(len(grabacion))]
+    manos_por_cuadro = [como_mediapipe(grabacion.landmarks(i, "manos")) for i in range(len(grabacion))]
+
+    def procesar(indice, t):
+        caras = caras_por_cuadro[indice]
+        manos = manos_por_cuadro[indice]
+
+        if caras:
+            face = caras[0]
+            x_history.append(int(face.landmark[CENTER_POINT_INDEX].x * w))
+            y_history.append(int(face.landmark[CENTER_POINT_INDEX].y * h))
+            angle_history.append(detect_head_tilt(face, w, h))
+            if detect_nod(x_history, y_history):
+                conteo["asentir"] += 1
+            if len(angle_history) == 5 and abs(angle_history[-1] - angle_history[0]) > 20:
+                conteo["inclinar"] += 1
+
+        if manos:
+            for hand_landmarks in manos:
+                gesto = detect_thumb_gesture(hand_landmarks)
+                if gesto is not None:
+                    conteo[f"pulgar_{gesto}"] += 1
+            # contar_dedos_landmarks imprime un aviso si no hay exactamente una mano
+            if len(manos) == 1:
+                conteo[f"dedos_{contar_dedos_landmarks(manos)}"] += 1
+            elif get_rectangle_from_two_hands(manos, w, h) is not None:
+                conteo["marco"] += 1
+
+    return procesar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la lógica de gestos con una grabación")
+    parser.add_argument("grabacion", help="Archivo .lmk grabado con main.py --grabar")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Pasadas sobre la grabación")
+    parser.add_argument("--tiempo-real", action="store_true", help="Respetar los tiempos originales")
+    args = parser.parse_args()
+
+    try:
+        grabacion = leer_grabacion(args.grabacion)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    conteo = Counter()
+    estadisticas = reproducir(grabacion, crear_procesador(grabacion, conteo),
+                              tiempo_real=args.tiempo_real, repeticiones=args.repeticiones)
+
+    print(f"Grabación: {len(grabacion)} cuadros, "
+          f"{int((grabacion.conteos['cara'] > 0).sum())} con cara, "
+          f"{int((grabacion.conteos['manos'] > 0).sum())} con manos")
+    print(f"Lógica de gestos: {estadisticas.resumen()}")
+    print("Gestos detectados (todas las pasadas):")
+    for gesto, cantidad in sorted(conteo.items()):
+        print(f"  {gesto:<12} {cantidad}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Detección de gestos de cara y manos a partir de landmarks de MediaPipe.
+
+Estas funciones solo leen los landmarks (atributos .landmark[i].x/.y/.z), así
+que funcionan igual con los resultados de MediaPipe en vivo que con los de una
+grabación reproducida (ver comun/grabacion_landmarks.py).
+"""
+
+import math
+
+import numpy as np
+
+# Índices de landmarks de la malla facial
+CENTER_POINT_INDEX = 168
+LEFT_EYE = 33
+RIGHT_EYE = 263
+
+
+def get_rectangle_from_two_hands(hand_landmarks_list, image_width, image_height):
+    """
+    Dado landmarks de dos manos, retorna un rectángulo que encierra
+    los puntos clave: índice y pulgar de ambas manos.
+    """
+    if len(hand_landmarks_list) != 2:
+        return None
+
+    keypoints = []
+
+    for hand_landmarks in hand_landmarks_list:
+        # Punta del índice (8) y pulgar (4)
+        index_tip = hand_landmarks.landmark[8]
+        thumb_tip = hand_landmarks.landmark[4]
+
+        x1 = int(index_tip.x * image_width)
+        y1 = int(index_tip.y * image_height)
+        x2 = int(thumb_tip.x * image_width)
+        y2 = int(thumb_tip.y * image_height)
+
+        keypoints.append((x1, y1))
+        keypoints.append((x2, y2))
+
+    # Coordenadas del rectángulo que encierra los 4 puntos
+    xs = [p[0] for p in keypoints]
+    ys = [p[1] for p in keypoints]
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+def detect_nod(x_hist, y_hist):
+    if len(x_hist) < 10:
+        return False
+
+    y = np.array(y_hist, dtype=np.float32)
+    y -= np.mean(y)
+    y_diff = np.diff(y)
+    y_zeros = np.sum(y_diff[1:] * y_diff[:-1] < 0)
+    return y_zeros >= 2 and np.max(np.abs(y)) > 10
+
+def detect_head_tilt(face_landmarks, w, h):
+    left_eye = face_landmarks.landmark[LEFT_EYE]
+    right_eye = face_landmarks.landmark[RIGHT_EYE]
+    x1, y1 = int(left_eye.x * w), int(left_eye.y * h)
+    x2, y2 = int(right_eye.x * w), int(right_eye.y * h)
+    angle = math.degrees(math.atan2(y2 - y1, x2 - x1))
+    return angle
+
+# Función auxiliar para calcular distancia, si no la tienes ya
+def calculate_distance(point1, point2):
+    return math.sqrt((point1.x - point2.x)**2 + (point1.y - point2.y)**2 + (point1.z - point2.z)**2)
+
+def detect_thumb_gesture(hand_landmarks):
+    landmarks = hand_landmarks.landmark
+
+    # Puntos clave para el pulgar
+    thumb_tip = landmarks[4]
+    thumb_ip = landmarks[3]  # Articulación intermedia del pulgar
+    thumb_mcp = landmarks[2] # Nudillo del pulgar
+    wrist = landmarks[0]     # Muñeca
+
+    # Puntos clave para otros dedos (necesarios para la flexión)
+    index_tip = landmarks[8]
+    index_pip = landmarks[7]
+    index_mcp = landmarks[5]
+
+    middle_tip = landmarks[12]
+    middle_pip = landmarks[11]
+    middle_mcp = landmarks[9]
+
+    ring_tip = landmarks[16]
+    ring_pip = landmarks[15]
+    ring_mcp = landmarks[13]
+
+    pinky_tip = landmarks[20]
+    pinky_pip = landmarks[19]
+    pinky_mcp = landmarks[17]
+
+    # --- Lógica para Pulgar Arriba ("up") ---
+    thumb_extended = calculate_distance(thumb_tip, thumb_mcp) > calculate_distance(thumb_ip, thumb_mcp) * 1.5
+    thumb_above_reference = thumb_tip.y < index_mcp.y
+
+    other_fingers_flexed_for_up = True # Renombramos para claridad
+    finger_tips = [index_tip, middle_tip, ring_tip, pinky_tip]
+    finger_mcps = [index_mcp, middle_mcp, ring_mcp, pinky_mcp]
+    finger_pips = [index_pip, middle_pip, ring_pip, pinky_pip]
+
+    for i in range(4):
+        # La punta debe estar cerca de su nudillo (flexionado) Y por debajo de este.
+        # Si la distancia de la punta al nudillo es "grande" O la punta está "arriba" del nudillo, no está flexionado
+        if calculate_distance(finger_tips[i], finger_mcps[i]) > calculate_distance(finger_pips[i], finger_mcps[i]) * 1.2 or \
+           finger_tips[i].y < finger_mcps[i].y: # Simplificado: punta.y debe ser MAYOR que nudillo.y para estar "abajo"
+            other_fingers_flexed_for_up = False
+            break
+
+    if thumb_extended and thumb_above_reference and other_fingers_flexed_for_up:
+        return "up"
+
+    
+    # --- Lógica para Pulgar Hacia Abajo ("down") ---
+    thumb_close_to_palm_x = calculate_distance(thumb_tip, index_mcp) < calculate_distance(thumb_mcp, index_mcp) * 0.6
+    thumb_y_is_low = thumb_tip.y > wrist.y
+
+    is_thumb_down_oriented = thumb_close_to_palm_x
+
+    other_fingers_flexed_for_down = True
+    for i in range(4):
+        if calculate_distance(finger_tips[i], finger_mcps[i]) > calculate_distance(finger_pips[i], finger_mcps[i]) * 1:
+            other_fingers_flexed_for_down = False
+            break
+
+    if thumb_y_is_low and other_fingers_flexed_for_down:
+        return "down"
+
+    return None
+
+def contar_dedos_landmarks(landmarks):
+    if len(landmarks) != 1:
+        print("Debe haber exactamente una mano detectada.")
+        return None
+
+    # Extraer landmarks de la mano
+    hand = landmarks[0].landmark
+
+    dedos_levantados = 0
+
+    # Dedos: índice, medio, anular, meñique
+    dedos_ids = [8, 12, 16, 20]      # Puntas de los dedos
+    nudillos_ids = [6, 10, 14, 18]   # Articulaciones inferiores
+
+    for dedo, nudillo in zip(dedos_ids, nudillos_ids):
+        if hand[dedo].y < hand[nudillo].y:
+            dedos_levantados += 1
+
+    return dedos_levantados
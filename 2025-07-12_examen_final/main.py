@@ -1,20 +1,40 @@
 import cv2
 import mediapipe as mp
 import numpy as np
+import argparse
 import time
-import math
-from collections import deque
+import os
+import sys
+from collections import defaultdict, deque
+from types import SimpleNamespace
+
+import paletas
+from ascii_render import RenderizadorAscii
+from gestos import (CENTER_POINT_INDEX, contar_dedos_landmarks, detect_head_tilt, detect_nod,
+                    detect_thumb_gesture, get_rectangle_from_two_hands)
+from seguimiento_roi import DetectorCompleto, SeguidorRoi
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.grafo_filtros import Cadena, Grises, Bordes, FiltroFuncion
+from comun.grabacion_landmarks import GrabadorLandmarks, landmarks_a_array
+from comun.fuentes_video import agregar_argumentos, abrir_desde_argumentos
 
 # Inicializar MediaPipe
 mp_face_mesh = mp.solutions.face_mesh
 mp_hands = mp.solutions.hands
-face_mesh = mp_face_mesh.FaceMesh(static_image_mode=False)
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=2)
 
-# Constantes y estados
-CENTER_POINT_INDEX = 168
-LEFT_EYE = 33
-RIGHT_EYE = 263
+# Detectores que consume cada modo; los demás no se ejecutan en ese modo.
+# "tomando" solo muestra la cuenta regresiva.
+DETECTORES_POR_MODO = {
+    "inicio": {"manos"},          # pulgar arriba y conteo de dedos
+    "tomando": set(),
+    "confirmar": {"manos"},       # pulgar arriba / abajo
+    "recortar_foto": {"cara", "manos"},  # marco con las manos + asentir
+    "rotar_foto": {"cara", "manos"},     # inclinar la cabeza + pulgar arriba
+}
+SIN_DETECCION = SimpleNamespace(multi_face_landmarks=None, multi_hand_landmarks=None)
+
+# Estados
 rotation_angle = 0
 angle_history = deque(maxlen=5)
 last_tilt_time = 0
@@ -38,127 +58,12 @@ take_photo_cooldown = 3  # segundos de espera antes de capturar
 photo_taken_time = 0
 
 # ------------------------- Funciones de las secciones del programa -------------------------
-def get_rectangle_from_two_hands(hand_landmarks_list, image_width, image_height):
-    """
-    Dado landmarks de dos manos, retorna un rectángulo que encierra
-    los puntos clave: índice y pulgar de ambas manos.
-    """
-    if len(hand_landmarks_list) != 2:
-        return None
-
-    keypoints = []
-
-    for hand_landmarks in hand_landmarks_list:
-        # Punta del índice (8) y pulgar (4)
-        index_tip = hand_landmarks.landmark[8]
-        thumb_tip = hand_landmarks.landmark[4]
-
-        x1 = int(index_tip.x * image_width)
-        y1 = int(index_tip.y * image_height)
-        x2 = int(thumb_tip.x * image_width)
-        y2 = int(thumb_tip.y * image_height)
-
-        keypoints.append((x1, y1))
-        keypoints.append((x2, y2))
-
-    # Coordenadas del rectángulo que encierra los 4 puntos
-    xs = [p[0] for p in keypoints]
-    ys = [p[1] for p in keypoints]
-
-    return min(xs), min(ys), max(xs), max(ys)
-
-def detect_nod(x_hist, y_hist):
-    if len(x_hist) < 10:
-        return False
-
-    y = np.array(y_hist, dtype=np.float32)
-    y -= np.mean(y)
-    y_diff = np.diff(y)
-    y_zeros = np.sum(y_diff[1:] * y_diff[:-1] < 0)
-    return y_zeros >= 2 and np.max(np.abs(y)) > 10
-
-def detect_head_tilt(face_landmarks, w, h):
-    left_eye = face_landmarks.landmark[LEFT_EYE]
-    right_eye = face_landmarks.landmark[RIGHT_EYE]
-    x1, y1 = int(left_eye.x * w), int(left_eye.y * h)
-    x2, y2 = int(right_eye.x * w), int(right_eye.y * h)
-    angle = math.degrees(math.atan2(y2 - y1, x2 - x1))
-    return angle
-
 def apply_rotation(image, angle):
     h, w = image.shape[:2]
     center = (w // 2, h // 2)
     matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
     return cv2.warpAffine(image, matrix, (w, h), flags=cv2.INTER_LINEAR)
 
-# Función auxiliar para calcular distancia, si no la tienes ya
-def calculate_distance(point1, point2):
-    return math.sqrt((point1.x - point2.x)**2 + (point1.y - point2.y)**2 + (point1.z - point2.z)**2)
-
-def detect_thumb_gesture(hand_landmarks):
-    landmarks = hand_landmarks.landmark
-
-    # Puntos clave para el pulgar
-    thumb_tip = landmarks[4]
-    thumb_ip = landmarks[3]  # Articulación intermedia del pulgar
-    thumb_mcp = landmarks[2] # Nudillo del pulgar
-    wrist = landmarks[0]     # Muñeca
-
-    # Puntos clave para otros dedos (necesarios para la flexión)
-    index_tip = landmarks[8]
-    index_pip = landmarks[7]
-    index_mcp = landmarks[5]
-
-    middle_tip = landmarks[12]
-    middle_pip = landmarks[11]
-    middle_mcp = landmarks[9]
-
-    ring_tip = landmarks[16]
-    ring_pip = landmarks[15]
-    ring_mcp = landmarks[13]
-
-    pinky_tip = landmarks[20]
-    pinky_pip = landmarks[19]
-    pinky_mcp = landmarks[17]
-
-    # --- Lógica para Pulgar Arriba ("up") ---
-    thumb_extended = calculate_distance(thumb_tip, thumb_mcp) > calculate_distance(thumb_ip, thumb_mcp) * 1.5
-    thumb_above_reference = thumb_tip.y < index_mcp.y
-
-    other_fingers_flexed_for_up = True # Renombramos para claridad
-    finger_tips = [index_tip, middle_tip, ring_tip, pinky_tip]
-    finger_mcps = [index_mcp, middle_mcp, ring_mcp, pinky_mcp]
-    finger_pips = [index_pip, middle_pip, ring_pip, pinky_pip]
-
-    for i in range(4):
-        # La punta debe estar cerca de su nudillo (flexionado) Y por debajo de este.
-        # Si la distancia de la punta al nudillo es "grande" O la punta está "arriba" del nudillo, no está flexionado
-        if calculate_distance(finger_tips[i], finger_mcps[i]) > calculate_distance(finger_pips[i], finger_mcps[i]) * 1.2 or \
-           finger_tips[i].y < finger_mcps[i].y: # Simplificado: punta.y debe ser MAYOR que nudillo.y para estar "abajo"
-            other_fingers_flexed_for_up = False
-            break
-
-    if thumb_extended and thumb_above_reference and other_fingers_flexed_for_up:
-        return "up"
-
-    
-    # --- Lógica para Pulgar Hacia Abajo ("down") ---
-    thumb_close_to_palm_x = calculate_distance(thumb_tip, index_mcp) < calculate_distance(thumb_mcp, index_mcp) * 0.6
-    thumb_y_is_low = thumb_tip.y > wrist.y
-
-    is_thumb_down_oriented = thumb_close_to_palm_x
-
-    other_fingers_flexed_for_down = True
-    for i in range(4):
-        if calculate_distance(finger_tips[i], finger_mcps[i]) > calculate_distance(finger_pips[i], finger_mcps[i]) * 1:
-            other_fingers_flexed_for_down = False
-            break
-
-    if thumb_y_is_low and other_fingers_flexed_for_down:
-        return "down"
-
-    return None
-
 def draw_rectangle_on_image_pixels(image, x1, y1, x2, y2, color=(0, 255, 0), thickness=3):
     """
     Dibuja un rectángulo directamente sobre la imagen, modificando los píxeles.
@@ -174,72 +79,41 @@ def draw_rectangle_on_image_pixels(image, x1, y1, x2, y2, color=(0, 255, 0), thi
 
 
 # --------------------- filtros de imagen ---------------------
-def contar_dedos_landmarks(landmarks):
-    if len(landmarks) != 1:
-        print("Debe haber exactamente una mano detectada.")
-        return None
-
-    # Extraer landmarks de la mano
-    hand = landmarks[0].landmark
-
-    dedos_levantados = 0
-
-    # Dedos: índice, medio, anular, meñique
-    dedos_ids = [8, 12, 16, 20]      # Puntas de los dedos
-    nudillos_ids = [6, 10, 14, 18]   # Articulaciones inferiores
-
-    for dedo, nudillo in zip(dedos_ids, nudillos_ids):
-        if hand[dedo].y < hand[nudillo].y:
-            dedos_levantados += 1
-
-    return dedos_levantados
-
 # Filtro game boy
-def quantize(img, palette):
-    img = img.astype(np.float32)
-    result = np.zeros_like(img)
-    for y in range(img.shape[0]):
-        for x in range(img.shape[1]):
-            pixel = img[y, x]
-            distances = [np.linalg.norm(pixel - np.array(c)) for c in palette]
-            nearest_color = palette[np.argmin(distances)]
-            result[y, x] = nearest_color
-    return result.astype(np.uint8)
-def apply_gameboy_filter(frame):
-    palette = [(15, 56, 15), (48, 98, 48), (139, 172, 15), (155, 188, 15)]
-
-    scale = 0.1
+def quantize(img, palette, out=None):
+    # La tabla de búsqueda de cada paleta se calcula una sola vez (ver paletas.py)
+    return paletas.cuantizar(img, palette, out)
+def apply_gameboy_filter(frame, palette="gameboy", scale=0.1, dst=None):
+    # scale < 1 pixela la imagen para el efecto retro; con scale=1.0 se cuantiza
+    # a resolución completa. Con dst, el resultado se escribe en ese buffer
+    if scale == 1.0:
+        return quantize(frame, palette, dst)
+
     small = cv2.resize(frame, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_NEAREST)
     quantized = quantize(small, palette)
-    result = cv2.resize(quantized, (frame.shape[1], frame.shape[0]), interpolation=cv2.INTER_NEAREST)
-    return result
-
-# Filtro edges
-def apply_edges_filter(frame):
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    edges = cv2.Canny(gray, 50, 150)
-    return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
+    return cv2.resize(quantized, (frame.shape[1], frame.shape[0]), dst=dst, interpolation=cv2.INTER_NEAREST)
 
 # Filtro ascii
-def apply_ascii_filter(frame):
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+# El atlas de glifos se construye una vez; cada cuadro solo indexa el atlas
+ascii_renderer = RenderizadorAscii(ancho_celda=8, alto_celda=12)
 
-    # Caracteres de más claro a más oscuro
-    chars = np.asarray(list(" .:-=+*#%@"))
-    scale = 0.1
-    small = cv2.resize(gray, (0, 0), fx=scale, fy=scale)
-    h, w = small.shape
+def apply_ascii_filter(frame, dst=None):
+    return ascii_renderer.render(frame, dst)
 
-    ascii_img = np.zeros((h * 12, w * 8, 3), dtype=np.uint8)  # cada carácter ~8x12 px
-    for y in range(h):
-        for x in range(w):
-            pixel = small[y, x]
-            idx = int(pixel / 255 * (len(chars) - 1))
-            char = chars[idx]
+# Cadenas de filtros: reutilizan sus buffers entre cuadros y miden el tiempo de cada etapa
+def crear_filtros(escala_gameboy=0.1):
+    return {
+        "gameboy": Cadena([FiltroFuncion("gameboy", lambda src, dst: apply_gameboy_filter(
+            src, scale=escala_gameboy, dst=dst))]),
+        "ascii": Cadena([FiltroFuncion("ascii", lambda src, dst: apply_ascii_filter(src, dst))]),
+        "edges": Cadena([Grises(), Bordes(50, 150)]),
+    }
 
-            cv2.putText(ascii_img, char, (x * 8, y * 12 + 10), cv2.FONT_HERSHEY_PLAIN, 1, (255, 255, 255), 1)
-
-    return ascii_img
+def apply_filter(frame, name):
+    pipeline = filter_pipelines.get(name)
+    if pipeline is None:
+        return frame
+    return pipeline.procesar(frame)
 
 
 
@@ -255,20 +129,111 @@ def apply_ascii_filter(frame):
 
 # --------------------- Programa principal ---------------------
 
-# Cámara
-cap = cv2.VideoCapture(0)
+parser = argparse.ArgumentParser(description="Interacción visual con gestos de cara y manos")
+parser.add_argument("--grabar", metavar="RUTA",
+                    help="Graba los landmarks de la sesión (.lmk) para reproducirlos con benchmark_gestos.py")
+parser.add_argument("--escala-cuadros", type=float, default=None,
+                    help="Guarda también cada cuadro reducido a esta escala en la grabación")
+parser.add_argument("--sin-roi", action="store_true",
+                    help="Detectar cara y manos siempre sobre el cuadro completo")
+parser.add_argument("--intervalo-completo", type=int, default=15,
+                    help="Cada cuántos cuadros se busca en el cuadro completo aunque haya seguimiento")
+parser.add_argument("--escala-gameboy", type=float, default=0.1,
+                    help="Escala a la que se cuantiza el filtro Gameboy (por defecto, 0.1: pixelado; "
+                         "1 = paleta a resolución completa)")
+agregar_argumentos(parser)
+args = parser.parse_args()
+if not 0 < args.escala_gameboy <= 1:
+    parser.error("--escala-gameboy debe estar en (0, 1]")
+filter_pipelines = crear_filtros(args.escala_gameboy)
+
+# Detectores: sobre la ROI de la última detección, o siempre sobre el cuadro completo
+crear_face_mesh = lambda: mp_face_mesh.FaceMesh(static_image_mode=False)
+crear_hands = lambda: mp_hands.Hands(static_image_mode=False, max_num_hands=2)
+if args.sin_roi:
+    face_mesh = DetectorCompleto(crear_face_mesh, "multi_face_landmarks")
+    hands = DetectorCompleto(crear_hands, "multi_hand_landmarks")
+else:
+    face_mesh = SeguidorRoi(crear_face_mesh, "multi_face_landmarks", intervalo_completo=args.intervalo_completo)
+    hands = SeguidorRoi(crear_hands, "multi_hand_landmarks", intervalo_completo=args.intervalo_completo)
+
+# Cámara (o video, carpeta de imágenes o escena sintética)
+cap = abrir_desde_argumentos(args)
+
+# Tiempo de procesamiento por modo: [segundos, cuadros]. Mostrar ventanas,
+# esperar teclas y las pausas de confirmación no cuentan: se acumulan en
+# tiempo_fuera y se restan del tiempo del cuadro
+tiempos_modo = defaultdict(lambda: [0.0, 0])
+modo_cuadro = None
+inicio_cuadro = 0.0
+tiempo_fuera = 0.0
+
+def fuera_de_medicion(funcion, *argumentos):
+    global tiempo_fuera
+    inicio = time.perf_counter()
+    resultado = funcion(*argumentos)
+    tiempo_fuera += time.perf_counter() - inicio
+    return resultado
+
+def mostrar(ventana, imagen):
+    fuera_de_medicion(cv2.imshow, ventana, imagen)
+
+def cerrar_ventana(ventana):
+    fuera_de_medicion(cv2.destroyWindow, ventana)
+
+def pausar(segundos):
+    fuera_de_medicion(time.sleep, segundos)
+
+def leer_tecla():
+    return fuera_de_medicion(cv2.waitKey, 1) & 0xFF
+
+# Una cara de 468 puntos y hasta dos manos de 21 puntos, en x, y, z
+grabador = None
+if args.grabar:
+    grabador = GrabadorLandmarks(args.grabar, {"cara": (1, 468, 3), "manos": (2, 21, 3)},
+                                 escala_imagen=args.escala_cuadros,
+                                 metadatos={"ancho": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                            "alto": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))})
 
 while True:
+    if modo_cuadro is not None:
+        tiempos_modo[modo_cuadro][0] += time.perf_counter() - inicio_cuadro - tiempo_fuera
+        tiempos_modo[modo_cuadro][1] += 1
+
     ret, frame = cap.read()
     if not ret:
         break
+    inicio_cuadro = time.perf_counter()
+    tiempo_fuera = 0.0
+    modo_cuadro = mode
 
     frame = cv2.flip(frame, 1)
     h, w, _ = frame.shape
     frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
-    results_face = face_mesh.process(frame_rgb)
-    results_hands = hands.process(frame_rgb)
+    # Al grabar se ejecutan ambos detectores para que la grabación quede completa
+    detectores = {"cara", "manos"} if grabador is not None else DETECTORES_POR_MODO.get(mode, {"cara", "manos"})
+    if "cara" in detectores:
+        results_face = face_mesh.procesar(frame_rgb)
+    else:
+        results_face = SIN_DETECCION
+        face_mesh.olvidar()
+        # Sin la cara, el historial de posiciones queda viejo: asentir o inclinar
+        # se evalúa solo con cuadros seguidos
+        x_history.clear()
+        y_history.clear()
+        timestamps.clear()
+        angle_history.clear()
+    if "manos" in detectores:
+        results_hands = hands.procesar(frame_rgb)
+    else:
+        results_hands = SIN_DETECCION
+        hands.olvidar()
+
+    if grabador is not None:
+        grabador.agregar({"cara": landmarks_a_array(results_face.multi_face_landmarks),
+                          "manos": landmarks_a_array(results_hands.multi_hand_landmarks)}, frame,
+                         cap.tiempo_cuadro)
 
     if results_face.multi_face_landmarks:
         face = results_face.multi_face_landmarks[0]
@@ -282,8 +247,10 @@ while True:
         angle = detect_head_tilt(face, w, h)
         angle_history.append(angle)
 
-        now = time.time()
+    now = time.time()
 
+    # Los modos que usan la cara esperan a detectarla; los demás siguen sin ella
+    if results_face.multi_face_landmarks or "cara" not in detectores:
         if mode == "inicio":
             cv2.putText(frame, "Pulgar arriba para tomar foto", (50, 50),
                 cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 2)
@@ -309,31 +276,21 @@ while True:
                         elif dedos_arriba == 4:
                             filtro = "edges"
             
-            if filtro == "gameboy":
-                frame = apply_gameboy_filter(frame)
-            if filtro == "ascii":
-                frame = apply_ascii_filter(frame)
-            if filtro == "edges":
-                frame = apply_edges_filter(frame)
-            cv2.imshow("Interacción Visual", frame)
+            frame = apply_filter(frame, filtro)
+            mostrar("Interacción Visual", frame)
         # --- Modo TOMANDO FOTO ---
         elif mode == "tomando":
-            if filtro == "gameboy":
-                frame = apply_gameboy_filter(frame)
-            if filtro == "ascii":
-                frame = apply_ascii_filter(frame)
-            if filtro == "edges":
-                frame = apply_edges_filter(frame)
+            frame = apply_filter(frame, filtro)
 
             elapsed = time.time() - photo_taken_time
             countdown = take_photo_cooldown - int(elapsed)
             if countdown > 0:
                 cv2.putText(frame, f"Tomando foto en {countdown}s", (50, 100),
                             cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 200, 255), 3)
-                cv2.imshow("Interacción Visual", frame)
+                mostrar("Interacción Visual", frame)
             else:
                 captured_photo = frame.copy()
-                cv2.destroyWindow("Interacción Visual")
+                cerrar_ventana("Interacción Visual")
                 mode = "confirmar"
         elif mode == "confirmar" and captured_photo is not None:
             combined = np.hstack((frame, captured_photo))
@@ -344,7 +301,7 @@ while True:
             cv2.putText(combined, "Foto", (w + w // 2 - 50, h - 10),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.8, (100, 255, 100), 2)
 
-            cv2.imshow("Confirmar", combined)
+            mostrar("Confirmar", combined)
 
             if results_hands.multi_hand_landmarks:
                 for hand_landmarks in results_hands.multi_hand_landmarks:
@@ -353,15 +310,15 @@ while True:
                     if detect_thumb_gesture(hand_landmarks) == "up":
                         mode = "recortar_foto"
                         ask_continue = False
-                        time.sleep(0.5)
+                        pausar(0.5)
                         last_thumbs_up_time = time.time()
-                        cv2.destroyWindow("Confirmar")
+                        cerrar_ventana("Confirmar")
                     elif detect_thumb_gesture(hand_landmarks) == "down":
                         mode = "inicio"
                         captured_photo = None
-                        time.sleep(0.5)
+                        pausar(0.5)
                         last_thumbs_down_time = time.time()
-                        cv2.destroyWindow("Confirmar")
+                        cerrar_ventana("Confirmar")
 
         elif mode == "rotar_foto" and captured_photo is not None:
             if len(angle_history) == 5:
@@ -387,7 +344,6 @@ while True:
                                 final_image = apply_rotation(captured_photo, rotation_angle)
 
                                 # Crear carpeta resultados/ si no existe
-                                import os
                                 output_dir = "resultados"
                                 os.makedirs(output_dir, exist_ok=True)
 
@@ -429,8 +385,8 @@ while True:
             combined = np.hstack((frame, rotated_photo))
             cv2.putText(combined, "Inclina cabeza para rotar foto", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
             cv2.putText(combined, "Pulgar arriba para guardar", (50, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
-            cv2.imshow("Interacción Visual", combined)
-            key = cv2.waitKey(1) & 0xFF
+            mostrar("Interacción Visual", combined)
+            key = leer_tecla()
             if key == 27:
                 break
             continue
@@ -444,7 +400,7 @@ while True:
                 captured_photo = captured_photo[y1:y2, x1:x2]
 
                 last_nod_time = now
-                time.sleep(1)
+                pausar(1)
                 photo_taken = True
                 ask_continue = True
                 mode = "rotar_foto"
@@ -507,23 +463,34 @@ while True:
             cv2.putText(combined, "Haz marco con ambas manos - Asiente con la cabeza para confirmar", (50, 50),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
             
-            cv2.imshow("Interacción Visual", combined)
-            key = cv2.waitKey(1) & 0xFF
+            mostrar("Interacción Visual", combined)
+            key = leer_tecla()
             if key == 27:
                 break
             continue
 
     cv2.putText(frame, f"Modo: {mode}", (30, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
 
-    key = cv2.waitKey(1) & 0xFF
+    key = leer_tecla()
     if key == ord('r'):
         mode = "inicio"
         rotation_angle = 0
         captured_photo = None
         photo_taken = False
         ask_continue = False
+    elif key == ord('t') and filtro in filter_pipelines:
+        print(f"Tiempos del filtro {filtro}:")
+        print(filter_pipelines[filtro].reporte_texto())
     elif key == 27:
         break
 
 cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+cv2.destroyAllWindows()
+print(f"Fuente: {cap.resumen()}")
+print(f"Cara:  {face_mesh.reporte()}")
+print(f"Manos: {hands.reporte()}")
+for modo, (segundos, cuadros) in tiempos_modo.items():
+    print(f"Modo {modo:<14} {1000 * segundos / cuadros:6.1f} ms por cuadro ({cuadros} cuadros)")
+if grabador is not None:
+    grabador.cerrar()
+    print(f"Grabación guardada en {args.grabar} ({grabador.cuadros} cuadros)")
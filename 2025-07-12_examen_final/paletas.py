@@ -0,0 +1,128 @@
+"""
+Cuantización de color por paletas usando tablas de búsqueda (LUT) 3D.
+
+En lugar de calcular, para cada píxel, la distancia a todos los colores de la
+paleta, se precalcula una sola vez una tabla de BINS x BINS x BINS celdas con el
+color más cercano al centro de cada celda. Cuantizar un cuadro completo se
+reduce a un desplazamiento de bits y una indexación avanzada de NumPy.
+"""
+
+import numpy as np
+
+# Paletas retro disponibles (en el mismo orden de canales que la imagen, BGR)
+PALETAS = {
+    "gameboy": [(15, 56, 15), (48, 98, 48), (139, 172, 15), (155, 188, 15)],
+    "gameboy_pocket": [(0, 0, 0), (85, 85, 85), (170, 170, 170), (255, 255, 255)],
+    "cga": [(0, 0, 0), (255, 255, 85), (255, 85, 255), (255, 255, 255)],
+    "sepia": [(20, 33, 44), (54, 84, 112), (98, 140, 178), (173, 206, 233)],
+}
+
+
+def construir_lut(paleta, bins=32):
+    """
+    Construye la tabla de búsqueda 3D para una paleta.
+
+    Args:
+        paleta: Lista de colores (tuplas de 3 enteros entre 0 y 255)
+        bins: Número de celdas por canal, debe ser potencia de 2 entre 2 y 256
+
+    Returns:
+        lut: Array uint8 de forma (bins * bins * bins, 3) con el color de la
+             paleta asignado a cada celda, aplanado para indexar con un entero
+    """
+    if bins < 2 or bins > 256 or bins & (bins - 1):
+        raise ValueError(f"bins debe ser potencia de 2 entre 2 y 256, se recibió {bins}")
+
+    colores = np.asarray(paleta, dtype=np.float32).reshape(-1, 3)
+
+    # Centro de cada celda en el rango 0-255
+    centros = (np.arange(bins, dtype=np.float32) + 0.5) * (256.0 / bins)
+    c0, c1, c2 = np.meshgrid(centros, centros, centros, indexing="ij")
+    grilla = np.stack((c0, c1, c2), axis=-1).reshape(-1, 1, 3)
+
+    # Distancia al cuadrado de cada celda a cada color de la paleta
+    distancias = np.sum((grilla - colores[None, :, :]) ** 2, axis=-1)
+    indices = np.argmin(distancias, axis=1)
+
+    return colores[indices].astype(np.uint8)
+
+
+class RegistroPaletas:
+    """
+    Registro de paletas con caché de sus tablas de búsqueda.
+
+    Las tablas se construyen la primera vez que se usan y se reutilizan en los
+    cuadros siguientes, así cambiar de paleta no obliga a recalcular nada.
+    """
+
+    def __init__(self, bins=32):
+        # construir_lut valida bins al crear la primera tabla
+        self.bins = bins
+        self.desplazamiento = 9 - int(bins).bit_length()
+        self.paletas = {}
+        self._luts = {}
+
+        for nombre, colores in PALETAS.items():
+            self.registrar(nombre, colores)
+
+    def registrar(self, nombre, colores):
+        """Registra (o reemplaza) una paleta e invalida su tabla en caché"""
+        self.paletas[nombre] = [tuple(int(v) for v in c) for c in colores]
+        self._luts.pop(nombre, None)
+
+    def obtener_lut(self, paleta):
+        """
+        Devuelve la tabla de búsqueda de una paleta, construyéndola si hace falta.
+
+        Args:
+            paleta: Nombre de una paleta registrada o lista de colores. Las
+                    listas se registran automáticamente con su propio contenido
+                    como clave.
+        """
+        if isinstance(paleta, str):
+            nombre = paleta
+            if nombre not in self.paletas:
+                raise KeyError(f"Paleta no registrada: {nombre}")
+        else:
+            nombre = tuple(tuple(int(v) for v in c) for c in paleta)
+            if nombre not in self.paletas:
+                self.registrar(nombre, nombre)
+
+        lut = self._luts.get(nombre)
+        if lut is None:
+            lut = construir_lut(self.paletas[nombre], self.bins)
+            self._luts[nombre] = lut
+        return lut
+
+    def cuantizar(self, img, paleta="gameboy", out=None):
+        """
+        Reemplaza cada píxel de una imagen de 3 canales por el color más
+        cercano de la paleta, en una sola pasada vectorizada.
+
+        Args:
+            img: Imagen uint8 de forma (alto, ancho, 3)
+            paleta: Nombre de una paleta registrada o lista de colores
+            out: Buffer uint8 (alto, ancho, 3) opcional donde se escribe el resultado
+
+        Returns:
+            Imagen uint8 cuantizada del mismo tamaño (out, si se dio)
+        """
+        lut = self.obtener_lut(paleta)
+        d = self.desplazamiento
+        b = 8 - d
+
+        # Índice plano de la celda: (c0 << 2b) | (c1 << b) | c2
+        celdas = (img[..., 0] >> d).astype(np.int32) << (2 * b)
+        celdas |= (img[..., 1] >> d).astype(np.int32) << b
+        celdas |= img[..., 2] >> d
+
+        return np.take(lut, celdas, axis=0, out=out)
+
+
+# Registro compartido por defecto
+registro = RegistroPaletas()
+
+
+def cuantizar(img, paleta="gameboy", out=None):
+    """Cuantiza una imagen con el registro compartido"""
+    return registro.cuantizar(img, paleta, out)
@@ -0,0 +1,210 @@
+"""
+Seguimiento de cara y manos por región de interés (ROI).
+
+Correr FaceMesh y Hands sobre el cuadro completo en cada iteración es lo más
+caro del ciclo principal. SeguidorRoi ejecuta el detector sobre el cuadro
+completo solo cuando no hay nada que seguir, cuando el seguimiento se pierde
+o cada `intervalo_completo` cuadros (para descubrir una segunda mano o una
+cara que entra). En los demás cuadros recorta un cuadrado alrededor de los
+últimos landmarks conocidos, con margen, lo reduce a `lado` x `lado` píxeles y
+ejecuta sobre ese recorte una segunda instancia del detector. Los landmarks
+del recorte se convierten de vuelta a coordenadas normalizadas del cuadro
+completo, así que la lógica de gestos no cambia.
+
+El recorte siempre tiene el mismo tamaño de entrada y queda centrado en lo que
+se sigue, por eso la instancia del recorte puede trabajar en modo video
+(static_image_mode=False) igual que la del cuadro completo.
+
+Los grafos de MediaPipe se crean la primera vez que se usan: un detector que
+el modo actual no necesita no cuesta nada al arrancar.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+
+class _Perezoso:
+    """Crea el detector con crear_detector() la primera vez que se llama a process()"""
+
+    def __init__(self, crear_detector):
+        self.crear_detector = crear_detector
+        self.detector = None
+        self.tiempo_creacion = 0.0
+
+    def process(self, imagen):
+        if self.detector is None:
+            inicio = time.perf_counter()
+            self.detector = self.crear_detector()
+            self.tiempo_creacion = time.perf_counter() - inicio
+        return self.detector.process(imagen)
+
+    def close(self):
+        if self.detector is not None:
+            self.detector.close()
+            self.detector = None
+
+
+class SeguidorRoi:
+    """
+    Ejecuta un detector de MediaPipe sobre el cuadro completo o sobre la ROI.
+
+    Args:
+        crear_detector: Función sin argumentos que crea una instancia del
+                        detector (se crean dos: cuadro completo y recorte)
+        atributo: Atributo del resultado con la lista de landmarks
+                  ("multi_face_landmarks" o "multi_hand_landmarks")
+        margen: Margen alrededor de los landmarks, como fracción del lado mayor
+        intervalo_completo: Cada cuántos cuadros se fuerza el cuadro completo
+        lado: Lado en píxeles del recorte que recibe el detector
+        max_fraccion: Si la ROI cubre más que esta fracción del lado menor del
+                      cuadro, recortar no ahorra nada y se usa el cuadro completo
+    """
+
+    def __init__(self, crear_detector, atributo, margen=0.35, intervalo_completo=15, lado=256,
+                 max_fraccion=0.8):
+        self.atributo = atributo
+        self.margen = margen
+        self.intervalo_completo = intervalo_completo
+        self.lado = lado
+        self.max_fraccion = max_fraccion
+
+        self.completo = _Perezoso(crear_detector)
+        self.recorte = _Perezoso(crear_detector)
+        self._buffer = np.empty((lado, lado, 3), dtype=np.uint8)
+
+        self.caja = None  # (x_min, y_min, x_max, y_max) normalizada de los últimos landmarks
+        self.desde_completo = 0
+
+        self.cuadros_completos = 0
+        self.cuadros_recorte = 0
+        self.perdidas = 0
+        self.tiempo = 0.0
+
+    # --- ROI ---
+
+    def _caja_de(self, lista):
+        minimos = [1.0, 1.0]
+        maximos = [0.0, 0.0]
+        for landmarks in lista:
+            xs = [p.x for p in landmarks.landmark]
+            ys = [p.y for p in landmarks.landmark]
+            minimos = [min(minimos[0], min(xs)), min(minimos[1], min(ys))]
+            maximos = [max(maximos[0], max(xs)), max(maximos[1], max(ys))]
+        return minimos[0], minimos[1], maximos[0], maximos[1]
+
+    def _cuadrado(self, ancho, alto):
+        """Cuadrado (x0, y0, lado) en píxeles alrededor de la caja, dentro del cuadro, o None"""
+        x_min, y_min, x_max, y_max = self.caja
+        lado = max((x_max - x_min) * ancho, (y_max - y_min) * alto) * (1 + 2 * self.margen)
+        if lado > self.max_fraccion * min(ancho, alto):
+            return None
+        lado = int(max(lado, 32))
+        cx = (x_min + x_max) / 2 * ancho
+        cy = (y_min + y_max) / 2 * alto
+        x0 = int(min(max(cx - lado / 2, 0), ancho - lado))
+        y0 = int(min(max(cy - lado / 2, 0), alto - lado))
+        return x0, y0, lado
+
+    def _a_cuadro_completo(self, lista, x0, y0, lado, ancho, alto):
+        """Convierte landmarks normalizados del recorte a normalizados del cuadro completo"""
+        escala_x = lado / ancho
+        escala_y = lado / alto
+        desplazamiento_x = x0 / ancho
+        desplazamiento_y = y0 / alto
+        for landmarks in lista:
+            for p in landmarks.landmark:
+                p.x = desplazamiento_x + p.x * escala_x
+                p.y = desplazamiento_y + p.y * escala_y
+                p.z = p.z * escala_x  # z está en la escala del ancho de la imagen
+
+    def olvidar(self):
+        """Descarta la ROI; se llama cuando el detector deja de ejecutarse por varios cuadros"""
+        self.caja = None
+
+    # --- Ciclo ---
+
+    def _detectar_completo(self, frame_rgb):
+        self.cuadros_completos += 1
+        self.desde_completo = 0
+        return self.completo.process(frame_rgb)
+
+    def procesar(self, frame_rgb):
+        """
+        Detecta sobre el cuadro completo o sobre la ROI.
+
+        Returns:
+            El resultado del detector, con los landmarks siempre en
+            coordenadas normalizadas del cuadro completo
+        """
+        inicio = time.perf_counter()
+        alto, ancho = frame_rgb.shape[:2]
+        self.desde_completo += 1
+
+        cuadrado = None
+        if self.caja is not None and self.desde_completo < self.intervalo_completo:
+            cuadrado = self._cuadrado(ancho, alto)
+
+        if cuadrado is None:
+            resultado = self._detectar_completo(frame_rgb)
+        else:
+            x0, y0, lado = cuadrado
+            cv2.resize(frame_rgb[y0:y0 + lado, x0:x0 + lado], (self.lado, self.lado),
+                       dst=self._buffer, interpolation=cv2.INTER_AREA)
+            resultado = self.recorte.process(self._buffer)
+            if getattr(resultado, self.atributo):
+                self.cuadros_recorte += 1
+                self._a_cuadro_completo(getattr(resultado, self.atributo), x0, y0, lado, ancho, alto)
+            else:
+                # Se perdió el seguimiento: se busca en el cuadro completo en este mismo cuadro
+                self.perdidas += 1
+                resultado = self._detectar_completo(frame_rgb)
+
+        lista = getattr(resultado, self.atributo)
+        self.caja = self._caja_de(lista) if lista else None
+        self.tiempo += time.perf_counter() - inicio
+        return resultado
+
+    def reporte(self):
+        cuadros = self.cuadros_completos + self.cuadros_recorte
+        if not cuadros:
+            return "Sin cuadros procesados"
+        creacion = self.completo.tiempo_creacion + self.recorte.tiempo_creacion
+        return (f"{1000 * (self.tiempo - creacion) / cuadros:.1f} ms por cuadro, "
+                f"{self.cuadros_recorte} con ROI y {self.cuadros_completos} completos "
+                f"({self.perdidas} por pérdida de seguimiento), creación {creacion:.2f} s")
+
+    def close(self):
+        self.completo.close()
+        self.recorte.close()
+
+
+class DetectorCompleto:
+    """Misma interfaz que SeguidorRoi, pero siempre sobre el cuadro completo (para comparar)"""
+
+    def __init__(self, crear_detector, atributo):
+        self.detector = _Perezoso(crear_detector)
+        self.atributo = atributo
+        self.cuadros = 0
+        self.tiempo = 0.0
+
+    def procesar(self, frame_rgb):
+        inicio = time.perf_counter()
+        resultado = self.detector.process(frame_rgb)
+        self.tiempo += time.perf_counter() - inicio
+        self.cuadros += 1
+        return resultado
+
+    def reporte(self):
+        if not self.cuadros:
+            return "Sin cuadros procesados"
+        creacion = self.detector.tiempo_creacion
+        return (f"{1000 * (self.tiempo - creacion) / self.cuadros:.1f} ms por cuadro, "
+                f"{self.cuadros} completos, creación {creacion:.2f} s")
+
+    def olvidar(self):
+        pass
+
+    def close(self):
+        self.detector.close()
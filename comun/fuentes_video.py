@@ -0,0 +1,376 @@
+"""
+Fuentes de cuadros intercambiables: cámara, archivo de video, carpeta de
+imágenes o generador sintético.
+
+Todas se abren con abrir_fuente() y se usan como un cv2.VideoCapture (read,
+isOpened, get, set, release), así que los programas en vivo pueden procesar
+video grabado sin cambiar su ciclo principal. Eso permite medir los pipelines
+de detección en un servidor sin cámara.
+
+La decodificación corre en un hilo aparte que llena un buffer acotado:
+
+- Cámara: importa el cuadro más reciente. read() entrega el último cuadro
+  capturado y descarta los anteriores que el programa no alcanzó a consumir,
+  y su marca de tiempo es la de la captura, no la de la lectura.
+- Video, imágenes y sintético: el hilo espera cuando el buffer está lleno, así
+  que no se pierde ningún cuadro. Con ritmo TIEMPO_REAL, read() entrega los
+  cuadros a los FPS de la fuente; con ritmo MAXIMO, tan rápido como se
+  consuman.
+
+Especificaciones aceptadas por abrir_fuente():
+
+    "0", "1", ...                  índice de cámara
+    "video.mp4", "rtsp://..."      archivo o flujo de video
+    "carpeta/"                     imágenes .jpg/.jpeg/.png/.bmp en orden alfabético
+    "sintetico[:ANCHOxALTO[:CUADROS]]"  escena generada (sin límite si no se da CUADROS)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+TIEMPO_REAL = "tiempo-real"
+MAXIMO = "maximo"
+RITMOS = (TIEMPO_REAL, MAXIMO)
+
+EXTENSIONES_IMAGEN = (".jpg", ".jpeg", ".png", ".bmp")
+FPS_POR_DEFECTO = 30.0
+
+
+# ----------------------- Productores -----------------------
+# Cada productor entrega cuadros BGR con leer() (None al terminar) y se usa
+# solo desde el hilo de decodificación.
+
+class _ProductorCaptura:
+    """Cámara o archivo de video a través de cv2.VideoCapture"""
+
+    def __init__(self, origen, en_vivo):
+        self.cap = cv2.VideoCapture(origen)
+        self.en_vivo = en_vivo
+
+    def abierto(self):
+        return self.cap.isOpened()
+
+    def leer(self):
+        ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def reiniciar(self):
+        return not self.en_vivo and self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def get(self, propiedad):
+        return self.cap.get(propiedad)
+
+    def set(self, propiedad, valor):
+        return self.cap.set(propiedad, valor)
+
+    def fps(self):
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        return fps if fps and fps > 0 else FPS_POR_DEFECTO
+
+    def liberar(self):
+        self.cap.release()
+
+
+class _ProductorImagenes:
+    """Imágenes de una carpeta, en orden alfabético"""
+    en_vivo = False
+
+    def __init__(self, carpeta, fps):
+        self.rutas = sorted(os.path.join(carpeta, nombre) for nombre in os.listdir(carpeta)
+                            if nombre.lower().endswith(EXTENSIONES_IMAGEN))
+        self._fps = fps or FPS_POR_DEFECTO
+        self.indice = 0
+        self.forma = None
+        if self.rutas:
+            primera = cv2.imread(self.rutas[0])
+            self.forma = None if primera is None else primera.shape
+
+    def abierto(self):
+        return self.forma is not None
+
+    def leer(self):
+        while self.indice < len(self.rutas):
+            frame = cv2.imread(self.rutas[self.indice])
+            self.indice += 1
+            if frame is not None:
+                return frame
+        return None
+
+    def reiniciar(self):
+        self.indice = 0
+        return True
+
+    def get(self, propiedad):
+        if propiedad == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.forma[1]) if self.forma else 0.0
+        if propiedad == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.forma[0]) if self.forma else 0.0
+        if propiedad == cv2.CAP_PROP_FPS:
+            return self._fps
+        if propiedad == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.rutas))
+        return 0.0
+
+    def set(self, propiedad, valor):
+        return False
+
+    def fps(self):
+        return self._fps
+
+    def liberar(self):
+        pass
+
+
+class _ProductorSintetico:
+    """
+    Escena generada: fondo con degradado, un círculo y un rectángulo que se
+    mueven y el número de cuadro. Sirve para medir sin depender de archivos.
+    """
+    en_vivo = False
+
+    def __init__(self, ancho=640, alto=480, cuadros=None, fps=None):
+        self.ancho, self.alto = ancho, alto
+        self.cuadros = cuadros
+        self._fps = fps or FPS_POR_DEFECTO
+        self.indice = 0
+
+        columnas = np.linspace(0, 255, ancho, dtype=np.float32)
+        filas = np.linspace(0, 255, alto, dtype=np.float32)[:, None]
+        self.fondo = np.empty((alto, ancho, 3), dtype=np.uint8)
+        self.fondo[..., 0] = columnas
+        self.fondo[..., 1] = filas
+        self.fondo[..., 2] = 128
+
+    def abierto(self):
+        return True
+
+    def leer(self):
+        if self.cuadros is not None and self.indice >= self.cuadros:
+            return None
+        i = self.indice
+        self.indice += 1
+
+        frame = self.fondo.copy()
+        fase = 2 * np.pi * i / 120
+        cx = int(self.ancho * (0.5 + 0.35 * np.cos(fase)))
+        cy = int(self.alto * (0.5 + 0.35 * np.sin(fase)))
+        cv2.circle(frame, (cx, cy), max(8, self.alto // 10), (0, 0, 255), -1)
+        x = int((i * 4) % max(1, self.ancho - self.ancho // 6))
+        cv2.rectangle(frame, (x, self.alto // 8), (x + self.ancho // 6, self.alto // 4), (255, 255, 255), -1)
+        cv2.putText(frame, str(i), (10, self.alto - 15), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+        return frame
+
+    def reiniciar(self):
+        self.indice = 0
+        return True
+
+    def get(self, propiedad):
+        if propiedad == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.ancho)
+        if propiedad == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.alto)
+        if propiedad == cv2.CAP_PROP_FPS:
+            return self._fps
+        if propiedad == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.cuadros or 0)
+        return 0.0
+
+    def set(self, propiedad, valor):
+        return False
+
+    def fps(self):
+        return self._fps
+
+    def liberar(self):
+        pass
+
+
+# ----------------------- Fuente con hilo de decodificación -----------------------
+
+class FuenteVideo:
+    """
+    Envuelve un productor con un hilo de decodificación y un buffer acotado.
+
+    El hilo arranca con la primera llamada a read(), de modo que set() (por
+    ejemplo, la resolución de la cámara) todavía llega al dispositivo.
+
+    Args:
+        productor: Uno de los productores de este módulo
+        ritmo: TIEMPO_REAL o MAXIMO (la cámara siempre va a su propio ritmo)
+        tamano_buffer: Cuadros decodificados que se guardan por adelantado
+        repetir: Al terminar un video o carpeta, vuelve a empezar
+        fps: Sobrescribe los FPS de la fuente para el ritmo TIEMPO_REAL
+    """
+
+    def __init__(self, productor, ritmo=TIEMPO_REAL, tamano_buffer=4, repetir=False, fps=None):
+        if ritmo not in RITMOS:
+            raise ValueError(f"Ritmo desconocido: {ritmo} (use uno de {RITMOS})")
+        self.productor = productor
+        self.ritmo = ritmo
+        self.repetir = repetir
+        self.fps = fps or productor.fps()
+
+        self._buffer = deque()
+        self._tamano_buffer = max(1, tamano_buffer)
+        self._condicion = threading.Condition()
+        self._hilo = None
+        self._detener = False
+        self._fin_productor = False
+        self._terminada = not productor.abierto()
+
+        self._inicio = None
+        self.tiempo_cuadro = None  # marca de tiempo del último cuadro (ver read)
+        self.entregados = 0
+        self.descartados = 0
+        self.espera = 0.0  # segundos que read() esperó a que hubiera un cuadro decodificado
+
+    # --- Hilo de decodificación ---
+
+    def _decodificar(self):
+        while not self._detener:
+            frame = self.productor.leer()
+            if frame is None and self.repetir and self.productor.reiniciar():
+                frame = self.productor.leer()
+            # Momento de la captura, para los filtros temporales con cámara en vivo
+            capturado = time.perf_counter()
+            with self._condicion:
+                if frame is None:
+                    self._fin_productor = True
+                    self._condicion.notify_all()
+                    return
+                if self.productor.en_vivo:
+                    if len(self._buffer) >= self._tamano_buffer:
+                        self._buffer.popleft()
+                        self.descartados += 1
+                else:
+                    while len(self._buffer) >= self._tamano_buffer and not self._detener:
+                        self._condicion.wait()
+                self._buffer.append((frame, capturado))
+                self._condicion.notify_all()
+
+    # --- Interfaz de cv2.VideoCapture ---
+
+    def isOpened(self):
+        return not self._terminada
+
+    def read(self):
+        """
+        Siguiente cuadro como (ok, frame); (False, None) cuando la fuente terminó.
+
+        Con cámara se entrega el cuadro más reciente y se descartan los más
+        viejos del buffer, para no procesar cuadros atrasados.
+
+        Deja en tiempo_cuadro la marca de tiempo del cuadro en segundos: el
+        reloj al capturarlo para la cámara y número de cuadro / FPS para las
+        demás fuentes, de modo que los filtros temporales ven el mismo
+        intervalo entre cuadros con cualquier ritmo.
+        """
+        if self._terminada:
+            return False, None
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._decodificar, daemon=True)
+            self._hilo.start()
+
+        inicio_espera = time.perf_counter()
+        with self._condicion:
+            while not self._buffer and not self._fin_productor:
+                self._condicion.wait()
+            if not self._buffer:
+                self._terminada = True
+                return False, None
+            if self.productor.en_vivo:
+                frame, capturado = self._buffer.pop()
+                self.descartados += len(self._buffer)
+                self._buffer.clear()
+            else:
+                frame, capturado = self._buffer.popleft()
+            self._condicion.notify_all()
+        ahora = time.perf_counter()
+        self.espera += ahora - inicio_espera
+
+        if self._inicio is None:
+            self._inicio = ahora
+        elif self.ritmo == TIEMPO_REAL and not self.productor.en_vivo:
+            pausa = self._inicio + self.entregados / self.fps - ahora
+            if pausa > 0:
+                time.sleep(pausa)
+        self.tiempo_cuadro = capturado if self.productor.en_vivo else self.entregados / self.fps
+        self.entregados += 1
+        return True, frame
+
+    def get(self, propiedad):
+        return self.productor.get(propiedad)
+
+    def set(self, propiedad, valor):
+        if self._hilo is not None:
+            return False
+        return self.productor.set(propiedad, valor)
+
+    def release(self):
+        self._detener = True
+        with self._condicion:
+            self._condicion.notify_all()
+        if self._hilo is not None:
+            self._hilo.join(timeout=1.0)
+        self.productor.liberar()
+        self._terminada = True
+
+    # --- Métricas ---
+
+    def resumen(self):
+        """Cuadros entregados, FPS efectivos, descartes y espera por decodificación"""
+        if not self.entregados or self._inicio is None:
+            return "Sin cuadros leídos"
+        duracion = max(time.perf_counter() - self._inicio, 1e-9)
+        return (f"{self.entregados} cuadros en {duracion:.1f} s ({self.entregados / duracion:.1f} FPS), "
+                f"descartados {self.descartados}, "
+                f"espera por decodificación {1000 * self.espera / self.entregados:.2f} ms por cuadro")
+
+
+def abrir_fuente(especificacion="0", ritmo=TIEMPO_REAL, tamano_buffer=4, repetir=False, fps=None):
+    """
+    Abre una fuente a partir de su especificación (ver el docstring del módulo).
+
+    Returns:
+        FuenteVideo; si no se pudo abrir, isOpened() devuelve False como con
+        cv2.VideoCapture
+    """
+    especificacion = str(especificacion)
+    if especificacion.isdigit():
+        productor = _ProductorCaptura(int(especificacion), en_vivo=True)
+    elif especificacion == "sintetico" or especificacion.startswith("sintetico:"):
+        partes = especificacion.split(":")[1:]
+        ancho, alto = (int(v) for v in partes[0].lower().split("x")) if partes else (640, 480)
+        cuadros = int(partes[1]) if len(partes) > 1 else None
+        productor = _ProductorSintetico(ancho, alto, cuadros, fps)
+    elif os.path.isdir(especificacion):
+        productor = _ProductorImagenes(especificacion, fps)
+    else:
+        productor = _ProductorCaptura(especificacion, en_vivo="://" in especificacion)
+    return FuenteVideo(productor, ritmo=ritmo, tamano_buffer=tamano_buffer, repetir=repetir, fps=fps)
+
+
+def agregar_argumentos(parser, por_defecto="0"):
+    """Agrega --fuente, --ritmo, --fps-fuente, --buffer y --repetir a un ArgumentParser"""
+    grupo = parser.add_argument_group("fuente de video")
+    grupo.add_argument("--fuente", default=por_defecto,
+                       help="Índice de cámara, archivo de video, carpeta de imágenes o "
+                            "sintetico[:ANCHOxALTO[:CUADROS]]")
+    grupo.add_argument("--ritmo", choices=RITMOS, default=TIEMPO_REAL,
+                       help="tiempo-real respeta los FPS de la fuente; maximo entrega los cuadros sin esperar")
+    grupo.add_argument("--fps-fuente", type=float, default=None,
+                       help="FPS para el ritmo tiempo-real (por defecto, los del video o 30)")
+    grupo.add_argument("--buffer", type=int, default=4, help="Cuadros decodificados por adelantado (con cámara se entrega siempre el más reciente)")
+    grupo.add_argument("--repetir", action="store_true", help="Reinicia el video o la carpeta al terminar")
+    return grupo
+
+
+def abrir_desde_argumentos(args):
+    """Abre la fuente descrita por los argumentos de agregar_argumentos()"""
+    return abrir_fuente(args.fuente, ritmo=args.ritmo, tamano_buffer=args.buffer,
+                        repetir=args.repetir, fps=args.fps_fuente)
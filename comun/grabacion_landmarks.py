@@ -0,0 +1,323 @@
+"""
+Grabación y reproducción de landmarks de MediaPipe.
+
+Permite grabar una sesión con cámara (marcas de tiempo, landmarks y, si se
+quiere, los cuadros reducidos) y luego reproducirla sin cámara ni MediaPipe,
+alimentando la lógica de gestos tan rápido como se pueda. Así el rendimiento
+de esa lógica se mide de forma repetible.
+
+Formato del archivo (.lmk, little-endian):
+
+    b"LMKR" | versión u16 | largo del encabezado u32 | encabezado JSON (utf-8)
+    registro*
+
+El encabezado declara los flujos de landmarks en orden, cada uno con su forma
+por instancia, por ejemplo {"manos": [2, 21, 3]} para hasta 2 manos de 21
+puntos (x, y, z). Cada registro es:
+
+    t f64
+    por cada flujo: n u8, seguido de n * puntos * columnas float32
+    largo de la imagen u32, seguido de los bytes de la imagen codificada (o 0)
+
+Solo se guardan las instancias detectadas; un registro truncado al final (por
+ejemplo, si el programa se cerró de golpe) se descarta al leer.
+"""
+
+import json
+import struct
+import time
+
+import cv2
+import numpy as np
+
+MAGIA = b"LMKR"
+VERSION = 1
+_ENCABEZADO = struct.Struct("<4sHI")
+_TIEMPO = struct.Struct("<d")
+_CONTEO = struct.Struct("<B")
+_LARGO = struct.Struct("<I")
+
+
+def landmarks_a_array(lista_landmarks, columnas=3):
+    """
+    Convierte landmarks de MediaPipe en un array (n, puntos, columnas) float32.
+
+    Args:
+        lista_landmarks: results.multi_hand_landmarks, results.multi_face_landmarks,
+                         un solo NormalizedLandmarkList (pose) o None
+        columnas: 3 para x, y, z; 4 para agregar la visibilidad
+    """
+    if lista_landmarks is None:
+        return None
+    if hasattr(lista_landmarks, "landmark"):
+        lista_landmarks = [lista_landmarks]
+    if columnas == 4:
+        filas = [[(p.x, p.y, p.z, p.visibility) for p in lm.landmark] for lm in lista_landmarks]
+    else:
+        filas = [[(p.x, p.y, p.z) for p in lm.landmark] for lm in lista_landmarks]
+    return np.array(filas, dtype=np.float32)
+
+
+class GrabadorLandmarks:
+    """
+    Escribe una grabación cuadro a cuadro.
+
+    Args:
+        ruta: Archivo de salida
+        flujos: Diccionario nombre -> (max_instancias, puntos, columnas)
+        escala_imagen: Si no es None, guarda cada cuadro reducido a esta escala
+        calidad_jpeg: Calidad JPEG de los cuadros guardados
+        metadatos: Información adicional que se guarda en el encabezado
+    """
+
+    def __init__(self, ruta, flujos, escala_imagen=None, calidad_jpeg=80, metadatos=None):
+        self.flujos = {nombre: tuple(forma) for nombre, forma in flujos.items()}
+        self.escala_imagen = escala_imagen
+        self.calidad_jpeg = calidad_jpeg
+        self.cuadros = 0
+
+        encabezado = json.dumps({
+            "flujos": self.flujos,
+            "escala_imagen": escala_imagen,
+            "metadatos": metadatos or {},
+        }).encode("utf-8")
+        self._archivo = open(ruta, "wb")
+        self._archivo.write(_ENCABEZADO.pack(MAGIA, VERSION, len(encabezado)))
+        self._archivo.write(encabezado)
+
+    def agregar(self, landmarks, frame=None, t=None):
+        """
+        Agrega un cuadro.
+
+        Args:
+            landmarks: Diccionario nombre -> array (n, puntos, columnas) o None
+            frame: Cuadro BGR; se guarda solo si el grabador tiene escala_imagen
+            t: Marca de tiempo en segundos (por defecto, ahora)
+        """
+        partes = [_TIEMPO.pack(time.perf_counter() if t is None else t)]
+
+        for nombre, (maximo, puntos, columnas) in self.flujos.items():
+            array = landmarks.get(nombre)
+            if array is None:
+                partes.append(_CONTEO.pack(0))
+                continue
+            array = np.ascontiguousarray(array, dtype=np.float32).reshape(-1, puntos, columnas)[:maximo]
+            partes.append(_CONTEO.pack(len(array)))
+            partes.append(array.tobytes())
+
+        imagen = b""
+        if frame is not None and self.escala_imagen is not None:
+            reducido = cv2.resize(frame, (0, 0), fx=self.escala_imagen, fy=self.escala_imagen,
+                                  interpolation=cv2.INTER_AREA)
+            ok, codificada = cv2.imencode(".jpg", reducido, [cv2.IMWRITE_JPEG_QUALITY, self.calidad_jpeg])
+            if ok:
+                imagen = codificada.tobytes()
+        partes.append(_LARGO.pack(len(imagen)))
+        partes.append(imagen)
+
+        self._archivo.write(b"".join(partes))
+        self.cuadros += 1
+
+    def cerrar(self):
+        if not self._archivo.closed:
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class Grabacion:
+    """
+    Grabación cargada completa en memoria.
+
+    Attributes:
+        tiempos: Marcas de tiempo (T,) float64
+        flujos: nombre -> array (T, max_instancias, puntos, columnas); las
+                instancias no detectadas quedan en NaN
+        conteos: nombre -> instancias detectadas en cada cuadro (T,)
+        imagenes: Lista de T bytes JPEG (vacíos si el cuadro no tiene imagen)
+    """
+
+    def __init__(self, tiempos, flujos, conteos, imagenes, escala_imagen, metadatos):
+        self.tiempos = tiempos
+        self.flujos = flujos
+        self.conteos = conteos
+        self.imagenes = imagenes
+        self.escala_imagen = escala_imagen
+        self.metadatos = metadatos
+
+    def __len__(self):
+        return len(self.tiempos)
+
+    def landmarks(self, indice, nombre):
+        """Instancias detectadas de un flujo en un cuadro: array (n, puntos, columnas)"""
+        return self.flujos[nombre][indice, :self.conteos[nombre][indice]]
+
+    def decodificar_imagenes(self):
+        """Decodifica todos los cuadros guardados (None donde no hay imagen)"""
+        return [cv2.imdecode(np.frombuffer(datos, np.uint8), cv2.IMREAD_COLOR) if datos else None
+                for datos in self.imagenes]
+
+
+def leer_grabacion(ruta):
+    """Lee un archivo .lmk completo"""
+    with open(ruta, "rb") as f:
+        datos = f.read()
+
+    if len(datos) < _ENCABEZADO.size:
+        raise ValueError(f"{ruta} no es una grabación de landmarks")
+    magia, version, largo = _ENCABEZADO.unpack_from(datos, 0)
+    if magia != MAGIA:
+        raise ValueError(f"{ruta} no es una grabación de landmarks")
+    if version != VERSION:
+        raise ValueError(f"Versión de grabación no soportada: {version}")
+
+    pos = _ENCABEZADO.size
+    encabezado = json.loads(datos[pos:pos + largo].decode("utf-8"))
+    pos += largo
+    flujos = {nombre: tuple(forma) for nombre, forma in encabezado["flujos"].items()}
+
+    tiempos, imagenes = [], []
+    cuadros = {nombre: [] for nombre in flujos}
+    vista = memoryview(datos)
+
+    while pos < len(datos):
+        try:
+            inicio = pos
+            (t,) = _TIEMPO.unpack_from(datos, pos)
+            pos += _TIEMPO.size
+            registro = {}
+            for nombre, (maximo, puntos, columnas) in flujos.items():
+                (n,) = _CONTEO.unpack_from(datos, pos)
+                pos += _CONTEO.size
+                cantidad = n * puntos * columnas
+                if pos + 4 * cantidad > len(datos):
+                    raise struct.error("registro incompleto")
+                registro[nombre] = np.frombuffer(vista[pos:pos + 4 * cantidad], dtype=np.float32)
+                registro[nombre] = registro[nombre].reshape(n, puntos, columnas)
+                pos += 4 * cantidad
+            (largo_imagen,) = _LARGO.unpack_from(datos, pos)
+            pos += _LARGO.size
+            if pos + largo_imagen > len(datos):
+                raise struct.error("registro incompleto")
+            imagen = bytes(vista[pos:pos + largo_imagen])
+            pos += largo_imagen
+        except struct.error:
+            print(f"Se descartó un registro incompleto al final de {ruta} (byte {inicio})")
+            break
+
+        tiempos.append(t)
+        imagenes.append(imagen)
+        for nombre in flujos:
+            cuadros[nombre].append(registro[nombre])
+
+    total = len(tiempos)
+    arrays, conteos = {}, {}
+    for nombre, (maximo, puntos, columnas) in flujos.items():
+        arrays[nombre] = np.full((total, maximo, puntos, columnas), np.nan, dtype=np.float32)
+        conteos[nombre] = np.zeros(total, dtype=np.int32)
+        for i, instancias in enumerate(cuadros[nombre]):
+            arrays[nombre][i, :len(instancias)] = instancias
+            conteos[nombre][i] = len(instancias)
+
+    return Grabacion(np.array(tiempos, dtype=np.float64), arrays, conteos, imagenes,
+                     encabezado.get("escala_imagen"), encabezado.get("metadatos", {}))
+
+
+# ----------------------- Reproducción -----------------------
+
+class _Landmark:
+    """Punto con la misma interfaz que un NormalizedLandmark de MediaPipe"""
+    __slots__ = ("x", "y", "z", "visibility")
+
+    def __init__(self, x, y, z, visibility=1.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.visibility = visibility
+
+
+class _PuntosArray:
+    """Secuencia de landmarks que construye cada punto solo cuando se accede"""
+
+    def __init__(self, array):
+        self._filas = array.tolist()
+
+    def __len__(self):
+        return len(self._filas)
+
+    def __getitem__(self, indice):
+        return _Landmark(*self._filas[indice])
+
+    def __iter__(self):
+        return (_Landmark(*fila) for fila in self._filas)
+
+
+class ListaLandmarks:
+    """Sustituto de NormalizedLandmarkList: expone .landmark a partir de un array (puntos, columnas)"""
+
+    def __init__(self, array):
+        self.landmark = _PuntosArray(array)
+
+
+def como_mediapipe(array):
+    """
+    Convierte instancias (n, puntos, columnas) en la lista que devolvería
+    MediaPipe (multi_hand_landmarks, multi_face_landmarks), o None si n = 0,
+    para que la lógica de gestos existente funcione sin cambios.
+    """
+    if array is None or len(array) == 0:
+        return None
+    return [ListaLandmarks(instancia) for instancia in array]
+
+
+class EstadisticasReproduccion:
+    def __init__(self, tiempos_cuadro):
+        self.tiempos_cuadro = np.asarray(tiempos_cuadro)
+
+    @property
+    def cuadros(self):
+        return len(self.tiempos_cuadro)
+
+    @property
+    def total(self):
+        return float(self.tiempos_cuadro.sum())
+
+    def resumen(self):
+        if not self.cuadros:
+            return "Sin cuadros reproducidos"
+        ms = 1000 * self.tiempos_cuadro
+        return (f"{self.cuadros} cuadros en {self.total:.3f} s: "
+                f"{self.cuadros / self.total:,.0f} cuadros/s, "
+                f"media {ms.mean():.3f} ms, p95 {np.percentile(ms, 95):.3f} ms, máx {ms.max():.3f} ms")
+
+
+def reproducir(grabacion, procesar, tiempo_real=False, repeticiones=1):
+    """
+    Llama procesar(indice, t) por cada cuadro de la grabación y mide su tiempo.
+
+    Args:
+        grabacion: Grabacion leída con leer_grabacion
+        procesar: Función que ejecuta la lógica de gestos de un cuadro
+        tiempo_real: Si es True respeta los tiempos originales entre cuadros;
+                     si es False reproduce tan rápido como sea posible
+        repeticiones: Veces que se recorre la grabación completa
+
+    Returns:
+        EstadisticasReproduccion con el tiempo de procesar en cada cuadro
+    """
+    tiempos_cuadro = []
+    for _ in range(repeticiones):
+        inicio_reproduccion = time.perf_counter()
+        for i, t in enumerate(grabacion.tiempos.tolist()):
+            if tiempo_real:
+                espera = (t - grabacion.tiempos[0]) - (time.perf_counter() - inicio_reproduccion)
+                if espera > 0:
+                    time.sleep(espera)
+            inicio = time.perf_counter()
+            procesar(i, t)
+            tiempos_cuadro.append(time.perf_counter() - inicio)
+    return EstadisticasReproduccion(tiempos_cuadro)
@@ -0,0 +1,230 @@
+"""
+Cadenas de filtros de imagen con buffers reutilizables.
+
+Cada filtro declara el formato que recibe y el que produce (BGR o gris) y
+escribe su resultado en un buffer de salida que se le entrega (argumento dst de
+OpenCV). Una Cadena reserva esos buffers la primera vez que ve un tamaño de
+cuadro y los reutiliza en los cuadros siguientes, inserta las conversiones de
+color necesarias entre filtros y mide el tiempo de cada etapa.
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+BGR = "bgr"
+GRIS = "gris"
+
+
+class Filtro:
+    """
+    Filtro base. Las subclases definen entrada, salida y aplicar().
+
+    aplicar(src, dst, original) debe escribir el resultado en dst, que ya tiene
+    la forma y el tipo correctos. original es el cuadro que entró a la cadena,
+    útil para filtros que combinan el resultado con la imagen de la cámara.
+    """
+    nombre = "filtro"
+    entrada = BGR
+    salida = BGR
+
+    def aplicar(self, src, dst, original):
+        raise NotImplementedError
+
+    def crear_buffer(self, forma):
+        """Reserva el buffer de salida para un cuadro de la forma dada (alto, ancho)"""
+        if self.salida == GRIS:
+            return np.empty(forma, dtype=np.uint8)
+        return np.empty(forma + (3,), dtype=np.uint8)
+
+
+class Grises(Filtro):
+    nombre = "grises"
+    entrada = BGR
+    salida = GRIS
+
+    def aplicar(self, src, dst, original):
+        cv2.cvtColor(src, cv2.COLOR_BGR2GRAY, dst=dst)
+
+
+class AColor(Filtro):
+    nombre = "a_bgr"
+    entrada = GRIS
+    salida = BGR
+
+    def aplicar(self, src, dst, original):
+        cv2.cvtColor(src, cv2.COLOR_GRAY2BGR, dst=dst)
+
+
+class Binario(Filtro):
+    nombre = "binario"
+    entrada = GRIS
+    salida = GRIS
+
+    def __init__(self, umbral=127):
+        self.umbral = umbral
+
+    def aplicar(self, src, dst, original):
+        cv2.threshold(src, self.umbral, 255, cv2.THRESH_BINARY, dst=dst)
+
+
+class Bordes(Filtro):
+    nombre = "bordes"
+    entrada = GRIS
+    salida = GRIS
+
+    def __init__(self, umbral_bajo=100, umbral_alto=200):
+        self.umbral_bajo = umbral_bajo
+        self.umbral_alto = umbral_alto
+
+    def aplicar(self, src, dst, original):
+        cv2.Canny(src, self.umbral_bajo, self.umbral_alto, edges=dst)
+
+
+class Desenfoque(Filtro):
+    nombre = "blur"
+    entrada = BGR
+    salida = BGR
+
+    def __init__(self, tamano=15):
+        self.tamano = tamano
+
+    def aplicar(self, src, dst, original):
+        cv2.GaussianBlur(src, (self.tamano, self.tamano), 0, dst=dst)
+
+
+class Superponer(Filtro):
+    """Pinta de un color sobre el cuadro original los píxeles activos de una máscara"""
+    nombre = "superponer"
+    entrada = GRIS
+    salida = BGR
+
+    def __init__(self, color=(0, 255, 0)):
+        self.color = color
+        self._solido = None
+
+    def aplicar(self, src, dst, original):
+        if self._solido is None or self._solido.shape != dst.shape:
+            self._solido = np.empty_like(dst)
+            self._solido[:] = self.color
+        np.copyto(dst, original)
+        cv2.copyTo(self._solido, src, dst)
+
+
+class FiltroFuncion(Filtro):
+    """
+    Adapta una función existente como filtro.
+
+    La función recibe (src, dst) y puede escribir en dst o devolver una imagen
+    nueva; en ese caso se copia al buffer de salida.
+    """
+
+    def __init__(self, nombre, funcion, entrada=BGR, salida=BGR):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.entrada = entrada
+        self.salida = salida
+
+    def aplicar(self, src, dst, original):
+        resultado = self.funcion(src, dst)
+        if resultado is not None and resultado is not dst:
+            np.copyto(dst, resultado)
+
+
+class Cadena:
+    """
+    Secuencia de filtros que se ejecuta sobre cada cuadro.
+
+    Args:
+        filtros: Lista de filtros en el orden en que se aplican
+        salida: Formato final (BGR o GRIS); se agrega una conversión si hace falta
+    """
+
+    def __init__(self, filtros, salida=BGR):
+        self.etapas = []
+        formato = BGR
+        for filtro in filtros:
+            self._conectar(formato, filtro.entrada)
+            self.etapas.append(filtro)
+            formato = filtro.salida
+        self._conectar(formato, salida)
+        self.salida = salida
+
+        self._forma = None
+        self._buffers = []
+        self._copia = None
+        self._lock = threading.Lock()
+
+        self.tiempos = [0.0] * len(self.etapas)
+        self.cuadros = 0
+
+    def _conectar(self, formato_actual, formato_requerido):
+        if formato_actual == formato_requerido:
+            return
+        if formato_actual == BGR:
+            self.etapas.append(Grises())
+        else:
+            self.etapas.append(AColor())
+
+    def _preparar_buffers(self, forma):
+        if self._forma == forma:
+            return
+        self._forma = forma
+        self._buffers = [etapa.crear_buffer(forma) for etapa in self.etapas]
+        self._copia = np.empty(forma + (3,) if self.salida == BGR else forma, dtype=np.uint8)
+
+    def procesar(self, frame, copiar=False):
+        """
+        Aplica la cadena a un cuadro BGR.
+
+        Args:
+            frame: Cuadro BGR uint8
+            copiar: Si es True devuelve una copia independiente; si no, devuelve
+                    el buffer interno, que se sobrescribe en el siguiente cuadro
+
+        Returns:
+            Imagen procesada en el formato de salida de la cadena
+        """
+        with self._lock:
+            self._preparar_buffers(frame.shape[:2])
+
+            actual = frame
+            for i, etapa in enumerate(self.etapas):
+                inicio = time.perf_counter()
+                etapa.aplicar(actual, self._buffers[i], frame)
+                self.tiempos[i] += time.perf_counter() - inicio
+                actual = self._buffers[i]
+            self.cuadros += 1
+
+            if not self.etapas:
+                # Cadena vacía: el resultado es el mismo cuadro
+                np.copyto(self._copia, frame)
+                return self._copia.copy() if copiar else self._copia
+            return actual.copy() if copiar else actual
+
+    def reporte(self):
+        """
+        Tiempo promedio por cuadro de cada etapa.
+
+        Returns:
+            Lista de tuplas (nombre, milisegundos promedio, porcentaje del total)
+        """
+        if self.cuadros == 0:
+            return []
+        total = sum(self.tiempos) or 1e-12
+        return [(etapa.nombre, 1000.0 * t / self.cuadros, 100.0 * t / total)
+                for etapa, t in zip(self.etapas, self.tiempos)]
+
+    def reporte_texto(self):
+        lineas = [f"{nombre:<12} {ms:7.2f} ms  {pct:5.1f}%" for nombre, ms, pct in self.reporte()]
+        if not lineas:
+            return "Sin cuadros procesados"
+        total_ms = sum(ms for _, ms, _ in self.reporte())
+        lineas.append(f"{'total':<12} {total_ms:7.2f} ms  ({self.cuadros} cuadros)")
+        return "\n".join(lineas)
+
+    def reiniciar_tiempos(self):
+        self.tiempos = [0.0] * len(self.etapas)
+        self.cuadros = 0